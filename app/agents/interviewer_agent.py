@@ -1,18 +1,37 @@
 """Interviewer agent - voice-facing, theory interview."""
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator, List
+from uuid import uuid4
+from app.config import settings
 from app.core.state_manager import InterviewState
-from app.core.prompts import INTERVIEWER_THEORY_PROMPT
+from app.core.prompts import INTERVIEWER_THEORY_PROMPT, TRANSCRIPT_SUMMARY_PROMPT
+from app.core.context_builder import get_context_builder
+from app.core.speech_stream import SpeechStreamParser
+from app.core.timing import stage
+from app.models.schemas import InterviewerResponse
 from app.services.gemini_service import gemini_service
+from app.services.question_pool import OpeningQuestionPool
 
 logger = logging.getLogger(__name__)
 
+# Values of InterviewMeta.mode / InterviewState.coding_mode
+_CODING_MODES = ("problem", "silent", "discussion", "end")
+
 
 class InterviewerAgent:
     """Interviewer agent for theory interviews."""
     
     def __init__(self):
         self.gemini = gemini_service
+        self.question_pool: Optional[OpeningQuestionPool] = None
+        if settings.question_pool_enabled:
+            self.question_pool = OpeningQuestionPool(
+                self._generate_opening_question,
+                depth=settings.question_pool_depth,
+                max_age_seconds=settings.question_pool_max_age_seconds,
+                max_keys=settings.question_pool_max_keys,
+                refill_concurrency=settings.question_pool_refill_concurrency
+            )
     
     async def respond(
         self,
@@ -30,71 +49,149 @@ class InterviewerAgent:
             Response dict with "speech" and "meta" keys
         """
         try:
-            # Build context prompt
-            context = self._build_context(state, user_message)
+            response = await self._generate(state, user_message)
+            
+            # Update state based on meta
+            self._update_state_from_meta(state, response["meta"])
+            
+            return response
             
-            # Get system instruction
+        except Exception as e:
+            logger.error(f"Interviewer agent error: {e}", exc_info=True)
+            return self._fallback_response(state)
+    
+    async def _generate(
+        self,
+        state: InterviewState,
+        user_message: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Generate and validate a response without touching the state's flow fields."""
+        # Build context prompt
+        context = self._build_context(state, user_message)
+        
+        # Get system instruction
+        system_instruction = INTERVIEWER_THEORY_PROMPT.format(
+            theory_topic=state.theory_topic
+        )
+        
+        # Generate response
+        response = await self.gemini.generate_json_response(
+            prompt=context,
+            system_instruction=system_instruction,
+            model_type="interviewer",
+            schema=InterviewerResponse
+        )
+        
+        return self._validate_response(state, response)
+    
+    async def respond_stream(
+        self,
+        state: InterviewState,
+        user_message: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the interviewer response sentence by sentence.
+        
+        Args:
+            state: Current interview state
+            user_message: Optional user message (for follow-ups)
+        
+        Yields:
+            ``{"event": "speech", "text": ...}`` for each completed sentence,
+            then a single ``{"event": "meta", "speech": ..., "meta": ...}``
+            carrying the full response once the stream has finished
+        """
+        parser = SpeechStreamParser()
+        
+        try:
+            context = self._build_context(state, user_message)
             system_instruction = INTERVIEWER_THEORY_PROMPT.format(
                 theory_topic=state.theory_topic
             )
             
-            # Generate response
-            response = await self.gemini.generate_json_response(
+            async for chunk in self.gemini.stream_json_response(
                 prompt=context,
                 system_instruction=system_instruction,
-                model_type="interviewer"
-            )
+                model_type="interviewer",
+                schema=InterviewerResponse
+            ):
+                for sentence in parser.feed(chunk):
+                    yield {"event": "speech", "text": sentence}
             
-            # Validate response structure
-            if "speech" not in response or "meta" not in response:
-                raise ValueError("Invalid response structure from Gemini")
+            for sentence in parser.flush():
+                yield {"event": "speech", "text": sentence}
             
-            # Update state based on meta
-            self._update_state_from_meta(state, response["meta"])
+            response = self._validate_response(state, self.gemini.parse_json_text(parser.text))
             
-            return response
+            self._update_state_from_meta(state, response["meta"])
             
         except Exception as e:
-            logger.error(f"Interviewer agent error: {e}", exc_info=True)
-            # Fallback response
-            return {
-                "speech": "I apologize, could you repeat that?",
-                "meta": {
-                    "phase": state.theory_phase,
-                    "followup_used": False,
-                    "flag_vague": False,
-                    "flag_incorrect": False,
-                    "end_theory_round": False
-                }
-            }
-    
-    def _build_context(self, state: InterviewState, user_message: Optional[str]) -> str:
-        """Build context prompt for Gemini."""
-        context_parts = [
-            f"Interview State:",
-            f"- Current Phase: {state.current_phase}",
-            f"- Theory Phase: {state.theory_phase}",
-            f"- Theory Topic: {state.theory_topic}",
-            f"- Follow-ups Asked: {state.theory_followups_asked}",
-            f"- Candidate: {state.candidate_name}",
-            "",
-            "Recent Transcript:"
-        ]
+            logger.error(f"Interviewer agent streaming error: {e}", exc_info=True)
+            response = self._fallback_response(state)
+            if parser.emitted_speech:
+                # The candidate already heard part of the answer; keep it
+                response["speech"] = parser.emitted_speech
+            else:
+                yield {"event": "speech", "text": response["speech"]}
         
-        # Add last 5 messages for context
-        recent_messages = state.transcript[-5:] if len(state.transcript) > 5 else state.transcript
-        for msg in recent_messages:
-            context_parts.append(f"{msg.role}: {msg.content}")
+        yield {"event": "meta", "speech": response["speech"], "meta": response["meta"]}
+    
+    def _validate_response(self, state: InterviewState, response: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Check the response structure, filling meta fields a repaired reply lost.
         
-        if user_message:
-            context_parts.append(f"\nLatest User Message: {user_message}")
+        A reply truncated after the speech is still usable: missing flags
+        default to False and the phase to the current one.
+        """
+        if not isinstance(response.get("speech"), str):
+            raise ValueError("Invalid response structure from Gemini")
         
-        context_parts.append(
-            "\nGenerate your next response following the rules. "
-            "If this is the first message, ask the Phase 1 core concept question."
+        meta = response.get("meta")
+        if not isinstance(meta, dict):
+            meta = {}
+        defaults = self._fallback_response(state)["meta"]
+        response["meta"] = {key: meta.get(key, default) for key, default in defaults.items()}
+        if response["meta"]["mode"] not in _CODING_MODES:
+            response["meta"]["mode"] = defaults["mode"]
+        return response
+    
+    def _fallback_response(self, state: InterviewState) -> Dict[str, Any]:
+        """Response used when Gemini fails or returns something unusable."""
+        return {
+            "speech": "I apologize, could you repeat that?",
+            "meta": {
+                "phase": state.theory_phase,
+                "followup_used": False,
+                "flag_vague": False,
+                "flag_incorrect": False,
+                "end_theory_round": False,
+                "mode": state.coding_mode
+            }
+        }
+    
+    def _build_context(self, state: InterviewState, user_message: Optional[str]) -> str:
+        """Build context prompt for Gemini (incrementally, see ContextBuilder)."""
+        with stage("context"):
+            builder = get_context_builder(state)
+            context = builder.render(state, user_message)
+        if settings.context_summary_enabled:
+            builder.schedule_summary(self._summarize_transcript, state)
+        return context
+    
+    async def _summarize_transcript(self, summary: str, lines: List[str]) -> str:
+        """Fold evicted transcript lines into the rolling summary."""
+        prompt = TRANSCRIPT_SUMMARY_PROMPT.format(
+            max_words=settings.context_summary_tokens * 3 // 4,
+            summary=summary or "(none)",
+            lines="\n".join(lines)
+        )
+        return await self.gemini.generate_response(
+            prompt,
+            system_instruction="You summarize interview transcripts for the interviewer.",
+            model_type="summary",
+            temperature=0.2,
+            max_output_tokens=settings.context_summary_tokens
         )
-        
-        return "\n".join(context_parts)
     
     def _update_state_from_meta(self, state: InterviewState, meta: Dict[str, Any]):
         """Update state based on agent meta response."""
@@ -104,19 +201,46 @@ class InterviewerAgent:
         if meta.get("flag_incorrect"):
             state.set_flag("incorrect", True)
         
+        # Coding sub-mode (problem / silent / discussion / end)
+        if state.current_phase == "coding" and meta.get("mode") in _CODING_MODES:
+            state.coding_mode = meta["mode"]
+        
         # Track follow-ups
         if meta.get("followup_used"):
             state.theory_followups_asked += 1
         
         # Advance phase if needed
         if meta.get("end_theory_round"):
-            state.current_phase = "coding"
+            if state.current_phase == "theory":
+                state.enter_phase("coding")
         elif state.theory_phase < 3 and state.theory_followups_asked >= 2:
             state.advance_phase()
     
     async def get_initial_question(self, state: InterviewState) -> Dict[str, Any]:
-        """Get the initial question for the interview."""
+        """Get the initial question, from the pre-generated pool when possible."""
+        if self.question_pool is not None:
+            response = self.question_pool.pop(state.theory_topic, state.interview_type)
+            if response is not None:
+                self._update_state_from_meta(state, response["meta"])
+                return response
+        
         return await self.respond(state, user_message=None)
+    
+    async def _generate_opening_question(self, theory_topic: str, interview_type: str) -> Dict[str, Any]:
+        """Generate a Phase-1 question for the pool on a throwaway state."""
+        template = InterviewState(
+            interview_id=uuid4(),
+            candidate_id=uuid4(),
+            candidate_name="Candidate",
+            theory_topic=theory_topic,
+            interview_type=interview_type
+        )
+        return await self._generate(template)
+    
+    async def close(self):
+        """Stop background work (question pool refills)."""
+        if self.question_pool is not None:
+            await self.question_pool.close()
 
 
 # Global instance
@@ -0,0 +1,143 @@
+"""Judge agent - silent evaluator of completed interviews."""
+import json
+import logging
+from typing import Any, Dict, List
+from pydantic import ValidationError
+from app.core.state_manager import InterviewState
+from app.core.prompts import JUDGE_PROMPT
+from app.models.schemas import BatchEvaluation, InterviewEvaluation
+from app.services.gemini_service import gemini_service
+
+logger = logging.getLogger(__name__)
+
+# Output budget per evaluated interview
+_TOKENS_PER_EVALUATION = 1024
+
+# Static system instruction, so every judge call shares one cached prefix
+_SYSTEM_INSTRUCTION = JUDGE_PROMPT.format()
+
+
+class JudgeAgent:
+    """Judge agent evaluating one or several completed interviews per call."""
+    
+    def __init__(self):
+        self.gemini = gemini_service
+    
+    @staticmethod
+    def build_input(state: InterviewState) -> Dict[str, Any]:
+        """
+        Judge input for an interview (the prompt's INPUT CONTRACT).
+        
+        Built when the interview completes, so the judge does not depend on
+        the live state still being in the store.
+        
+        Args:
+            state: Completed interview state
+        
+        Returns:
+            JSON-serializable judge input, keyed by ``interview_id``
+        """
+        coding_start = state.phase_start_times.get("coding")
+        theory, coding = [], []
+        for message in state.transcript:
+            entry = {"role": message.role, "content": message.content}
+            if coding_start is not None and message.timestamp >= coding_start:
+                coding.append(entry)
+            else:
+                theory.append(entry)
+        
+        compiler_result = None
+        if state.code_submissions:
+            last = state.code_submissions[-1]
+            compiler_result = {
+                "compiled": last.compiled,
+                "tests_passed": last.tests_passed,
+                "tests_failed": last.tests_failed,
+                "runtime_ms": last.runtime_ms,
+                "error": last.error,
+            }
+        
+        return {
+            "interview_id": str(state.interview_id),
+            "theory_topic": state.theory_topic,
+            "theory_transcript": theory,
+            "coding_transcript": coding,
+            "compiler_result": compiler_result,
+            "submissions": len(state.code_submissions),
+            "problem_difficulty": state.difficulty,
+            "language": state.language,
+            "flags": dict(state.flags),
+        }
+    
+    async def evaluate_batch(self, inputs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Evaluate several interviews, in one judge call where possible.
+        
+        Interviews the batched reply leaves out (or gets wrong) are evaluated
+        again one by one. Interviews that still fail are missing from the
+        result, so the caller can retry just those.
+        
+        Args:
+            inputs: Judge inputs from ``build_input``
+        
+        Returns:
+            Evaluation dicts keyed by interview ID
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        if len(inputs) > 1:
+            try:
+                results = await self._evaluate_together(inputs)
+            except Exception as e:
+                logger.warning(f"Batched judge call failed, evaluating one by one: {e}")
+        
+        for item in inputs:
+            if item["interview_id"] in results:
+                continue
+            try:
+                results[item["interview_id"]] = await self.evaluate(item)
+            except Exception as e:
+                logger.error(f"Judge evaluation of {item['interview_id']} failed: {e}")
+        return results
+    
+    async def _evaluate_together(self, inputs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """One judge call for all inputs; keeps only valid evaluations of known IDs."""
+        response = await self.gemini.generate_json_response(
+            prompt=(
+                "Evaluate each of the following interviews independently. Return "
+                '{"evaluations": [...]} with exactly one entry per interview, '
+                "carrying its interview_id.\n\n"
+                + json.dumps(inputs)
+            ),
+            system_instruction=_SYSTEM_INSTRUCTION,
+            model_type="judge",
+            schema=BatchEvaluation,
+            max_output_tokens=_TOKENS_PER_EVALUATION * len(inputs)
+        )
+        
+        wanted = {item["interview_id"] for item in inputs}
+        results: Dict[str, Dict[str, Any]] = {}
+        for item in response.get("evaluations", []):
+            if not isinstance(item, dict) or item.get("interview_id") not in wanted:
+                continue
+            try:
+                evaluation = InterviewEvaluation.model_validate(item)
+            except ValidationError as e:
+                logger.warning(f"Discarding invalid evaluation of {item['interview_id']}: {e}")
+                continue
+            results[item["interview_id"]] = evaluation.model_dump()
+        return results
+    
+    async def evaluate(self, judge_input: Dict[str, Any]) -> Dict[str, Any]:
+        """Evaluate a single interview."""
+        response = await self.gemini.generate_json_response(
+            prompt=json.dumps(judge_input),
+            system_instruction=_SYSTEM_INSTRUCTION,
+            model_type="judge",
+            schema=InterviewEvaluation,
+            max_output_tokens=_TOKENS_PER_EVALUATION
+        )
+        return InterviewEvaluation.model_validate(response).model_dump()
+
+
+# Global instance
+judge_agent = JudgeAgent()
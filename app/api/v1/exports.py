@@ -0,0 +1,102 @@
+"""Bulk export endpoints."""
+import asyncio
+import json
+import logging
+import zlib
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Literal, Optional, Tuple
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.core.state_manager import InterviewState, scan_interview_states
+from app.core.stores.base import StateFilter
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+Page = Tuple[List[InterviewState], Optional[str]]
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Stored timestamps are naive UTC; convert aware query values to match."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def _ndjson(first: Page, pages: AsyncIterator[Page]) -> AsyncIterator[bytes]:
+    """
+    One line per interview, serialized one at a time, then a checkpoint line
+    ``{"cursor": ...}`` after every page (``null`` after the last one).
+    """
+    page = first
+    while True:
+        states, cursor = page
+        for state in states:
+            yield state.model_dump_json().encode() + b"\n"
+            # Let live turns run between interviews
+            await asyncio.sleep(0)
+        yield json.dumps({"cursor": cursor}).encode() + b"\n"
+        if cursor is None:
+            return
+        page = await pages.__anext__()
+
+
+async def _gzipped(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip a stream, flushing at every checkpoint so clients see progress."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if chunk.startswith(b'{"cursor"'):
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@router.get("/interviews")
+async def export_interviews(
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    current_phase: Optional[Literal["theory", "coding", "complete"]] = None,
+    interview_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    gzip: bool = False
+):
+    """
+    Stream interviews, transcripts included, as NDJSON.
+
+    Each line is a full ``InterviewState``, except the checkpoint lines
+    ``{"cursor": "..."}`` written after every page. To resume an interrupted
+    export, repeat the request with the last checkpoint's cursor; the final
+    line is ``{"cursor": null}``. Interviews are read from the state store a
+    page at a time, so memory use does not grow with the export's size.
+    """
+    state_filter = StateFilter(
+        created_from=_naive_utc(created_from),
+        created_to=_naive_utc(created_to),
+        current_phase=current_phase,
+        interview_type=interview_type
+    )
+    pages = scan_interview_states(state_filter, cursor, settings.export_page_size)
+    try:
+        # Read the first page up front so a bad cursor is a 400, not a broken stream
+        first = await pages.__anext__()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except NotImplementedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=str(e)
+        )
+
+    body = _ndjson(first, pages)
+    headers = {}
+    if gzip:
+        body = _gzipped(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
@@ -2,6 +2,7 @@
 from fastapi import APIRouter
 from app.models.schemas import HealthResponse
 from app.config import settings
+from app.services.gemini_service import gemini_service
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -14,3 +15,8 @@ async def health_check():
         version=settings.api_version
     )
 
+
+@router.get("/models")
+async def model_health():
+    """Per-model circuit breakers, hedging and routing decisions."""
+    return gemini_service.resilience_stats()
@@ -1,21 +1,42 @@
 """Interview API endpoints."""
+import hashlib
+import json
 import logging
+import time
+from contextlib import suppress
+from typing import Any, AsyncIterator, Dict, Optional
 from uuid import UUID, uuid4
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.websockets import WebSocketState
 from app.models.schemas import (
     CreateInterviewRequest,
     CreateInterviewResponse,
+    EvaluationResponse,
     InterviewResponseRequest,
     InterviewerResponse,
     InterviewStateResponse,
-    InterviewMeta
+    InterviewMeta,
+    SubmissionResponse,
+    SubmitCodeRequest
 )
+from app.config import settings
+from app.core.deadline import deadline_scope
+from app.core import timing
 from app.core.state_manager import (
+    InterviewState,
     create_interview_state,
     get_interview_state,
+    pin_interview_state,
+    unpin_interview_state,
     update_interview_state
 )
+from app.core.locks import interview_locks, submit_coalescer
+from app.core.sessions import Session, session_registry
 from app.agents.interviewer_agent import interviewer_agent
+from app.services.judge_queue import get_judge_queue
+from app.services.submissions import QuotaExceeded, SubmissionRecord, get_submission_queue
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +55,7 @@ async def create_interview(request: CreateInterviewRequest):
         candidate_id = uuid4()
         
         # Create interview state
-        state = create_interview_state(
+        state = await create_interview_state(
             candidate_id=candidate_id,
             candidate_name=request.candidate_name,
             theory_topic=request.theory_topic,
@@ -43,13 +64,14 @@ async def create_interview(request: CreateInterviewRequest):
         )
         
         # Get initial question from interviewer
-        response = await interviewer_agent.get_initial_question(state)
+        with deadline_scope(settings.turn_deadline_seconds):
+            response = await interviewer_agent.get_initial_question(state)
         
         # Add interviewer message to transcript
         state.add_message("assistant", response["speech"])
         
         # Update state
-        update_interview_state(state)
+        await update_interview_state(state)
         
         return CreateInterviewResponse(
             interview_id=state.interview_id,
@@ -72,7 +94,7 @@ async def create_interview(request: CreateInterviewRequest):
 @router.get("/{interview_id}", response_model=InterviewStateResponse)
 async def get_interview(interview_id: UUID):
     """Get interview state."""
-    state = get_interview_state(interview_id)
+    state = await get_interview_state(interview_id)
     
     if not state:
         raise HTTPException(
@@ -93,15 +115,270 @@ async def get_interview(interview_id: UUID):
     )
 
 
-@router.post("/{interview_id}/respond", response_model=InterviewerResponse)
-async def submit_response(interview_id: UUID, request: InterviewResponseRequest):
+@router.post("/{interview_id}/complete", response_model=InterviewStateResponse)
+async def complete_interview(interview_id: UUID):
+    """
+    Mark an interview as complete.
+    
+    Saving the completed state queues the interview for the judge; the
+    evaluation becomes available at ``GET /interviews/{id}/evaluation``.
+    Completing an already complete interview is a no-op.
+    """
+    async with interview_locks.hold(interview_id):
+        state = await get_interview_state(interview_id)
+        
+        if not state:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Interview not found"
+            )
+        
+        if state.current_phase != "complete":
+            state.enter_phase("complete")
+            await update_interview_state(state)
+            session_registry.send(interview_id, {"type": "complete"})
+    
+    return await get_interview(interview_id)
+
+
+@router.get("/{interview_id}/evaluation", response_model=EvaluationResponse)
+async def get_evaluation(interview_id: UUID):
+    """
+    Get the judge's evaluation of a completed interview.
+    
+    Returns ``status="pending"`` until the judge has run.
+    """
+    queue = get_judge_queue()
+    if queue is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Judging is disabled"
+        )
+    
+    record = await queue.results.get(str(interview_id))
+    if record is None:
+        state = await get_interview_state(interview_id)
+        if not state:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Interview not found"
+            )
+        if state.current_phase != "complete":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Interview is not complete"
+            )
+        return EvaluationResponse(interview_id=interview_id, status="pending")
+    
+    return EvaluationResponse(
+        interview_id=interview_id,
+        status="complete",
+        evaluation=record["evaluation"],
+        judged_at=record["judged_at"]
+    )
+
+
+def _submission_response(record: SubmissionRecord, cached: bool = False) -> SubmissionResponse:
+    return SubmissionResponse(
+        submission_id=record.submission_id,
+        interview_id=record.interview_id,
+        status=record.status,
+        cached=cached,
+        result=record.result,
+        error=record.error
+    )
+
+
+@router.post(
+    "/{interview_id}/submissions",
+    response_model=SubmissionResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def submit_code(interview_id: UUID, request: SubmitCodeRequest):
+    """
+    Queue a run of the candidate's code.
+    
+    Returns immediately; poll ``GET /interviews/{id}/submissions/{submission_id}``
+    for the result. Code identical to an earlier submission returns that
+    submission (``cached=true``) and does not use up a run.
+    """
+    queue = get_submission_queue()
+    if queue is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Code execution is disabled"
+        )
+    
+    state = await get_interview_state(interview_id)
+    if not state:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview not found"
+        )
+    if state.current_phase == "complete":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Interview is already complete"
+        )
+    
+    try:
+        record, cached = await queue.submit(
+            interview_id,
+            request.code,
+            language=request.language or state.language,
+            problem_id=state.coding_problem_id
+        )
+    except QuotaExceeded:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Run limit reached ({settings.max_runs_per_interview} per interview)"
+        )
+    
+    return _submission_response(record, cached)
+
+
+@router.get("/{interview_id}/submissions/{submission_id}", response_model=SubmissionResponse)
+async def get_submission(interview_id: UUID, submission_id: UUID, wait: float = 0.0):
+    """
+    Get a code submission and its result.
+    
+    With ``wait`` (seconds, capped at ``submission_max_wait_seconds``) the
+    request long-polls: it returns as soon as the run finishes, or with the
+    current status when the wait is over.
+    """
+    queue = get_submission_queue()
+    if queue is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Code execution is disabled"
+        )
+    
+    wait = min(max(wait, 0.0), settings.submission_max_wait_seconds)
+    record = await queue.wait(submission_id, wait)
+    if record is None or record.interview_id != interview_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Submission not found"
+        )
+    
+    return _submission_response(record)
+
+
+@router.post(
+    "/{interview_id}/respond",
+    response_model=InterviewerResponse,
+    response_model_exclude_none=True
+)
+async def submit_response(
+    interview_id: UUID,
+    request: InterviewResponseRequest,
+    idempotency_key: Optional[str] = Header(None)
+):
     """
     Submit a candidate response and get interviewer's next question.
     
     This is the main interaction endpoint for Phase 1 (text-only).
+    
+    Turns for one interview are serialized. Retries of the same submit
+    share the result instead of triggering another Gemini call: with an
+    ``Idempotency-Key`` header, the in-flight or just-finished result; with
+    no key, only an identical message still in flight (the same answer sent
+    again later is a new turn).
+    
+    Stage timings are returned in a ``Server-Timing`` header, and in the
+    ``debug`` field when ``X-Debug-Timing: 1`` is sent (if enabled).
     """
-    # Get interview state
-    state = get_interview_state(interview_id)
+    if idempotency_key:
+        key = (interview_id, "key", idempotency_key)
+        ttl_seconds = None
+    else:
+        key = (interview_id, "message", _message_digest(request.message))
+        ttl_seconds = 0
+    response = await submit_coalescer.run(
+        key,
+        lambda: _run_turn(interview_id, request.message),
+        ttl_seconds=ttl_seconds
+    )
+    
+    timer = timing.current_timer()
+    if timer is not None and timer.debug:
+        # The coalesced result is shared between requests; never mutate it
+        response = response.model_copy(update={"debug": {"timing": timer.as_dict()}})
+    return response
+
+
+async def _run_turn(interview_id: UUID, message: str) -> InterviewerResponse:
+    """
+    Run one candidate turn while holding the interview's lock.
+    
+    The turn deadline covers the wait for the lock as well as every Gemini
+    attempt made on the candidate's behalf.
+    """
+    timing.attach_current_task()
+    lock_requested = time.perf_counter()
+    with deadline_scope(settings.turn_deadline_seconds):
+        async with interview_locks.hold(interview_id):
+            timing.record("lock", time.perf_counter() - lock_requested)
+            
+            # Get interview state
+            state = await get_interview_state(interview_id)
+            
+            if not state:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Interview not found"
+                )
+            
+            if state.current_phase == "complete":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Interview is already complete"
+                )
+            
+            try:
+                # Add user message to transcript
+                state.add_message("user", message)
+                
+                # Get interviewer response
+                response = await interviewer_agent.respond(state, user_message=message)
+                
+                # Add interviewer response to transcript
+                if response["speech"]:
+                    state.add_message("assistant", response["speech"])
+                
+                # Update state
+                await update_interview_state(state)
+                
+                return InterviewerResponse(
+                    speech=response["speech"],
+                    meta=InterviewMeta(**response["meta"])
+                )
+                
+            except Exception as e:
+                logger.error(f"Error processing response: {e}", exc_info=True)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to process response: {str(e)}"
+                )
+
+
+def _message_digest(message: str) -> str:
+    """Coalescing key for in-flight duplicates from clients that send no idempotency key."""
+    return hashlib.sha256(message.encode("utf-8")).hexdigest()
+
+
+@router.post("/{interview_id}/respond/stream")
+async def submit_response_stream(interview_id: UUID, request: InterviewResponseRequest):
+    """
+    Submit a candidate response and stream the interviewer's reply over SSE.
+    
+    Emits one ``speech`` event per completed sentence so TTS can start on the
+    first sentence, followed by a single ``meta`` event once the full reply
+    has been parsed and the state updated. If the interview is gone or
+    completed by the time the turn gets its lock, a single ``error`` event
+    is sent instead.
+    """
+    state = await get_interview_state(interview_id)
     
     if not state:
         raise HTTPException(
@@ -115,29 +392,135 @@ async def submit_response(interview_id: UUID, request: InterviewResponseRequest)
             detail="Interview is already complete"
         )
     
+    async def event_stream() -> AsyncIterator[str]:
+        timing.attach_current_task()
+        async for event in _stream_turn(interview_id, request.message):
+            if event["type"] == "speech":
+                yield _sse("speech", {"text": event["text"]})
+            elif event["type"] == "error":
+                yield _sse("error", {"detail": event["detail"]})
+            else:
+                yield _sse("meta", event["meta"])
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _stream_turn(interview_id: UUID, message: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run one candidate turn under the interview's lock, streaming the reply.
+    
+    Yields a ``speech`` event per completed sentence, then one ``meta`` event
+    once the full reply has been parsed and the state saved. Yields a single
+    ``error`` event instead if the interview was deleted or completed while
+    the turn waited for the lock.
+    """
+    with deadline_scope(settings.turn_deadline_seconds):
+        async with interview_locks.hold(interview_id):
+            # Re-read under the lock so a concurrent turn's writes are not lost
+            state = await get_interview_state(interview_id)
+            
+            if not state:
+                yield {"type": "error", "detail": "Interview not found"}
+                return
+            
+            if state.current_phase == "complete":
+                yield {"type": "error", "detail": "Interview is already complete"}
+                return
+            
+            state.add_message("user", message)
+            
+            async for event in interviewer_agent.respond_stream(state, user_message=message):
+                if event["event"] == "speech":
+                    yield {"type": "speech", "text": event["text"]}
+                    continue
+                
+                if event["speech"]:
+                    state.add_message("assistant", event["speech"])
+                await update_interview_state(state)
+                
+                yield {"type": "meta", "meta": InterviewMeta(**event["meta"]).model_dump()}
+
+
+@router.websocket("/{interview_id}/ws")
+async def interview_session(websocket: WebSocket, interview_id: UUID):
+    """
+    Conversational session over a single WebSocket.
+    
+    The interview state stays pinned in memory while the socket is open, so
+    a turn is one frame in and a few frames out, with no per-turn request
+    parsing or state lookup. Client frames:
+    
+    - ``{"type": "message", "message": "...", "id": "..."}``: a candidate turn
+      (``id`` is optional and echoed on the replies)
+    - ``{"type": "ping"}``: answered with ``{"type": "pong"}``
+    
+    Server frames: ``ready`` on connect, ``speech`` per sentence and ``meta``
+    per turn (as on the SSE endpoint), ``error``, and frames pushed by other
+    components such as ``submission`` results and ``complete``.
+    """
+    state = await get_interview_state(interview_id)
+    if not state:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Interview not found")
+        return
+    
+    await websocket.accept()
+    state = pin_interview_state(state)
+    session = session_registry.open(websocket, interview_id)
+    session.send({"type": "ready", "current_phase": state.current_phase, "theory_phase": state.theory_phase})
     try:
-        # Add user message to transcript
-        state.add_message("user", request.message)
-        
-        # Get interviewer response
-        response = await interviewer_agent.respond(state, user_message=request.message)
-        
-        # Add interviewer response to transcript
-        if response["speech"]:
-            state.add_message("assistant", response["speech"])
-        
-        # Update state
-        update_interview_state(state)
-        
-        return InterviewerResponse(
-            speech=response["speech"],
-            meta=InterviewMeta(**response["meta"])
-        )
-        
+        while not session.closed:
+            try:
+                frame = json.loads(await websocket.receive_text())
+                kind = frame.get("type")
+            except (ValueError, AttributeError):
+                session.send({"type": "error", "detail": "Frames must be JSON objects"})
+                continue
+            
+            if kind == "ping":
+                session.send({"type": "pong"})
+            elif kind == "message":
+                await _session_turn(session, state, frame)
+            else:
+                session.send({"type": "error", "detail": f"Unknown frame type: {kind}"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        unpin_interview_state(interview_id)
+        await session_registry.close(session)
+        if session.closed and websocket.client_state == WebSocketState.CONNECTED:
+            with suppress(Exception):
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Client too slow")
+
+
+async def _session_turn(session: Session, state: InterviewState, frame: Dict[str, Any]):
+    """Run one turn of a WebSocket session, pushing its reply frames."""
+    reply_id = {"id": frame["id"]} if "id" in frame else {}
+    try:
+        request = InterviewResponseRequest(message=frame.get("message"))
+    except ValidationError as e:
+        session.send({"type": "error", "detail": e.errors(include_url=False)[0]["msg"], **reply_id})
+        return
+    
+    if state.current_phase == "complete":
+        session.send({"type": "error", "detail": "Interview is already complete", **reply_id})
+        return
+    
+    try:
+        async for event in _stream_turn(state.interview_id, request.message):
+            session.send({**event, **reply_id})
     except Exception as e:
-        logger.error(f"Error processing response: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process response: {str(e)}"
-        )
+        logger.error(f"Error processing session turn: {e}", exc_info=True)
+        session.send({"type": "error", "detail": "Failed to process response", **reply_id})
+        return
+    
+    if state.current_phase == "complete":
+        session.send({"type": "complete"})
+
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
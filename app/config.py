@@ -1,6 +1,6 @@
 """Application configuration using Pydantic settings."""
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -22,13 +22,77 @@ class Settings(BaseSettings):
     gemini_api_key: str
     gemini_model_interviewer: str = "gemini-1.5-flash"
     gemini_model_judge: str = "gemini-1.5-pro"
-    gemini_max_retries: int = 3
-    gemini_timeout: int = 30
+    gemini_model_interviewer_fallback: Optional[str] = None  # Faster model used while the interviewer model is over budget
+    gemini_max_retries: int = 3  # Retries of transient errors, bounded by the turn deadline
+    gemini_timeout: int = 30  # Per-attempt timeout in seconds
+    gemini_model_cache_size: int = 64  # Cached model handles (model, system instruction)
+    gemini_max_concurrency: int = 256  # In-flight Gemini calls per worker
+    gemini_use_async_client: bool = True  # False falls back to asyncio.to_thread
+    gemini_structured_output: bool = True  # Constrain JSON replies with a response schema
+    gemini_json_reask: bool = True  # Re-ask once when local JSON repair fails
+    gemini_prefix_cache_backend: str = "none"  # "gemini" | "local" | "none" (shipped prompts are below min_tokens)
+    gemini_prefix_cache_ttl_seconds: int = 3600
+    gemini_prefix_cache_refresh_margin_seconds: int = 300
+    gemini_prefix_cache_min_tokens: int = 1024  # Provider minimum for cached content
+    gemini_breaker_failure_threshold: int = 5  # Consecutive transient failures that open a model's circuit
+    gemini_breaker_reset_seconds: float = 30.0  # Fail fast this long before probing again
+    gemini_hedge_enabled: bool = False  # Duplicate calls that run past the model's p95
+    gemini_hedge_min_delay_ms: int = 250
+    gemini_hedge_min_samples: int = 20  # Latencies observed before hedging kicks in
+    
+    # Model routing (interviewer turns)
+    router_enabled: bool = True
+    router_p95_budget_ms: int = 2500  # Fail over when the primary's rolling p95 exceeds this
+    router_error_rate_budget: float = 0.2  # ... or when this share of recent calls failed
+    router_min_samples: int = 20
+    router_probe_interval_seconds: float = 5.0  # One call to the primary this often while failed over
+    router_recovery_samples: int = 5  # Healthy probes needed to move back to the primary
+    
+    # Turn handling
+    turn_deadline_seconds: Optional[float] = 20.0  # End-to-end budget for one turn (None = unbounded)
+    idempotency_ttl_seconds: int = 30  # How long a finished turn is replayed to retries
+    context_token_budget: int = 1500  # Verbatim transcript window in the prompt
+    context_summary_tokens: int = 200  # Rolling summary of older turns
+    context_summary_enabled: bool = True  # False keeps evicted turns as clipped lines only
+    
+    # Opening question pool
+    question_pool_enabled: bool = True
+    question_pool_depth: int = 3  # Ready questions per (topic, interview_type)
+    question_pool_max_age_seconds: int = 1800  # Discard older questions for variety
+    question_pool_max_keys: int = 500
+    question_pool_refill_concurrency: int = 4
+    question_pool_warm_topics: List[str] = []  # Topics pre-filled at startup (ml_junior)
     
     # Database
-    database_url: Optional[str] = None  # Will use in-memory for Phase 1
+    database_url: Optional[str] = None  # e.g. postgresql+asyncpg://... or sqlite+aiosqlite:///interviews.db
     redis_url: str = "redis://localhost:6379/0"
     
+    # State store
+    state_backend: str = "memory"  # "memory" | "redis" | "sql"
+    redis_state_prefix: str = "interview"
+    redis_state_ttl_seconds: Optional[int] = 7 * 24 * 3600
+    state_max_sessions: Optional[int] = 10000  # In-memory capacity (None = unbounded)
+    state_idle_ttl_seconds: Optional[int] = 2 * 3600  # Evict sessions idle this long
+    state_completed_ttl_seconds: Optional[int] = 600  # Evict completed sessions after this
+    state_sweep_interval_seconds: int = 60
+    state_cold_backend: Optional[str] = None  # e.g. "redis" to spill instead of drop
+    
+    # State snapshots (state_backend="memory": reload live interviews after a restart)
+    state_snapshot_dir: Optional[str] = None  # One directory per worker process (None = off)
+    state_snapshot_interval_seconds: float = 1.0  # Changed interviews are appended this often
+    state_snapshot_compact_bytes: int = 64 * 1024 * 1024  # Fold the log into the snapshot past this size
+    
+    # SQL state store (state_backend="sql", uses database_url)
+    database_pool_size: int = 10
+    database_max_overflow: int = 10
+    database_pool_timeout_seconds: float = 5.0
+    database_pool_recycle_seconds: int = 1800
+    sql_flush_interval_seconds: float = 0.05  # Write-behind: saves are batched for this long
+    sql_flush_max_interviews: int = 500  # Flush early with this many interviews pending
+    sql_create_tables: bool = True
+    sql_state_cache_size: int = 1000  # Recently used states kept for reads
+    sql_state_cache_revalidate: bool = False  # True when several workers may write the same interview
+    
     # LiveKit (Phase 2)
     livekit_url: Optional[str] = None
     livekit_api_key: Optional[str] = None
@@ -38,7 +102,17 @@ class Settings(BaseSettings):
     deepgram_api_key: Optional[str] = None
     elevenlabs_api_key: Optional[str] = None
     
-    # Docker Sandbox
+    # Code sandbox
+    sandbox_enabled: bool = True
+    sandbox_backend: str = "docker"  # "docker" | "local" (rlimited subprocesses, dev only)
+    sandbox_allow_local: bool = False  # The local backend has no filesystem isolation; dev machines only
+    sandbox_pool_size: int = 4  # Warm workers per API process
+    sandbox_docker_image: str = "python:3.11-slim"
+    sandbox_output_limit_bytes: int = 64 * 1024  # stdout/stderr kept per run
+    test_timeout_seconds: float = 1.0  # Per test case, unless the problem sets its own
+    problems_dir: Optional[str] = None  # Problem definitions (defaults to app/data/problems)
+    
+    # Docker Sandbox (limits apply to both sandbox backends)
     docker_network_mode: str = "none"
     docker_mem_limit: str = "512m"
     docker_cpu_quota: int = 100000
@@ -46,6 +120,38 @@ class Settings(BaseSettings):
     execution_timeout: int = 5
     max_runs_per_interview: int = 10
     
+    # Judge (batch evaluation of completed interviews)
+    judge_enabled: bool = True
+    judge_backend: str = "asyncio"  # "asyncio" (in-process) | "celery"
+    judge_result_backend: str = "memory"  # "memory" | "redis" (required for celery)
+    judge_result_ttl_seconds: Optional[int] = 30 * 24 * 3600
+    judge_max_concurrency: int = 4  # In-flight judge calls, separate from gemini_max_concurrency
+    judge_workers: int = 2
+    judge_batch_size: int = 4  # Transcripts evaluated per judge call
+    judge_batch_wait_seconds: float = 2.0  # Max wait for a batch to fill
+    judge_max_attempts: int = 3
+    
+    # Code submissions (queued runs, limited by max_runs_per_interview)
+    submission_backend: str = "asyncio"  # "asyncio" (in-process workers) | "celery"
+    submission_store_backend: str = "memory"  # "memory" | "redis" (required with several API workers)
+    submission_ttl_seconds: Optional[int] = 24 * 3600
+    submission_max_wait_seconds: float = 30.0  # Longest long-poll on a submission
+    
+    # Session timers (silence nudges and phase time limits)
+    timers_enabled: bool = True
+    timer_tick_seconds: float = 0.5
+    silence_nudge_seconds: float = 45.0  # Candidate silence before a nudge (live sessions only)
+    silent_coding_nudge_seconds: float = 600.0  # Same, while coding in silent mode
+    silence_max_nudges: int = 2  # Per silence; reset by the candidate's next message
+    theory_time_limit_seconds: Optional[float] = 20 * 60  # Then the interview moves on to coding
+    coding_time_limit_seconds: Optional[float] = 30 * 60  # Then the interview is completed
+    
+    # WebSocket sessions
+    ws_send_queue_size: int = 64  # Frames queued per connection before a slow client is dropped
+    
+    # Bulk export
+    export_page_size: int = 100  # Interviews fetched from the state store per round trip
+    
     # Celery
     celery_broker_url: str = "redis://localhost:6379/0"
     celery_result_backend: str = "redis://localhost:6379/0"
@@ -53,6 +159,15 @@ class Settings(BaseSettings):
     # Monitoring
     sentry_dsn: Optional[str] = None
     prometheus_port: int = 9090
+    metrics_enabled: bool = True  # Prometheus metrics at /metrics
+    metrics_separate_port: bool = False  # Also serve them on prometheus_port
+    server_timing_enabled: bool = True  # Per-stage Server-Timing response header
+    timing_debug_field: bool = False  # Allow X-Debug-Timing: 1 to fill InterviewerResponse.debug
+    profile_sample_rate: float = 0.0  # Share of requests run under the sampling profiler
+    profile_allow_header: bool = False  # Profile requests sending X-Profile: 1
+    profile_interval_ms: int = 5
+    profile_slow_ms: int = 2000  # Only keep profiles of requests slower than this
+    profile_output_dir: str = "profiles"  # Collapsed stacks (flamegraph.pl / speedscope)
 
 
 settings = Settings()
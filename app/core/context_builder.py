@@ -0,0 +1,207 @@
+"""Incremental prompt context with a token-budgeted window and rolling summary."""
+import asyncio
+import contextvars
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, Awaitable, Callable, Deque, List, Optional, Tuple
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.core.state_manager import InterviewState
+
+logger = logging.getLogger(__name__)
+
+# (previous summary, evicted transcript lines) -> new summary
+Summarizer = Callable[[str, List[str]], Awaitable[str]]
+
+# Evicted lines waiting for the next summary are kept clipped to this length
+_PENDING_LINE_CHARS = 160
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+class ContextBuilder:
+    """
+    Prompt context for one interview, maintained turn by turn.
+
+    Only transcript entries added since the previous turn are processed.
+    Recent turns are kept verbatim up to ``token_budget``; older turns are
+    evicted into a rolling summary that is refreshed in the background by a
+    summarizer (normally the LLM), so building the prompt never waits on it.
+    Until a refresh lands, evicted turns are carried as clipped lines, so
+    earlier-phase context is never dropped outright.
+
+    The summary and the number of transcript entries it covers are written
+    to the state (``context_summary``, ``context_summarized``), so a builder
+    rebuilt after a reload starts from the summary instead of the whole
+    transcript.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = None,
+        summary_token_budget: int = None,
+        summary: str = "",
+        summarized: int = 0
+    ):
+        self.token_budget = token_budget or settings.context_token_budget
+        self.summary_token_budget = summary_token_budget or settings.context_summary_tokens
+
+        self.summary = summary
+        self._window: Deque[Tuple[str, int]] = deque()
+        self._window_tokens = 0
+        self._consumed = summarized
+        # Transcript entries covered by the summary; pending lines follow them
+        self._summarized = summarized
+        self._renders = 0
+        self._pending: List[str] = []
+        self._header_key: Optional[tuple] = None
+        self._header = ""
+        self._summary_task: Optional[asyncio.Task] = None
+
+    def sync(self, state: "InterviewState"):
+        """Fold transcript entries added since the last call into the window."""
+        transcript = state.transcript
+        for index in range(self._consumed, len(transcript)):
+            line = f"{transcript.role_at(index)}: {transcript.content_at(index)}"
+            tokens = estimate_tokens(line)
+            self._window.append((line, tokens))
+            self._window_tokens += tokens
+        self._consumed = len(transcript)
+
+        # Always keep the latest entry, even if it alone exceeds the budget
+        while self._window_tokens > self.token_budget and len(self._window) > 1:
+            line, tokens = self._window.popleft()
+            self._window_tokens -= tokens
+            self._pending.append(line)
+
+        if len(self._pending) * _PENDING_LINE_CHARS > self.summary_token_budget * 4 * 2:
+            self._compact_pending(state)
+
+    def _compact_pending(self, state: "InterviewState"):
+        """
+        Fold pending lines into the summary locally.
+
+        Only reached when background summaries keep failing or lag far
+        behind; clipping keeps the prompt bounded at the cost of detail.
+        """
+        clipped = [line[:_PENDING_LINE_CHARS // 2] for line in self._pending]
+        summary = " ".join(filter(None, [self.summary, *clipped]))
+        max_chars = self.summary_token_budget * 4
+        self._set_summary(state, summary[-max_chars:], len(self._pending))
+
+    def _set_summary(self, state: "InterviewState", summary: str, folded: int):
+        """Replace the summary with one that also covers the first ``folded`` pending lines."""
+        self.summary = summary
+        del self._pending[:folded]
+        self._summarized += folded
+        state.context_summary = self.summary
+        state.context_summarized = self._summarized
+
+    def render(self, state: "InterviewState", user_message: Optional[str]) -> str:
+        """Build the prompt for the next turn."""
+        self.sync(state)
+        self._renders += 1
+
+        context_parts = [self._render_header(state)]
+
+        if self.summary or self._pending:
+            context_parts.append("")
+            context_parts.append("Earlier In This Interview:")
+            if self.summary:
+                context_parts.append(self.summary)
+            for line in self._pending:
+                context_parts.append(line[:_PENDING_LINE_CHARS])
+
+        context_parts.append("")
+        context_parts.append("Recent Transcript:")
+        context_parts.extend(line for line, _ in self._window)
+
+        if user_message:
+            context_parts.append(f"\nLatest User Message: {user_message}")
+
+        context_parts.append(
+            "\nGenerate your next response following the rules. "
+            "If this is the first message, ask the Phase 1 core concept question."
+        )
+
+        return "\n".join(context_parts)
+
+    def schedule_summary(self, summarizer: Summarizer, state: "InterviewState"):
+        """
+        Refresh the rolling summary in the background if turns were evicted.
+
+        Skipped for a builder that has rendered only one prompt: it was just
+        rebuilt for a reloaded state (Redis, SQL cache miss, snapshot
+        restore) that is likely discarded after this turn, along with the
+        summary. Such builders rely on local compaction instead.
+        """
+        if not self._pending or self._renders < 2:
+            return
+        if self._summary_task is not None and not self._summary_task.done():
+            return
+        # Fresh context: the summary outlives the turn's deadline and request timer
+        self._summary_task = asyncio.create_task(
+            self._refresh_summary(summarizer, state),
+            context=contextvars.Context()
+        )
+
+    async def _refresh_summary(self, summarizer: Summarizer, state: "InterviewState"):
+        evicted = list(self._pending)
+        try:
+            summary = await summarizer(self.summary, evicted)
+        except Exception as e:
+            logger.warning(f"Transcript summary refresh failed: {e}")
+            return
+
+        summary = summary.strip()
+        max_chars = self.summary_token_budget * 4
+        if len(summary) > max_chars:
+            summary = summary[:max_chars].rsplit(" ", 1)[0]
+
+        if self._pending[:len(evicted)] != evicted:
+            # Pending lines were compacted locally meanwhile; that summary is newer
+            return
+        # Lines evicted while the summary was being generated stay pending
+        self._set_summary(state, summary, len(evicted))
+
+    def _render_header(self, state: "InterviewState") -> str:
+        """Fixed state header, re-rendered only when one of its fields changes."""
+        key = (
+            state.current_phase,
+            state.theory_phase,
+            state.theory_topic,
+            state.theory_followups_asked,
+            state.candidate_name,
+        )
+        if key != self._header_key:
+            self._header_key = key
+            self._header = "\n".join([
+                "Interview State:",
+                f"- Current Phase: {state.current_phase}",
+                f"- Theory Phase: {state.theory_phase}",
+                f"- Theory Topic: {state.theory_topic}",
+                f"- Follow-ups Asked: {state.theory_followups_asked}",
+                f"- Candidate: {state.candidate_name}",
+            ])
+        return self._header
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Estimated size of the transcript part of the prompt."""
+        pending = sum(estimate_tokens(line[:_PENDING_LINE_CHARS]) for line in self._pending)
+        return self._window_tokens + estimate_tokens(self.summary) + pending
+
+
+def get_context_builder(state: "InterviewState") -> ContextBuilder:
+    """Get the builder cached on a state, creating it from the persisted summary on first use."""
+    builder = state._context_builder
+    if builder is None:
+        builder = state._context_builder = ContextBuilder(
+            summary=state.context_summary,
+            summarized=min(state.context_summarized, len(state.transcript))
+        )
+    return builder
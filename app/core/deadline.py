@@ -0,0 +1,59 @@
+"""Per-turn deadlines propagated through the call stack."""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Absolute time.monotonic() by which the current turn must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("turn_deadline", default=None)
+
+
+class TurnDeadlineExceeded(TimeoutError):
+    """The turn ran out of time before the work could (re)start."""
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound everything awaited inside the block to ``seconds`` from now.
+
+    Nested scopes can only tighten an outer deadline, never extend it.
+    """
+    if seconds is None:
+        yield
+        return
+
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current turn, or None outside a deadline scope."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def cap_timeout(timeout: float) -> float:
+    """
+    Clamp a per-call timeout to the time left in the turn.
+
+    Raises:
+        TurnDeadlineExceeded: If the turn has no time left
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise TurnDeadlineExceeded("Turn deadline exceeded")
+    return min(timeout, left)
+
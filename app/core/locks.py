@@ -0,0 +1,131 @@
+"""Per-interview serialization and duplicate-request coalescing."""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from uuid import UUID
+from app.config import settings
+
+
+class InterviewLockRegistry:
+    """
+    One asyncio lock per interview.
+
+    Locks are created on demand and dropped as soon as nobody holds or waits
+    on them, so the registry only ever contains interviews with a turn in
+    progress.
+    """
+
+    def __init__(self):
+        self._locks: Dict[UUID, asyncio.Lock] = {}
+        self._refs: Dict[UUID, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, interview_id: UUID) -> AsyncIterator[None]:
+        """Serialize the enclosed block with every other holder for this interview."""
+        lock = self._locks.get(interview_id)
+        if lock is None:
+            lock = self._locks[interview_id] = asyncio.Lock()
+        self._refs[interview_id] = self._refs.get(interview_id, 0) + 1
+
+        try:
+            async with lock:
+                yield
+        finally:
+            self._refs[interview_id] -= 1
+            if self._refs[interview_id] == 0:
+                del self._refs[interview_id]
+                del self._locks[interview_id]
+
+    def locked(self, interview_id: UUID) -> bool:
+        """Whether a turn is currently running for the interview."""
+        lock = self._locks.get(interview_id)
+        return lock is not None and lock.locked()
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+class RequestCoalescer:
+    """
+    Collapse identical requests onto a single execution.
+
+    The first request for a key starts the work as a task; duplicates that
+    arrive while it runs, or within ``ttl_seconds`` after it succeeds, await
+    the same result instead of repeating it (callers can pass a shorter TTL,
+    or 0 to coalesce only while the work is in flight). The task is shielded, so a
+    client that disconnects mid-turn does not cancel the work its retry is
+    waiting on. Failures are not cached - the next retry runs again.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[asyncio.Task, float]] = {}
+        self.executed = 0
+        self.coalesced = 0
+        self._next_purge = 0.0
+
+    async def run(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        ttl_seconds: Optional[float] = None
+    ) -> Any:
+        """
+        Run ``factory`` once per key and share its result.
+
+        Args:
+            key: Idempotency key identifying identical requests
+            factory: Zero-argument coroutine function doing the actual work
+            ttl_seconds: How long a success is replayed (defaults to ``self.ttl_seconds``)
+
+        Returns:
+            Result of the (possibly shared) execution
+        """
+        self._purge()
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self.coalesced += 1
+            return await asyncio.shield(entry[0])
+
+        self.executed += 1
+        task = asyncio.ensure_future(factory())
+        # Expiry is only known once the task is done; inf keeps it pinned until then
+        self._entries[key] = (task, float("inf"))
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        task.add_done_callback(lambda t: self._on_done(key, t, ttl_seconds))
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task, ttl_seconds: float):
+        """Keep successful results for the TTL, forget failures immediately."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not task:
+            return
+        if task.cancelled() or task.exception() is not None or ttl_seconds <= 0:
+            del self._entries[key]
+        else:
+            self._entries[key] = (task, time.monotonic() + ttl_seconds)
+
+    def _purge(self):
+        """Drop completed entries past their TTL (at most once per second)."""
+        now = time.monotonic()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + 1.0
+        expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Coalescing counters."""
+        return {
+            "entries": len(self._entries),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+        }
+
+
+# Global instances
+interview_locks = InterviewLockRegistry()
+submit_coalescer = RequestCoalescer(ttl_seconds=settings.idempotency_ttl_seconds)
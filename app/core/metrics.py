@@ -0,0 +1,168 @@
+"""Prometheus metrics for HTTP requests, Gemini calls and state storage."""
+import logging
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily, Metric
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "interview"
+
+# Turn-scale buckets: sub-10ms store ops up to multi-second LLM turns
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0)
+_FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    namespace=NAMESPACE,
+    buckets=_LATENCY_BUCKETS
+)
+
+GEMINI_LATENCY = Histogram(
+    "gemini_call_duration_seconds",
+    "Gemini provider call latency (excludes limiter queueing)",
+    ["model_type", "model", "outcome"],
+    namespace=NAMESPACE,
+    buckets=_LATENCY_BUCKETS
+)
+
+GEMINI_QUEUE_WAIT = Histogram(
+    "gemini_queue_wait_seconds",
+    "Time spent waiting for a Gemini concurrency slot",
+    ["model_type"],
+    namespace=NAMESPACE,
+    buckets=_LATENCY_BUCKETS
+)
+
+GEMINI_TOKENS = Counter(
+    "gemini_tokens",
+    "Gemini tokens by kind (prompt, output, cached)",
+    ["model_type", "kind"],
+    namespace=NAMESPACE
+)
+
+GEMINI_RETRIES = Counter(
+    "gemini_retries",
+    "Gemini calls retried after a transient error",
+    ["model_type"],
+    namespace=NAMESPACE
+)
+
+JSON_PARSE_LATENCY = Histogram(
+    "json_parse_duration_seconds",
+    "Time to parse (and if needed repair) a JSON completion",
+    ["outcome"],
+    namespace=NAMESPACE,
+    buckets=_FAST_BUCKETS
+)
+
+STORE_LATENCY = Histogram(
+    "state_store_operation_duration_seconds",
+    "State store operation latency",
+    ["backend", "operation"],
+    namespace=NAMESPACE,
+    buckets=_FAST_BUCKETS + (0.25, 0.5, 1.0)
+)
+
+
+def record_usage(model_type: str, usage: Any):
+    """Count tokens from a Gemini ``usage_metadata`` (no-op when absent)."""
+    if usage is None:
+        return
+    for kind, field in (
+        ("prompt", "prompt_token_count"),
+        ("output", "candidates_token_count"),
+        ("cached", "cached_content_token_count"),
+    ):
+        count = getattr(usage, field, 0) or 0
+        if count:
+            GEMINI_TOKENS.labels(model_type, kind).inc(count)
+
+
+StatsSource = Callable[[], Dict[str, Any]]
+
+
+class StatsCollector:
+    """
+    Exports the ``stats()`` dicts components already keep as gauges.
+
+    Each numeric value becomes ``interview_<prefix>_<key>``. Labelled
+    sources return ``{label value: {key: value}}`` (e.g. per model). Values
+    are read at scrape time, so nothing is duplicated on the hot path.
+    """
+
+    def __init__(self):
+        self._sources: Dict[Tuple[str, Optional[str]], StatsSource] = {}
+
+    def add(self, prefix: str, stats: StatsSource, label: Optional[str] = None):
+        """Register (or replace) a stats source."""
+        self._sources[(prefix, label)] = stats
+
+    def describe(self) -> Iterator[Metric]:
+        # Skip the registration-time collect(); sources are added later
+        return iter(())
+
+    def collect(self) -> Iterator[Metric]:
+        for (prefix, label), stats in list(self._sources.items()):
+            try:
+                values = stats()
+            except Exception as e:
+                logger.warning(f"Metrics source {prefix} failed: {e}")
+                continue
+
+            families: Dict[str, GaugeMetricFamily] = {}
+            rows = values.items() if label else [(None, values)]
+            for label_value, row in rows:
+                for key, value in row.items():
+                    if isinstance(value, bool):
+                        value = float(value)
+                    if not isinstance(value, (int, float)):
+                        continue
+                    name = f"{NAMESPACE}_{prefix}_{key}"
+                    family = families.get(name)
+                    if family is None:
+                        family = families[name] = GaugeMetricFamily(
+                            name,
+                            f"{prefix} {key}",
+                            labels=[label] if label else None
+                        )
+                    family.add_metric([str(label_value)] if label else [], value)
+            yield from families.values()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware observing request latency per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Template (e.g. /interviews/{interview_id}) keeps label cardinality bounded
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(scope["method"], route, str(status_code)).observe(
+                time.perf_counter() - start
+            )
+
+
+# Global instance
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
@@ -0,0 +1,94 @@
+"""Coding problems and their test suites, loaded from JSON definitions."""
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "problems")
+
+
+class TestCase(BaseModel):
+    """One call of the candidate's function and its expected return value."""
+    name: str
+    args: List[Any] = Field(default_factory=list)
+    kwargs: Dict[str, Any] = Field(default_factory=dict)
+    expected: Any
+    timeout: Optional[float] = None  # Overrides the problem's per-test timeout
+
+
+class CodingProblem(BaseModel):
+    """Coding interview problem."""
+    id: str
+    title: str
+    difficulty: str = "easy"
+    description: str
+    function: str  # Name of the function the candidate implements
+    tests: List[TestCase]
+    test_timeout_seconds: Optional[float] = None  # Defaults to settings.test_timeout_seconds
+    tolerance: float = 1e-6  # For float comparisons
+
+
+class ProblemRegistry:
+    """
+    Problems by ID, read from ``<id>.json`` files in a directory.
+
+    Each problem is parsed once and kept, together with its test calls
+    (arguments only) already serialized for the test harness.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or _DEFAULT_DIRECTORY
+        self._problems: Dict[str, CodingProblem] = {}
+        self._calls: Dict[str, List[Dict[str, Any]]] = {}
+
+    def get(self, problem_id: str) -> Optional[CodingProblem]:
+        """Problem by ID, or None if there is no such problem."""
+        problem = self._problems.get(problem_id)
+        if problem is None:
+            problem = self._load(problem_id)
+        return problem
+
+    def calls(self, problem: CodingProblem) -> List[Dict[str, Any]]:
+        """
+        Test calls of a problem as the harness expects them (cached).
+
+        Expected results are left out: they never enter the sandbox.
+        """
+        calls = self._calls.get(problem.id)
+        if calls is None:
+            calls = self._calls[problem.id] = [
+                test.model_dump(exclude={"expected"}, exclude_none=True) for test in problem.tests
+            ]
+        return calls
+
+    def ids(self) -> List[str]:
+        """IDs of all problems in the directory."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith(".json"))
+
+    def _load(self, problem_id: str) -> Optional[CodingProblem]:
+        # IDs come from requests; never let one name a path outside the directory
+        if not problem_id or os.path.basename(problem_id) != problem_id:
+            return None
+        path = os.path.join(self.directory, f"{problem_id}.json")
+        try:
+            with open(path) as f:
+                problem = CodingProblem.model_validate(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Invalid problem definition {path}: {e}")
+            return None
+        self._problems[problem_id] = problem
+        return problem
+
+
+# Global instance
+problem_registry = ProblemRegistry(settings.problems_dir)
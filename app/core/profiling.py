@@ -0,0 +1,126 @@
+"""Sampling profiler for individual requests, emitting collapsed stacks."""
+import asyncio
+import os
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Iterable, List, Optional, Set
+
+# Frames in these files are plumbing, not where a request spends its time
+_SKIP_FILES = ("asyncio" + os.sep, "threading.py", "selectors.py", "contextlib.py")
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+    return f"{module}:{code.co_qualname}"
+
+
+def _is_plumbing(frame: FrameType) -> bool:
+    return any(part in frame.f_code.co_filename for part in _SKIP_FILES)
+
+
+def _await_chain(task: asyncio.Task) -> List[FrameType]:
+    """
+    Frames of the coroutines a task is suspended in, outermost first.
+
+    ``Task.get_stack`` returns a single frame for a suspended coroutine, so
+    the ``cr_await`` chain is followed by hand.
+    """
+    frames = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = (
+            getattr(awaitable, "cr_frame", None)
+            or getattr(awaitable, "ag_frame", None)
+            or getattr(awaitable, "gi_frame", None)
+        )
+        if frame is not None:
+            frames.append(frame)
+        awaitable = (
+            getattr(awaitable, "cr_await", None)
+            or getattr(awaitable, "ag_await", None)
+            or getattr(awaitable, "gi_yieldfrom", None)
+        )
+    return frames
+
+
+class SamplingProfiler:
+    """
+    Samples where one request is spending its wall time.
+
+    A daemon thread wakes every ``interval`` seconds and records, for the
+    request's task and any tasks attached to it, the chain of coroutines it
+    is currently awaiting in. It also records what the event-loop thread is
+    executing, which surfaces CPU work blocking every request. Output is
+    in collapsed-stack format (``frame;frame;frame count``), ready for
+    flamegraph.pl or speedscope.
+    """
+
+    def __init__(
+        self,
+        root_task: Optional[asyncio.Task],
+        tasks: Set[asyncio.Task],
+        interval: float = 0.005
+    ):
+        self.root_task = root_task
+        self.tasks = tasks
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._loop_thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample()
+            except Exception:
+                # The loop mutates task state concurrently; skip a torn sample
+                continue
+
+    def _sample(self):
+        tasks = [self.root_task] if self.root_task is not None else []
+        tasks.extend(self.tasks)
+        for task in tasks:
+            if task.done():
+                continue
+            stack = [_frame_label(frame) for frame in _await_chain(task) if not _is_plumbing(frame)]
+            if stack:
+                self.samples[f"[await] {task.get_name()};" + ";".join(stack)] += 1
+
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is not None and frame.f_code.co_filename.endswith("selectors.py"):
+            # Waiting in select(): the loop has nothing to run
+            self.samples["[event-loop];idle"] += 1
+            return
+        frames: List[str] = []
+        while frame is not None:
+            if not _is_plumbing(frame):
+                frames.append(_frame_label(frame))
+            frame = frame.f_back
+        if frames:
+            self.samples["[event-loop];" + ";".join(reversed(frames))] += 1
+
+    def collapsed(self) -> Iterable[str]:
+        for stack, count in self.samples.most_common():
+            yield f"{stack} {count}"
+
+    def dump(self, directory: str, name: str) -> str:
+        """Write the collapsed stacks to ``directory/name.collapsed``."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}.collapsed")
+        with open(path, "w") as f:
+            for line in self.collapsed():
+                f.write(line + "\n")
+        return path
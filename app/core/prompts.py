@@ -37,7 +37,8 @@ Then END.
     "followup_used": false,
     "flag_vague": false,
     "flag_incorrect": false,
-    "end_theory_round": false
+    "end_theory_round": false,
+    "mode": "problem"
   }}
 }}
 
@@ -46,6 +47,7 @@ Then END.
 - Never teach
 - Never exceed 3 phases
 - If Phase 3 complete → set end_theory_round = true
+- mode: "problem" in theory. In coding: "silent" once the candidate starts coding, "discussion" after a submission
 """
 
 
@@ -154,3 +156,30 @@ OUTPUT (FINAL, CANONICAL):
 This JSON is what a recruiter reads. Nothing else matters.
 """
 
+
+
+TRANSCRIPT_SUMMARY_PROMPT = """
+Update the running summary of an interview transcript.
+
+Keep: questions asked, the candidate's key claims, mistakes, vagueness.
+Drop: pleasantries, repetition.
+Write plain sentences, max {max_words} words total. No lists, no judgement.
+
+Current summary:
+{summary}
+
+New transcript lines:
+{lines}
+
+Updated summary:
+"""
+
+
+JSON_REASK_PROMPT = """
+{prompt}
+
+Your previous reply could not be parsed as JSON:
+{response}
+
+Reply again with the complete JSON object only. No markdown, no commentary.
+"""
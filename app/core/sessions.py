@@ -0,0 +1,124 @@
+"""Open WebSocket sessions per interview, for pushing server-initiated messages."""
+import asyncio
+import contextvars
+import logging
+from typing import Any, Dict, Optional, Set
+from uuid import UUID
+from fastapi import WebSocket
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Session:
+    """
+    One WebSocket connection to an interview.
+
+    Frames are queued and written by a single writer task, so turn replies
+    and pushes from other components never interleave on the socket. A
+    client that stops reading fills its queue and is disconnected rather
+    than holding memory for it.
+    """
+
+    def __init__(self, websocket: WebSocket, interview_id: UUID, queue_size: int = 64):
+        self.websocket = websocket
+        self.interview_id = interview_id
+        self._outbox: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(queue_size)
+        self._writer: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        # Fresh context: the writer outlives any one turn's deadline
+        self._writer = asyncio.create_task(self._write(), context=contextvars.Context())
+
+    def send(self, message: Dict[str, Any]) -> bool:
+        """Queue a frame without waiting; returns False if the session was dropped."""
+        if self._writer is None or self._writer.done():
+            return False
+        try:
+            self._outbox.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning(f"Session for {self.interview_id} is not reading, disconnecting")
+            self._writer.cancel()
+            return False
+        return True
+
+    async def _write(self):
+        while True:
+            message = await self._outbox.get()
+            if message is None:
+                return
+            await self.websocket.send_json(message)
+
+    async def close(self) -> None:
+        """Write what is queued, then stop the writer."""
+        if self._writer is None:
+            return
+        try:
+            self._outbox.put_nowait(None)
+        except asyncio.QueueFull:
+            self._writer.cancel()
+        await asyncio.gather(self._writer, return_exceptions=True)
+
+    @property
+    def closed(self) -> bool:
+        return self._writer is not None and self._writer.done()
+
+
+class SessionRegistry:
+    """Open sessions by interview; other components push to them with ``send``."""
+
+    def __init__(self, queue_size: int = 64):
+        self.queue_size = queue_size
+        self._sessions: Dict[UUID, Set[Session]] = {}
+        self.connected = 0
+        self.pushed = 0
+        self.dropped = 0
+
+    def open(self, websocket: WebSocket, interview_id: UUID) -> Session:
+        """Register and start a session for an accepted WebSocket."""
+        session = Session(websocket, interview_id, self.queue_size)
+        session.start()
+        self._sessions.setdefault(interview_id, set()).add(session)
+        self.connected += 1
+        return session
+
+    async def close(self, session: Session) -> None:
+        """Flush and unregister a session."""
+        sessions = self._sessions.get(session.interview_id)
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del self._sessions[session.interview_id]
+        await session.close()
+
+    def send(self, interview_id: UUID, message: Dict[str, Any]) -> int:
+        """
+        Push a frame to every open session of an interview.
+
+        Returns:
+            Number of sessions the frame was queued for
+        """
+        delivered = 0
+        for session in list(self._sessions.get(interview_id, ())):
+            if session.send(message):
+                delivered += 1
+            else:
+                self.dropped += 1
+        self.pushed += delivered
+        return delivered
+
+    def __contains__(self, interview_id: UUID) -> bool:
+        return interview_id in self._sessions
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "open": sum(len(sessions) for sessions in self._sessions.values()),
+            "interviews": len(self._sessions),
+            "connected": self.connected,
+            "pushed": self.pushed,
+            "dropped": self.dropped,
+        }
+
+
+# Global instance
+session_registry = SessionRegistry(settings.ws_send_queue_size)
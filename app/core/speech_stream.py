@@ -0,0 +1,140 @@
+"""Incremental extraction of speakable sentences from a streamed JSON reply."""
+import re
+from typing import List
+
+# Locates the opening quote of the "speech" value in the raw stream
+_SPEECH_KEY = re.compile(r'"speech"\s*:\s*"')
+
+# A sentence is complete once its terminator is followed by whitespace
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class SpeechStreamParser:
+    """
+    Pull completed sentences out of the "speech" field of a partial JSON reply.
+
+    The model streams something like ``{"speech": "First. Second?", "meta": {...}}``
+    in arbitrary chunks. ``feed`` decodes the speech string as it arrives and
+    returns every sentence whose end has been seen, so TTS can start on the
+    first sentence while the rest of the completion is still in flight.
+    """
+
+    def __init__(self):
+        self._raw: List[str] = []
+        self._buffer = ""
+        self._state = "seek"  # seek -> speech -> done
+        self._pending = ""
+        self._emitted: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """Full raw text received so far."""
+        return "".join(self._raw)
+
+    @property
+    def speech_closed(self) -> bool:
+        """Whether the closing quote of the speech string has been seen."""
+        return self._state == "done"
+
+    @property
+    def emitted_speech(self) -> str:
+        """Speech emitted so far, joined back into a single string."""
+        return " ".join(self._emitted)
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Consume a streamed chunk.
+
+        Args:
+            chunk: Next piece of raw model output
+
+        Returns:
+            Sentences completed by this chunk (possibly empty)
+        """
+        self._raw.append(chunk)
+        if self._state == "done":
+            return []
+
+        self._buffer += chunk
+        if self._state == "seek":
+            match = _SPEECH_KEY.search(self._buffer)
+            if not match:
+                # Keep only a tail long enough to hold a split key
+                self._buffer = self._buffer[-32:]
+                return []
+            self._buffer = self._buffer[match.end():]
+            self._state = "speech"
+
+        self._decode()
+        sentences = self._split_sentences()
+        if self._state == "done":
+            sentences.extend(self.flush())
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Return whatever partial sentence remains (end of speech or stream)."""
+        remainder = self._pending.strip()
+        self._pending = ""
+        if not remainder:
+            return []
+        self._emitted.append(remainder)
+        return [remainder]
+
+    def _decode(self):
+        """Decode JSON string characters from the buffer into pending speech."""
+        buf = self._buffer
+        pos = 0
+        out = []
+        while pos < len(buf):
+            char = buf[pos]
+            if char == '"':
+                self._state = "done"
+                pos += 1
+                break
+            if char != "\\":
+                out.append(char)
+                pos += 1
+                continue
+            # Escape sequence - wait for more input if it is incomplete
+            if pos + 1 >= len(buf):
+                break
+            code = buf[pos + 1]
+            if code == "u":
+                if pos + 6 > len(buf):
+                    break
+                try:
+                    out.append(chr(int(buf[pos + 2:pos + 6], 16)))
+                except ValueError:
+                    pass
+                pos += 6
+            else:
+                out.append(_SIMPLE_ESCAPES.get(code, code))
+                pos += 2
+
+        self._pending += "".join(out)
+        self._buffer = buf[pos:]
+
+    def _split_sentences(self) -> List[str]:
+        """Emit every sentence in pending speech whose terminator is confirmed."""
+        sentences = []
+        while True:
+            match = _SENTENCE_END.search(self._pending)
+            if not match:
+                break
+            sentence = self._pending[:match.end()].strip()
+            self._pending = self._pending[match.end():]
+            if sentence:
+                sentences.append(sentence)
+        self._emitted.extend(sentences)
+        return sentences
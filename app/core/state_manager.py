@@ -1,15 +1,26 @@
 """Interview state management - external state, not LLM-managed."""
+import logging
 from datetime import datetime
-from typing import List, Dict, Literal, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Literal, Optional, Tuple, TYPE_CHECKING
 from uuid import UUID, uuid4
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+from app.config import settings
+from app.core.metrics import STORE_LATENCY
+from app.core.timing import stage
+from app.core.transcript import Message, MessageLog
 
+if TYPE_CHECKING:
+    from app.core.stores.base import StateFilter, StateStore
 
-class Message(BaseModel):
-    """Transcript message."""
-    role: Literal["user", "assistant", "system"]
-    content: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+logger = logging.getLogger(__name__)
+
+
+class TestCaseResult(BaseModel):
+    """Outcome of one test case of a submission."""
+    name: str
+    passed: bool
+    runtime_ms: Optional[float] = None
+    error: Optional[str] = None
 
 
 class CodeResult(BaseModel):
@@ -19,9 +30,10 @@ class CodeResult(BaseModel):
     code: str
     compiled: bool
     tests_passed: int = 0
-    tests_failed: int = 0
+    tests_failed: int = 0  # Includes tests not run (early stop, time limit)
     runtime_ms: Optional[float] = None
     error: Optional[str] = None
+    test_results: List[TestCaseResult] = Field(default_factory=list)
     submitted_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -40,7 +52,9 @@ class InterviewState(BaseModel):
     # Content tracking
     theory_topic: str
     coding_problem_id: Optional[str] = None
-    transcript: List[Message] = Field(default_factory=list)
+    transcript: MessageLog = Field(default_factory=MessageLog)  # Compact List[Message]
+    context_summary: str = ""  # Rolling summary of transcript entries evicted from the prompt
+    context_summarized: int = 0  # Transcript entries folded into context_summary
     
     # Flags (for judge)
     flags: Dict[str, bool] = Field(default_factory=dict)  # vague, incorrect, hand_waving, cargo_cult
@@ -59,14 +73,30 @@ class InterviewState(BaseModel):
     difficulty: str = "junior"
     interview_type: str = "ml_junior"
     
+    # Persistence bookkeeping: entries the backing store already holds
+    _persisted_messages: int = PrivateAttr(default=0)
+    _persisted_submissions: int = PrivateAttr(default=0)
+    
+    # Incremental prompt context (app.core.context_builder), rebuilt from
+    # context_summary and the unsummarized transcript after a reload
+    _context_builder: Any = PrivateAttr(default=None)
+    
     def update_timestamp(self):
         """Update the updated_at timestamp."""
         self.updated_at = datetime.utcnow()
     
     def add_message(self, role: Literal["user", "assistant"], content: str):
         """Add a message to the transcript."""
-        self.transcript.append(Message(role=role, content=content))
+        self.transcript.append_entry(role, content)
         self.update_timestamp()
+        _notify_listeners(self, "message")
+    
+    def enter_phase(self, phase: Literal["theory", "coding", "complete"]):
+        """Switch to ``phase`` and record when it started."""
+        self.current_phase = phase
+        self.phase_start_times[phase] = datetime.utcnow()
+        self.update_timestamp()
+        _notify_listeners(self, "phase")
     
     def set_flag(self, flag_name: str, value: bool = True):
         """Set a flag for the judge."""
@@ -79,20 +109,114 @@ class InterviewState(BaseModel):
             if self.theory_phase < 3:
                 self.theory_phase += 1
             else:
-                self.current_phase = "coding"
+                self.enter_phase("coding")
         self.update_timestamp()
     
     def add_code_submission(self, result: CodeResult):
         """Add a code submission result."""
         self.code_submissions.append(result)
         self.update_timestamp()
+    
+    def pending_messages(self) -> List[Message]:
+        """Transcript entries added since the last persisted save."""
+        return self.transcript[self._persisted_messages:]
+    
+    def pending_code_submissions(self) -> List[CodeResult]:
+        """Code submissions added since the last persisted save."""
+        return self.code_submissions[self._persisted_submissions:]
+    
+    def mark_persisted(self):
+        """Record that the store now holds everything appended so far."""
+        self._persisted_messages = len(self.transcript)
+        self._persisted_submissions = len(self.code_submissions)
 
 
-# In-memory state store (Phase 1 - will move to DB in Phase 4)
-_state_store: Dict[UUID, InterviewState] = {}
+# State store backend (in-memory by default, see settings.state_backend)
+_state_store: Optional["StateStore"] = None
+
+
+def get_state_store() -> "StateStore":
+    """Get the configured state store, building it on first use."""
+    global _state_store
+    if _state_store is None:
+        from app.core.stores import build_state_store
+        _state_store = build_state_store()
+    return _state_store
+
+
+def set_state_store(store: "StateStore"):
+    """Replace the state store (e.g. to inject a fakeredis-backed store)."""
+    global _state_store
+    _state_store = store
+
+
+# States kept in memory by open WebSocket sessions: interview ID -> (state, sessions)
+_pinned: Dict[UUID, Tuple["InterviewState", int]] = {}
+
+
+def pin_interview_state(state: "InterviewState") -> "InterviewState":
+    """
+    Serve ``state`` from memory until unpinned, skipping the store on reads.
+    
+    Every reader and writer in this process then works on the same object;
+    saves still go through the store.
+    
+    Returns:
+        The pinned state (an earlier pin's object if the interview was pinned)
+    """
+    pinned, sessions = _pinned.get(state.interview_id, (state, 0))
+    _pinned[state.interview_id] = (pinned, sessions + 1)
+    return pinned
+
 
+def unpin_interview_state(interview_id: UUID):
+    """Release one pin taken with ``pin_interview_state``."""
+    state, sessions = _pinned.get(interview_id, (None, 0))
+    if sessions > 1:
+        _pinned[interview_id] = (state, sessions - 1)
+    else:
+        _pinned.pop(interview_id, None)
 
-def create_interview_state(
+
+# Called synchronously with ("message" | "phase") when a state changes (app.services.session_timers)
+StateListener = Callable[["InterviewState", str], None]
+_state_listeners: List[StateListener] = []
+
+
+def register_state_listener(listener: StateListener):
+    """Call ``listener`` on every new transcript message and phase change."""
+    _state_listeners.append(listener)
+
+
+def clear_state_listeners():
+    """Remove all state listeners."""
+    _state_listeners.clear()
+
+
+def _notify_listeners(state: "InterviewState", event: str):
+    for listener in _state_listeners:
+        try:
+            listener(state, event)
+        except Exception as e:
+            logger.error(f"State listener failed for {state.interview_id}: {e}", exc_info=True)
+
+
+# Called after a state is saved with current_phase == "complete"
+CompletionHook = Callable[["InterviewState"], Awaitable[None]]
+_completion_hooks: List[CompletionHook] = []
+
+
+def register_completion_hook(hook: CompletionHook):
+    """Run ``hook`` whenever a completed interview is saved (e.g. to queue it for judging)."""
+    _completion_hooks.append(hook)
+
+
+def clear_completion_hooks():
+    """Remove all completion hooks."""
+    _completion_hooks.clear()
+
+
+async def create_interview_state(
     candidate_id: UUID,
     candidate_name: str,
     theory_topic: str,
@@ -110,18 +234,55 @@ def create_interview_state(
         coding_problem_id=coding_problem_id,
         phase_start_times={"theory": datetime.utcnow()}
     )
-    _state_store[interview_id] = state
+    with STORE_LATENCY.labels(settings.state_backend, "create").time(), stage("state_save"):
+        await get_state_store().save(state)
     return state
 
 
-def get_interview_state(interview_id: UUID) -> Optional[InterviewState]:
+async def get_interview_state(interview_id: UUID) -> Optional[InterviewState]:
     """Get interview state by ID."""
-    return _state_store.get(interview_id)
+    pinned = _pinned.get(interview_id)
+    if pinned is not None:
+        return pinned[0]
+    with STORE_LATENCY.labels(settings.state_backend, "get").time(), stage("state_get"):
+        return await get_state_store().get(interview_id)
+
+
+async def scan_interview_states(
+    state_filter: "StateFilter",
+    cursor: Optional[str] = None,
+    page_size: int = 100
+) -> AsyncIterator[Tuple[List[InterviewState], Optional[str]]]:
+    """
+    Page through stored interviews, one store round trip per page.
+    
+    Yields:
+        Matching interviews of a page and the cursor that resumes after it
+        (None after the last page)
+    
+    Raises:
+        ValueError: If the cursor is not one the store issued
+    """
+    store = get_state_store()
+    while True:
+        with STORE_LATENCY.labels(settings.state_backend, "scan").time():
+            states, cursor = await store.scan(state_filter, cursor, page_size)
+        yield states, cursor
+        if cursor is None:
+            return
 
 
-def update_interview_state(state: InterviewState) -> InterviewState:
+async def update_interview_state(state: InterviewState) -> InterviewState:
     """Update interview state in store."""
     state.update_timestamp()
-    _state_store[state.interview_id] = state
+    with STORE_LATENCY.labels(settings.state_backend, "save").time(), stage("state_save"):
+        await get_state_store().save(state)
+    
+    if state.current_phase == "complete":
+        for hook in _completion_hooks:
+            try:
+                await hook(state)
+            except Exception as e:
+                # The interview is saved; a failing hook must not fail the request
+                logger.error(f"Completion hook failed for {state.interview_id}: {e}", exc_info=True)
     return state
-
@@ -0,0 +1,6 @@
+# State store backends
+from app.core.stores.base import StateFilter, StateStore
+from app.core.stores.memory import InMemoryStateStore
+from app.core.stores.factory import build_state_store
+
+__all__ = ["StateFilter", "StateStore", "InMemoryStateStore", "build_state_store"]
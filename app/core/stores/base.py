@@ -0,0 +1,74 @@
+"""State store interface."""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from app.core.state_manager import InterviewState
+
+
+@dataclass
+class StateFilter:
+    """Which interviews a scan returns; unset fields match everything."""
+    created_from: Optional[datetime] = None  # Inclusive, naive UTC
+    created_to: Optional[datetime] = None  # Exclusive, naive UTC
+    current_phase: Optional[str] = None
+    interview_type: Optional[str] = None
+
+    def matches(self, created_at: datetime, current_phase: str, interview_type: str) -> bool:
+        return (
+            (self.created_from is None or created_at >= self.created_from)
+            and (self.created_to is None or created_at < self.created_to)
+            and (self.current_phase is None or current_phase == self.current_phase)
+            and (self.interview_type is None or interview_type == self.interview_type)
+        )
+
+
+class StateStore(ABC):
+    """
+    Backend holding InterviewState objects.
+
+    ``save`` is called after every turn; backends that persist outside the
+    process should write only what changed since the last save (see
+    ``InterviewState.pending_messages``/``pending_code_submissions``).
+    """
+
+    @abstractmethod
+    async def get(self, interview_id: UUID) -> Optional["InterviewState"]:
+        """Load a state by interview ID, or None if unknown."""
+
+    @abstractmethod
+    async def save(self, state: "InterviewState") -> None:
+        """Persist a new or updated state."""
+
+    @abstractmethod
+    async def delete(self, interview_id: UUID) -> None:
+        """Remove a state."""
+
+    async def scan(
+        self,
+        state_filter: StateFilter,
+        cursor: Optional[str] = None,
+        count: int = 100
+    ) -> Tuple[List["InterviewState"], Optional[str]]:
+        """
+        One page of stored interviews, for bulk reads such as exports.
+
+        Unlike ``get``, a scan must not change what the store keeps (no LRU
+        touch, no promotion between tiers). Interviews saved or removed while
+        a scan is in progress may or may not be returned.
+
+        Args:
+            state_filter: Interviews to return
+            cursor: Opaque cursor from the previous page (None to start)
+            count: Roughly how many interviews to examine for this page
+
+        Returns:
+            Matching interviews and the cursor for the next page (None when done)
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support scans")
+
+    async def close(self) -> None:
+        """Release backend resources."""
@@ -0,0 +1,51 @@
+"""State store construction from settings."""
+from app.config import settings
+from app.core.stores.base import StateStore
+
+
+def build_state_store(backend: str = None) -> StateStore:
+    """
+    Build the configured state store backend.
+
+    Args:
+        backend: "memory", "redis" or "sql" (defaults to ``settings.state_backend``)
+
+    Returns:
+        State store instance
+    """
+    backend = backend or settings.state_backend
+
+    if backend == "memory":
+        from app.core.stores.memory import InMemoryStateStore
+        cold_store = None
+        if settings.state_cold_backend:
+            if settings.state_cold_backend == "memory":
+                raise ValueError("The cold state tier cannot be another in-memory store")
+            cold_store = build_state_store(settings.state_cold_backend)
+        snapshots = None
+        if settings.state_snapshot_dir:
+            from app.core.stores.snapshots import StateSnapshotter
+            snapshots = StateSnapshotter(
+                settings.state_snapshot_dir,
+                interval_seconds=settings.state_snapshot_interval_seconds,
+                compact_bytes=settings.state_snapshot_compact_bytes
+            )
+        return InMemoryStateStore(
+            max_sessions=settings.state_max_sessions,
+            idle_ttl_seconds=settings.state_idle_ttl_seconds,
+            completed_ttl_seconds=settings.state_completed_ttl_seconds,
+            cold_store=cold_store,
+            snapshots=snapshots
+        )
+
+    if backend == "redis":
+        from app.core.stores.redis_store import RedisStateStore
+        return RedisStateStore.from_url(settings.redis_url)
+
+    if backend == "sql":
+        from app.core.stores.sql_store import SQLStateStore
+        if not settings.database_url:
+            raise ValueError("The sql state backend needs database_url")
+        return SQLStateStore.from_url(settings.database_url)
+
+    raise ValueError(f"Unknown state backend: {backend}")
@@ -0,0 +1,301 @@
+"""Process-local in-memory state store."""
+import asyncio
+import heapq
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from uuid import UUID
+from app.core.stores.base import StateFilter, StateStore
+
+if TYPE_CHECKING:
+    from app.core.state_manager import InterviewState
+    from app.core.stores.snapshots import StateSnapshotter
+
+logger = logging.getLogger(__name__)
+
+# Rough per-object overheads used for the memory estimate
+_STATE_OVERHEAD_BYTES = 2048
+_MESSAGE_OVERHEAD_BYTES = 400
+_SUBMISSION_OVERHEAD_BYTES = 600
+
+# How far from the LRU end to look for a completed interview to evict first
+_COMPLETED_SCAN_DEPTH = 64
+
+
+class InMemoryStateStore(StateStore):
+    """
+    Dict store with bounded capacity and TTL eviction.
+
+    Entries are kept in LRU order. A periodic ``sweep`` evicts completed
+    interviews after ``completed_ttl_seconds`` and any interview idle (by
+    ``updated_at``) for ``idle_ttl_seconds``. When ``max_sessions`` is
+    exceeded, the least recently used completed interview goes first, then
+    the least recently used one overall. Evicted states are spilled to
+    ``cold_store`` when one is configured and transparently promoted back
+    on the next ``get``; otherwise they are dropped.
+
+    With ``snapshots``, every save is also recorded on local disk, and
+    interviews written before a restart are restored by ``restore`` in the
+    background, or on demand by ``get`` if a request arrives for one first.
+    An interview is removed from the snapshot when it is deleted, or when
+    it is evicted with no cold tier to spill to (it is gone either way).
+    Interviews spilled to the cold tier stay in the snapshot.
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        idle_ttl_seconds: Optional[float] = None,
+        completed_ttl_seconds: Optional[float] = None,
+        cold_store: Optional[StateStore] = None,
+        snapshots: Optional["StateSnapshotter"] = None
+    ):
+        self._states: "OrderedDict[UUID, InterviewState]" = OrderedDict()
+        # Per interview: (bytes estimate, messages counted, submissions counted)
+        self._sizes: Dict[UUID, Tuple[int, int, int]] = {}
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.completed_ttl_seconds = completed_ttl_seconds
+        self.cold_store = cold_store
+        self.snapshots = snapshots
+
+        self.bytes_estimate = 0
+        self.evictions = 0
+        self.spills = 0
+        self.cold_hits = 0
+
+    async def get(self, interview_id: UUID) -> Optional["InterviewState"]:
+        state = self._states.get(interview_id)
+        if state is not None:
+            self._states.move_to_end(interview_id)
+            return state
+
+        if self.snapshots is not None:
+            state = await self.snapshots.take(interview_id)
+            if state is not None:
+                await self._admit(state)
+                return state
+
+        if self.cold_store is None:
+            return None
+
+        state = await self.cold_store.get(interview_id)
+        if state is not None:
+            self.cold_hits += 1
+            await self._admit(state)
+        return state
+
+    async def save(self, state: "InterviewState") -> None:
+        interview_id = state.interview_id
+        if self.snapshots is not None:
+            self.snapshots.mark(state)
+        if interview_id in self._states:
+            self._states.move_to_end(interview_id)
+            self._account(state)
+            return
+
+        await self._admit(state)
+
+    async def delete(self, interview_id: UUID) -> None:
+        if self.snapshots is not None:
+            self.snapshots.forget(interview_id)
+        self._drop(interview_id)
+        if self.cold_store is not None:
+            await self.cold_store.delete(interview_id)
+
+    async def close(self) -> None:
+        if self.snapshots is not None:
+            await self.snapshots.close()
+        if self.cold_store is not None:
+            await self.cold_store.close()
+
+    async def scan(
+        self,
+        state_filter: StateFilter,
+        cursor: Optional[str] = None,
+        count: int = 100
+    ) -> Tuple[List["InterviewState"], Optional[str]]:
+        """
+        Hot interviews in interview ID order (cursor ``h:<id>``), then the
+        cold tier's (cursor ``c:<cold cursor>``), skipping those also hot.
+        """
+        if cursor is None or cursor.startswith("h:"):
+            after = cursor[2:] if cursor else ""
+            # Smallest IDs past the cursor: O(n log count), without sorting everything
+            page = heapq.nsmallest(count, (key for key in map(str, self._states) if key > after))
+            states = []
+            for key in page:
+                state = self._states.get(UUID(key))
+                if state is not None and state_filter.matches(
+                    state.created_at, state.current_phase, state.interview_type
+                ):
+                    states.append(state)
+            if len(page) == count:
+                return states, f"h:{page[-1]}"
+            if self.cold_store is None:
+                return states, None
+            return states, "c:"
+
+        if not cursor.startswith("c:") or self.cold_store is None:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        states, cold_cursor = await self.cold_store.scan(state_filter, cursor[2:] or None, count)
+        states = [state for state in states if state.interview_id not in self._states]
+        return states, f"c:{cold_cursor}" if cold_cursor is not None else None
+
+    async def sweep(self, now: Optional[datetime] = None) -> int:
+        """
+        Evict completed and idle interviews past their TTL.
+
+        Args:
+            now: Reference time (UTC, defaults to now)
+
+        Returns:
+            Number of interviews evicted
+        """
+        now = now or datetime.utcnow()
+        idle_cutoff = now - timedelta(seconds=self.idle_ttl_seconds) if self.idle_ttl_seconds else None
+        completed_cutoff = (
+            now - timedelta(seconds=self.completed_ttl_seconds)
+            if self.completed_ttl_seconds is not None else None
+        )
+
+        expired = []
+        for interview_id, state in self._states.items():
+            if idle_cutoff is not None and state.updated_at <= idle_cutoff:
+                expired.append(interview_id)
+            elif (
+                completed_cutoff is not None
+                and state.current_phase == "complete"
+                and state.updated_at <= completed_cutoff
+            ):
+                expired.append(interview_id)
+
+        for interview_id in expired:
+            await self._evict(interview_id)
+        return len(expired)
+
+    async def restore(self, batch_size: int = 256) -> int:
+        """
+        Move every snapshotted interview into memory (run as a background task).
+
+        Requests are served meanwhile: the loop is yielded between batches,
+        and ``get`` restores an interview itself if asked for it first.
+
+        Returns:
+            Number of interviews restored by this call
+        """
+        restored = 0
+        await self.snapshots.load()
+        for interview_id in self.snapshots.pending():
+            state = await self.snapshots.take(interview_id)
+            if state is None or interview_id in self._states:
+                continue
+            await self._admit(state)
+            restored += 1
+            if restored % batch_size == 0:
+                await asyncio.sleep(0)
+        logger.info(f"Restored {restored} interviews from snapshots")
+        return restored
+
+    async def run_sweeper(self, interval_seconds: float):
+        """Sweep forever at a fixed interval (run as a background task)."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                evicted = await self.sweep()
+                if evicted:
+                    logger.info(f"Evicted {evicted} interviews from memory")
+            except Exception as e:
+                logger.error(f"State store sweep failed: {e}", exc_info=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Gauges and counters for the hot tier."""
+        return {
+            "live_count": len(self._states),
+            "bytes_estimate": self.bytes_estimate,
+            "evictions": self.evictions,
+            "spills": self.spills,
+            "cold_hits": self.cold_hits,
+        }
+
+    def phase_counts(self) -> Dict[str, int]:
+        """Live interviews per ``current_phase``."""
+        counts: Dict[str, int] = {}
+        for state in self._states.values():
+            counts[state.current_phase] = counts.get(state.current_phase, 0) + 1
+        return counts
+
+    async def _admit(self, state: "InterviewState"):
+        """Insert a state and enforce the capacity limit."""
+        self._states[state.interview_id] = state
+        self._account(state)
+
+        if self.max_sessions is None:
+            return
+        while len(self._states) > self.max_sessions:
+            await self._evict(self._pick_victim(exclude=state.interview_id))
+
+    def _pick_victim(self, exclude: UUID) -> UUID:
+        """Least recently used completed interview, else least recently used."""
+        fallback = None
+        for depth, (interview_id, state) in enumerate(self._states.items()):
+            if interview_id == exclude:
+                continue
+            if state.current_phase == "complete":
+                return interview_id
+            if fallback is None:
+                fallback = interview_id
+            if depth >= _COMPLETED_SCAN_DEPTH:
+                break
+        return fallback
+
+    async def _evict(self, interview_id: UUID):
+        """Remove a state from memory, spilling it to the cold tier if any (else dropping it for good)."""
+        state = self._states.get(interview_id)
+        if state is None:
+            return
+        if self.cold_store is not None:
+            await self.cold_store.save(state)
+            self.spills += 1
+        elif self.snapshots is not None:
+            self.snapshots.forget(interview_id)
+        self._drop(interview_id)
+        self.evictions += 1
+
+    def _drop(self, interview_id: UUID):
+        """Remove a state from memory; callers decide whether the snapshot forgets it."""
+        if self._states.pop(interview_id, None) is not None:
+            size, _, _ = self._sizes.pop(interview_id, (0, 0, 0))
+            self.bytes_estimate -= size
+
+    def _account(self, state: "InterviewState"):
+        """
+        Update the memory estimate with entries appended since the last save.
+
+        Only the new tail is measured, so a save stays O(turn), not O(transcript).
+        The persisted markers on the state are left alone: they describe what
+        the cold tier holds, not the hot one.
+        """
+        known = self._sizes.get(state.interview_id)
+        size, counted_messages, counted_submissions = known or (0, 0, 0)
+
+        added = _STATE_OVERHEAD_BYTES if known is None else 0
+        added += sum(
+            _MESSAGE_OVERHEAD_BYTES + len(msg.content)
+            for msg in state.transcript[counted_messages:]
+        )
+        added += sum(
+            _SUBMISSION_OVERHEAD_BYTES + len(result.code)
+            for result in state.code_submissions[counted_submissions:]
+        )
+
+        self._sizes[state.interview_id] = (
+            size + added,
+            len(state.transcript),
+            len(state.code_submissions),
+        )
+        self.bytes_estimate += added
+
+    def __len__(self) -> int:
+        return len(self._states)
@@ -0,0 +1,152 @@
+"""Redis-backed state store with append-only transcript writes."""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+import redis.asyncio as redis
+from app.config import settings
+from app.core.state_manager import CodeResult, InterviewState, Message
+from app.core.stores.base import StateFilter, StateStore
+
+# Fields stored as lists; everything else lives in the scalar hash
+_LIST_FIELDS = {"transcript", "code_submissions"}
+
+
+class RedisStateStore(StateStore):
+    """
+    InterviewState in Redis, laid out so a turn writes only its delta.
+
+    Keys per interview (``{prefix}:{id}``):
+    - ``{prefix}:{id}`` hash of scalar fields, each JSON-encoded
+    - ``{prefix}:{id}:transcript`` list of JSON ``Message`` entries
+    - ``{prefix}:{id}:code`` list of JSON ``CodeResult`` entries
+
+    ``save`` rewrites the small scalar hash and RPUSHes only the messages and
+    submissions added since the last save, all in one pipelined round trip.
+    """
+
+    def __init__(
+        self,
+        client: "redis.Redis",
+        prefix: str = None,
+        ttl_seconds: Optional[int] = None
+    ):
+        """
+        Args:
+            client: redis.asyncio client (a fakeredis client works for tests)
+            prefix: Key prefix
+            ttl_seconds: Expiry refreshed on every save; None keeps keys forever
+        """
+        self.client = client
+        self.prefix = prefix or settings.redis_state_prefix
+        self.ttl_seconds = ttl_seconds
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisStateStore":
+        """Create a store with a pooled client for the given Redis URL."""
+        return cls(
+            redis.Redis.from_url(url, decode_responses=True),
+            ttl_seconds=settings.redis_state_ttl_seconds
+        )
+
+    def _keys(self, interview_id: UUID):
+        base = f"{self.prefix}:{interview_id}"
+        return base, f"{base}:transcript", f"{base}:code"
+
+    async def get(self, interview_id: UUID) -> Optional[InterviewState]:
+        hash_key, transcript_key, code_key = self._keys(interview_id)
+
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(hash_key)
+        pipe.lrange(transcript_key, 0, -1)
+        pipe.lrange(code_key, 0, -1)
+        fields, transcript, code = await pipe.execute()
+
+        if not fields:
+            return None
+        return self._load(fields, transcript, code)
+
+    @staticmethod
+    def _load(fields: Dict[str, str], transcript: List[str], code: List[str]) -> InterviewState:
+        data: Dict[str, Any] = {name: json.loads(value) for name, value in fields.items()}
+        data["transcript"] = [Message.model_validate_json(entry) for entry in transcript]
+        data["code_submissions"] = [CodeResult.model_validate_json(entry) for entry in code]
+
+        state = InterviewState.model_validate(data)
+        state.mark_persisted()
+        return state
+
+    async def save(self, state: InterviewState) -> None:
+        hash_key, transcript_key, code_key = self._keys(state.interview_id)
+
+        scalars = state.model_dump(mode="json", exclude=_LIST_FIELDS)
+        new_messages = state.pending_messages()
+        new_submissions = state.pending_code_submissions()
+
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hset(hash_key, mapping={name: json.dumps(value) for name, value in scalars.items()})
+        if new_messages:
+            pipe.rpush(transcript_key, *(msg.model_dump_json() for msg in new_messages))
+        if new_submissions:
+            pipe.rpush(code_key, *(result.model_dump_json() for result in new_submissions))
+        if self.ttl_seconds:
+            for key in (hash_key, transcript_key, code_key):
+                pipe.expire(key, self.ttl_seconds)
+        await pipe.execute()
+
+        state.mark_persisted()
+
+    async def scan(
+        self,
+        state_filter: StateFilter,
+        cursor: Optional[str] = None,
+        count: int = 100
+    ) -> Tuple[List[InterviewState], Optional[str]]:
+        """
+        SCAN over interview hashes (the cursor is Redis's own).
+
+        The filter is checked against three scalar fields first, so the
+        transcripts of interviews that do not match are never fetched.
+        """
+        next_cursor, keys = await self.client.scan(int(cursor or 0), match=f"{self.prefix}:*", count=count)
+        offset = len(self.prefix) + 1
+        interview_ids = []
+        for key in keys:
+            try:
+                interview_ids.append(UUID(key[offset:]))
+            except ValueError:
+                continue  # Transcript/code lists and other keys under the prefix
+
+        matching = []
+        if interview_ids:
+            pipe = self.client.pipeline(transaction=False)
+            for interview_id in interview_ids:
+                pipe.hmget(self._keys(interview_id)[0], "created_at", "current_phase", "interview_type")
+            for interview_id, values in zip(interview_ids, await pipe.execute()):
+                if None in values:
+                    continue  # Deleted since the SCAN
+                created_at, current_phase, interview_type = map(json.loads, values)
+                if state_filter.matches(datetime.fromisoformat(created_at), current_phase, interview_type):
+                    matching.append(interview_id)
+
+        states = []
+        if matching:
+            pipe = self.client.pipeline(transaction=False)
+            for interview_id in matching:
+                hash_key, transcript_key, code_key = self._keys(interview_id)
+                pipe.hgetall(hash_key)
+                pipe.lrange(transcript_key, 0, -1)
+                pipe.lrange(code_key, 0, -1)
+            replies = await pipe.execute()
+            for index in range(0, len(replies), 3):
+                fields, transcript, code = replies[index:index + 3]
+                if fields:
+                    states.append(self._load(fields, transcript, code))
+
+        return states, str(next_cursor) if next_cursor else None
+
+    async def delete(self, interview_id: UUID) -> None:
+        await self.client.delete(*self._keys(interview_id))
+
+    async def close(self) -> None:
+        await self.client.aclose()
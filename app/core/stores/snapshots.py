@@ -0,0 +1,348 @@
+"""Binary snapshot and append log of the in-memory state store, for fast restarts."""
+import asyncio
+import logging
+import os
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+import msgpack
+from pydantic import BaseModel
+from app.core.state_manager import InterviewState
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_FILE = "states.snapshot"
+_LOG_FILE = "states.log"
+
+# Fields written as appended entries rather than with every record
+_APPENDED_FIELDS = ("transcript", "code_submissions")
+
+# States captured per event loop slice while collecting a flush
+_CAPTURE_BATCH = 256
+
+# Replayed interview: [fields, role codes, contents, timestamps, submissions]
+_Entry = List[Any]
+
+
+def _encode(value: Any) -> Any:
+    """msgpack fallback for the non-native values an InterviewState holds."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Cannot snapshot {type(value).__name__}")
+
+
+def _replay(paths: List[str]) -> Tuple[Dict[bytes, _Entry], int]:
+    """
+    Rebuild every interview from the snapshot and the log, in that order.
+
+    Records are:
+
+    - ``["put", id, fields, message_start, roles, contents, timestamps,
+      submission_start, submissions]``: replace the scalar fields and the
+      entries from the start offsets on (offsets of 0 replace everything)
+    - ``["del", id]``: forget the interview
+
+    Replaying a record twice gives the same result, so a crash between
+    writing a new snapshot and truncating the log loses nothing. A torn or
+    damaged record ends the file: everything before it is kept.
+
+    Returns:
+        Entries by interview ID bytes, and how many bytes of the last file
+        were readable
+    """
+    entries: Dict[bytes, _Entry] = {}
+    readable = 0
+    for path in paths:
+        readable = 0
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as file:
+            unpacker = msgpack.Unpacker(file, raw=False, strict_map_key=False)
+            try:
+                for record in unpacker:
+                    _apply(entries, record)
+                    readable = unpacker.tell()
+            except (ValueError, TypeError, msgpack.UnpackException) as e:
+                logger.warning(f"Damaged record in {path} at offset {readable}: {e}")
+        size = os.path.getsize(path)
+        if readable < size:
+            logger.warning(f"Ignoring the last {size - readable} bytes of {path}")
+    return entries, readable
+
+
+def _apply(entries: Dict[bytes, _Entry], record: List[Any]):
+    if record[0] == "del":
+        entries.pop(record[1], None)
+        return
+
+    _, key, fields, message_start, roles, contents, timestamps, submission_start, submissions = record
+    entry = entries.get(key)
+    if entry is None:
+        entry = [None, bytearray(), [], array("q"), []]
+    if message_start > len(entry[2]) or submission_start > len(entry[4]):
+        # The entries this record extends were never written (damaged earlier record)
+        logger.warning(f"Dropping snapshotted interview {UUID(bytes=key)} with missing entries")
+        entries.pop(key, None)
+        return
+
+    del entry[1][message_start:], entry[2][message_start:], entry[3][message_start:], entry[4][submission_start:]
+    entry[0] = fields
+    entry[1] += roles
+    entry[2] += contents
+    entry[3].frombytes(timestamps)
+    entry[4] += submissions
+    entries[key] = entry
+
+
+def _materialize(entry: _Entry) -> InterviewState:
+    fields, roles, contents, timestamps, submissions = entry
+    fields = dict(fields)
+    persisted_messages, persisted_submissions = fields.pop("_persisted")
+    state = InterviewState.model_validate({**fields, "code_submissions": submissions})
+    state.transcript.extend_raw(bytes(roles), contents, timestamps.tobytes())
+    state._persisted_messages = persisted_messages
+    state._persisted_submissions = persisted_submissions
+    return state
+
+
+class StateSnapshotter:
+    """
+    Keeps a local copy of the in-memory store's interviews on disk.
+
+    The store reports every saved interview with ``mark``, and with
+    ``forget`` every interview it deletes or evicts without a cold tier. Once per interval the interviews marked since the
+    last flush are appended to ``states.log`` as msgpack records holding
+    their scalar fields and only the transcript entries and code
+    submissions added since their previous record. Capturing a record is a
+    few shallow copies on the event loop; encoding, writing and fsync run
+    in a worker thread. When the log outgrows ``compact_bytes`` it is
+    folded into ``states.snapshot`` (written to a temporary file and
+    renamed into place), also in the thread.
+
+    On startup ``load`` reads both files in a thread into raw records.
+    Interviews are only validated into ``InterviewState`` objects when
+    ``take`` asks for them, so the store can serve requests (and restore
+    the rest in the background) as soon as the files are read.
+
+    The directory must belong to a single worker process at a time.
+    """
+
+    def __init__(self, directory: str, interval_seconds: float = 1.0, compact_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.interval_seconds = interval_seconds
+        self.compact_bytes = compact_bytes
+        self.snapshot_path = os.path.join(directory, _SNAPSHOT_FILE)
+        self.log_path = os.path.join(directory, _LOG_FILE)
+
+        # Interview ID -> state to write, or None to write a deletion
+        self._dirty: Dict[UUID, Optional[InterviewState]] = {}
+        # Interview ID -> (messages, submissions) already on disk
+        self._written: Dict[UUID, Tuple[int, int]] = {}
+        # Read from disk but not yet taken by the store
+        self._pending: Dict[bytes, _Entry] = {}
+        self._load_task: Optional[asyncio.Task] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+        self.log_bytes = 0
+        self.loaded = 0
+        self.restored = 0
+        self.flushes = 0
+        self.records_written = 0
+        self.compactions = 0
+        self.write_errors = 0
+
+    # Recording
+
+    def mark(self, state: InterviewState) -> None:
+        """Write ``state`` with the next flush."""
+        self._dirty[state.interview_id] = state
+
+    def forget(self, interview_id: UUID) -> None:
+        """Drop an interview from the snapshot with the next flush."""
+        self._dirty[interview_id] = None
+        self._written.pop(interview_id, None)
+        self._pending.pop(interview_id.bytes, None)
+
+    # Restoring
+
+    async def load(self) -> None:
+        """Read the snapshot and log from disk (once; later calls wait for the first)."""
+        if self._load_task is None:
+            self._load_task = asyncio.create_task(self._load())
+        await asyncio.shield(self._load_task)
+
+    async def _load(self):
+        try:
+            entries, self.log_bytes = await asyncio.to_thread(self._read)
+        except Exception as e:
+            logger.error(f"Could not read state snapshots from {self.directory}: {e}", exc_info=True)
+            return
+        # Least recently updated first, so restoring keeps the store's LRU order
+        for key in sorted(entries, key=lambda key: entries[key][0]["updated_at"]):
+            if UUID(bytes=key) not in self._dirty:  # Saved or deleted while loading
+                self._pending[key] = entries[key]
+        self.loaded = len(self._pending)
+        logger.info(f"Loaded {self.loaded} snapshotted interviews from {self.directory}")
+
+    def _read(self) -> Tuple[Dict[bytes, _Entry], int]:
+        """Replay both files (worker thread), cutting a torn tail off the log."""
+        os.makedirs(self.directory, exist_ok=True)
+        entries, readable = _replay([self.snapshot_path, self.log_path])
+        if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > readable:
+            # New records must not be appended after a partial one
+            os.truncate(self.log_path, readable)
+        return entries, readable
+
+    def pending(self) -> List[UUID]:
+        """Interviews read from disk that have not been taken yet."""
+        return [UUID(bytes=key) for key in self._pending]
+
+    async def take(self, interview_id: UUID) -> Optional[InterviewState]:
+        """
+        Build a snapshotted interview, at most once.
+
+        Returns:
+            The interview as last written, or None if it is not in the
+            snapshot (or was already taken)
+        """
+        await self.load()
+        entry = self._pending.pop(interview_id.bytes, None)
+        if entry is None:
+            return None
+        state = _materialize(entry)
+        self._written[interview_id] = (len(state.transcript), len(state.code_submissions))
+        self.restored += 1
+        return state
+
+    # Writing
+
+    def start(self) -> None:
+        """Start appending marked interviews every ``interval_seconds``."""
+        self._writer = asyncio.create_task(self._run(), name="state-snapshots")
+
+    async def _run(self):
+        # Appending before the files are read could race a compaction with the load
+        await self.load()
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"State snapshot failed: {e}", exc_info=True)
+
+    async def flush(self) -> int:
+        """
+        Append every interview marked since the last flush.
+
+        Returns:
+            Number of records written
+        """
+        async with self._flush_lock:
+            await self.load()
+            if not self._dirty:
+                return 0
+            dirty, self._dirty = self._dirty, {}
+
+            records = []
+            written = {}
+            for count, (interview_id, state) in enumerate(dirty.items(), 1):
+                if state is None:
+                    records.append(["del", interview_id.bytes])
+                else:
+                    records.append(self._capture(state))
+                    written[interview_id] = (len(state.transcript), len(state.code_submissions))
+                if count % _CAPTURE_BATCH == 0:
+                    await asyncio.sleep(0)
+
+            try:
+                self.log_bytes = await asyncio.to_thread(self._append, records)
+            except Exception:
+                self.write_errors += 1
+                # Rewrite from scratch next time: the log may hold part of this batch
+                for interview_id, state in dirty.items():
+                    self._written.pop(interview_id, None)
+                    self._dirty.setdefault(interview_id, state)
+                raise
+
+            for interview_id, counts in written.items():
+                if self._dirty.get(interview_id, True) is not None:  # Not forgotten meanwhile
+                    self._written[interview_id] = counts
+            self.flushes += 1
+            self.records_written += len(records)
+
+            if self.log_bytes > self.compact_bytes:
+                await asyncio.to_thread(self._compact)
+                self.log_bytes = 0
+                self.compactions += 1
+            return len(records)
+
+    def _capture(self, state: InterviewState) -> List[Any]:
+        """Record for ``state`` holding what was appended since its last record."""
+        message_start, submission_start = self._written.get(state.interview_id, (0, 0))
+        # Shallow copies: the thread encodes these while the loop keeps mutating the state
+        fields = {
+            name: dict(value) if isinstance(value, dict) else value
+            for name, value in state.__dict__.items()
+            if name not in _APPENDED_FIELDS
+        }
+        fields["_persisted"] = (state._persisted_messages, state._persisted_submissions)
+        roles, contents, timestamps = state.transcript.raw_entries(message_start)
+        return [
+            "put", state.interview_id.bytes, fields,
+            message_start, roles, contents, timestamps,
+            submission_start, state.code_submissions[submission_start:],
+        ]
+
+    def _append(self, records: List[List[Any]]) -> int:
+        """Encode and durably append records (worker thread). Returns the log size."""
+        packer = msgpack.Packer(default=_encode)
+        data = b"".join(packer.pack(record) for record in records)
+        with open(self.log_path, "ab") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+            return file.tell()
+
+    def _compact(self):
+        """Fold the log into a new snapshot (worker thread)."""
+        entries, _ = _replay([self.snapshot_path, self.log_path])
+        packer = msgpack.Packer(default=_encode)
+        temporary = f"{self.snapshot_path}.tmp"
+        with open(temporary, "wb") as file:
+            for key, (fields, roles, contents, timestamps, submissions) in entries.items():
+                file.write(packer.pack([
+                    "put", key, fields, 0, bytes(roles), contents, timestamps.tobytes(), 0, submissions
+                ]))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.snapshot_path)
+        # Replaying the old log over the new snapshot is harmless if we crash here
+        with open(self.log_path, "wb") as file:
+            os.fsync(file.fileno())
+        logger.info(f"Compacted state snapshot: {len(entries)} interviews")
+
+    async def close(self) -> None:
+        """Stop the writer and write what is still marked."""
+        if self._writer is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "dirty": len(self._dirty),
+            "pending_restore": len(self._pending),
+            "loaded": self.loaded,
+            "restored": self.restored,
+            "flushes": self.flushes,
+            "records_written": self.records_written,
+            "log_bytes": self.log_bytes,
+            "compactions": self.compactions,
+            "write_errors": self.write_errors,
+        }
@@ -0,0 +1,437 @@
+"""SQL state store (PostgreSQL or SQLite) with write-behind batching."""
+import asyncio
+import contextvars
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    Uuid,
+    delete,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from app.config import settings
+from app.core.state_manager import CodeResult, InterviewState
+from app.core.stores.base import StateFilter, StateStore
+
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+interviews = Table(
+    "interviews",
+    metadata,
+    Column("interview_id", Uuid, primary_key=True),
+    Column("candidate_id", Uuid, nullable=False),
+    Column("current_phase", String(16), nullable=False, index=True),
+    Column("interview_type", String(64), nullable=False, index=True),
+    Column("created_at", DateTime, nullable=False, index=True),
+    Column("updated_at", DateTime, nullable=False),
+    # Remaining scalar fields (flags, phase_start_times, ...) as one JSON document
+    Column("data", JSON, nullable=False),
+)
+
+interview_messages = Table(
+    "interview_messages",
+    metadata,
+    Column("interview_id", Uuid, ForeignKey("interviews.interview_id", ondelete="CASCADE"), primary_key=True),
+    Column("seq", Integer, primary_key=True),
+    Column("role", String(16), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("timestamp", DateTime, nullable=False),
+)
+
+code_submissions = Table(
+    "code_submissions",
+    metadata,
+    Column("interview_id", Uuid, ForeignKey("interviews.interview_id", ondelete="CASCADE"), primary_key=True),
+    Column("seq", Integer, primary_key=True),
+    Column("submission_id", Uuid, nullable=False),
+    Column("language", String(32), nullable=False),
+    Column("code", Text, nullable=False),
+    Column("compiled", Boolean, nullable=False),
+    Column("tests_passed", Integer, nullable=False),
+    Column("tests_failed", Integer, nullable=False),
+    Column("runtime_ms", Float),
+    Column("error", Text),
+    Column("test_results", JSON, nullable=False),
+    Column("submitted_at", DateTime, nullable=False),
+)
+
+Index("ix_code_submissions_submission_id", code_submissions.c.submission_id)
+
+# Columns of the interviews table; everything else goes into ``data``
+_INTERVIEW_COLUMNS = {"interview_id", "candidate_id", "current_phase", "interview_type", "created_at", "updated_at"}
+_LIST_FIELDS = {"transcript", "code_submissions"}
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class _Pending:
+    """Writes for one interview not yet flushed: the latest row plus appended entries."""
+    __slots__ = ("row", "messages", "submissions")
+
+    def __init__(self):
+        self.row: Optional[Dict[str, Any]] = None
+        self.messages: List[Dict[str, Any]] = []
+        self.submissions: List[Dict[str, Any]] = []
+
+
+class SQLStateStore(StateStore):
+    """
+    InterviewState in SQL tables via async SQLAlchemy.
+
+    Tables: ``interviews`` (indexed columns for filtering plus the remaining
+    scalar fields as JSON), ``interview_messages`` and ``code_submissions``
+    (one row per entry, keyed by interview and position).
+
+    ``save`` does not touch the database. It records the interview's new
+    row and the entries appended since the last save, and returns. A single
+    flusher task writes everything pending every ``flush_interval_seconds``
+    in one transaction: one batched upsert for interviews and one batched
+    insert per entry table, however many saves and turns it covers. A
+    failed flush is retried with the next one; entry inserts ignore rows
+    that already exist, so a retry never duplicates them.
+
+    Recently saved states are kept in an LRU cache of ``cache_size`` and
+    returned without touching the database. That is only correct while each
+    interview is served by one worker (a single worker, or sticky routing):
+    a cached state would hide another worker's writes. With several workers
+    per interview, set ``revalidate=True`` so a cached state without
+    pending writes is returned only if the row's ``updated_at`` still
+    matches, at the cost of one primary key lookup per read.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        flush_interval_seconds: float = 0.05,
+        flush_max_interviews: int = 500,
+        create_tables: bool = True,
+        cache_size: int = 1000,
+        revalidate: bool = False
+    ):
+        """
+        Args:
+            engine: Async engine (postgresql+asyncpg or sqlite+aiosqlite)
+            flush_interval_seconds: How long writes may wait to be batched
+            flush_max_interviews: Flush early once this many interviews are pending
+            create_tables: Create missing tables on first use
+            cache_size: States kept in memory for reads (0 disables the cache)
+            revalidate: Check cached states against the database before use
+        """
+        if engine.dialect.name not in _INSERTS:
+            raise ValueError(f"Unsupported SQL dialect for the state store: {engine.dialect.name}")
+        self.engine = engine
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flush_max_interviews = flush_max_interviews
+        self.create_tables = create_tables
+        self.cache_size = cache_size
+        self.revalidate = revalidate
+        self._insert = _INSERTS[engine.dialect.name]
+
+        self._pending: Dict[UUID, _Pending] = {}
+        self._flushing: Dict[UUID, _Pending] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._schema_ready = not create_tables
+        self._cache: "OrderedDict[UUID, InterviewState]" = OrderedDict()
+
+        self.cache_hits = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.rows_written = 0
+
+    @classmethod
+    def from_url(cls, url: str) -> "SQLStateStore":
+        """Create a store with a pooled engine for the given database URL."""
+        options: Dict[str, Any] = {}
+        if not url.startswith("sqlite"):
+            options.update(
+                pool_size=settings.database_pool_size,
+                max_overflow=settings.database_max_overflow,
+                pool_timeout=settings.database_pool_timeout_seconds,
+                pool_recycle=settings.database_pool_recycle_seconds,
+                pool_pre_ping=True
+            )
+        return cls(
+            create_async_engine(url, **options),
+            flush_interval_seconds=settings.sql_flush_interval_seconds,
+            flush_max_interviews=settings.sql_flush_max_interviews,
+            create_tables=settings.sql_create_tables,
+            cache_size=settings.sql_state_cache_size,
+            revalidate=settings.sql_state_cache_revalidate
+        )
+
+    async def get(self, interview_id: UUID) -> Optional[InterviewState]:
+        pending = interview_id in self._pending or interview_id in self._flushing
+        cached = self._cache.get(interview_id)
+        if cached is not None:
+            if pending or not self.revalidate or await self._updated_at(interview_id) == cached.updated_at:
+                self._cache.move_to_end(interview_id)
+                self.cache_hits += 1
+                return cached
+            del self._cache[interview_id]
+        elif pending:
+            await self.flush()
+
+        await self._ensure_schema()
+        states = await self._load([interview_id])
+        if not states:
+            return None
+        self._remember(states[0])
+        return states[0]
+
+    async def save(self, state: InterviewState) -> None:
+        pending = self._pending.get(state.interview_id)
+        if pending is None:
+            pending = self._pending[state.interview_id] = _Pending()
+
+        pending.row = _interview_row(state)
+        new_messages = state.pending_messages()
+        first = len(state.transcript) - len(new_messages)
+        pending.messages.extend(
+            {
+                "interview_id": state.interview_id,
+                "seq": first + offset,
+                "role": message.role,
+                "content": message.content,
+                "timestamp": message.timestamp,
+            }
+            for offset, message in enumerate(new_messages)
+        )
+        new_submissions = state.pending_code_submissions()
+        first = len(state.code_submissions) - len(new_submissions)
+        pending.submissions.extend(
+            _submission_row(state.interview_id, first + offset, result)
+            for offset, result in enumerate(new_submissions)
+        )
+        # The buffer now owns these entries
+        state.mark_persisted()
+        self._remember(state)
+
+        if self._flusher is None:
+            # Fresh context: the flusher must not inherit a request's deadline or timer
+            self._flusher = asyncio.create_task(self._run_flusher(), name="sql-flusher", context=contextvars.Context())
+        if len(self._pending) >= self.flush_max_interviews:
+            self._wakeup.set()
+
+    async def delete(self, interview_id: UUID) -> None:
+        self._cache.pop(interview_id, None)
+        self._pending.pop(interview_id, None)
+        await self.flush()
+        await self._ensure_schema()
+        async with self.engine.begin() as conn:
+            await conn.execute(delete(interview_messages).where(interview_messages.c.interview_id == interview_id))
+            await conn.execute(delete(code_submissions).where(code_submissions.c.interview_id == interview_id))
+            await conn.execute(delete(interviews).where(interviews.c.interview_id == interview_id))
+
+    async def scan(
+        self,
+        state_filter: StateFilter,
+        cursor: Optional[str] = None,
+        count: int = 100
+    ) -> Tuple[List[InterviewState], Optional[str]]:
+        """Interviews in ID order (the cursor is the last ID), filtered in SQL."""
+        try:
+            after = UUID(cursor) if cursor else None
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        await self.flush()
+        await self._ensure_schema()
+
+        query = select(interviews.c.interview_id).order_by(interviews.c.interview_id).limit(count)
+        if after is not None:
+            query = query.where(interviews.c.interview_id > after)
+        if state_filter.created_from is not None:
+            query = query.where(interviews.c.created_at >= state_filter.created_from)
+        if state_filter.created_to is not None:
+            query = query.where(interviews.c.created_at < state_filter.created_to)
+        if state_filter.current_phase is not None:
+            query = query.where(interviews.c.current_phase == state_filter.current_phase)
+        if state_filter.interview_type is not None:
+            query = query.where(interviews.c.interview_type == state_filter.interview_type)
+
+        async with self.engine.connect() as conn:
+            interview_ids = list((await conn.execute(query)).scalars())
+        states = await self._load(interview_ids)
+        return states, str(interview_ids[-1]) if len(interview_ids) == count else None
+
+    async def flush(self) -> None:
+        """Write everything pending now (also waits for a flush in progress)."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            self._flushing = batch
+            try:
+                await self._ensure_schema()
+                await self._write(batch)
+                self.flushes += 1
+            except Exception:
+                self.flush_errors += 1
+                # Keep the writes, older entries first, for the next flush
+                for interview_id, newer in self._pending.items():
+                    older = batch.setdefault(interview_id, _Pending())
+                    older.row = newer.row
+                    older.messages.extend(newer.messages)
+                    older.submissions.extend(newer.submissions)
+                self._pending = batch
+                raise
+            finally:
+                self._flushing = {}
+
+    async def _run_flusher(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"SQL state flush failed, retrying: {e}", exc_info=True)
+                await asyncio.sleep(min(1.0, self.flush_interval_seconds * 10))
+
+    async def _write(self, batch: Dict[UUID, _Pending]):
+        rows = [pending.row for pending in batch.values()]
+        messages = [row for pending in batch.values() for row in pending.messages]
+        submissions = [row for pending in batch.values() for row in pending.submissions]
+
+        upsert = self._insert(interviews)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[interviews.c.interview_id],
+            set_={
+                name: upsert.excluded[name]
+                for name in ("current_phase", "interview_type", "updated_at", "data")
+            }
+        )
+        async with self.engine.begin() as conn:
+            await conn.execute(upsert, rows)
+            if messages:
+                await conn.execute(self._insert(interview_messages).on_conflict_do_nothing(), messages)
+            if submissions:
+                await conn.execute(self._insert(code_submissions).on_conflict_do_nothing(), submissions)
+        self.rows_written += len(rows) + len(messages) + len(submissions)
+
+    def _remember(self, state: InterviewState):
+        if not self.cache_size:
+            return
+        self._cache[state.interview_id] = state
+        self._cache.move_to_end(state.interview_id)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _updated_at(self, interview_id: UUID):
+        await self._ensure_schema()
+        async with self.engine.connect() as conn:
+            return (await conn.execute(
+                select(interviews.c.updated_at).where(interviews.c.interview_id == interview_id)
+            )).scalar()
+
+    async def _load(self, interview_ids: List[UUID]) -> List[InterviewState]:
+        """Full states for the given IDs (three queries however many), in the given order."""
+        if not interview_ids:
+            return []
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(
+                select(interviews).where(interviews.c.interview_id.in_(interview_ids))
+            )).mappings().all()
+            messages = (await conn.execute(
+                select(interview_messages)
+                .where(interview_messages.c.interview_id.in_(interview_ids))
+                .order_by(interview_messages.c.interview_id, interview_messages.c.seq)
+            )).mappings().all()
+            submissions = (await conn.execute(
+                select(code_submissions)
+                .where(code_submissions.c.interview_id.in_(interview_ids))
+                .order_by(code_submissions.c.interview_id, code_submissions.c.seq)
+            )).mappings().all()
+
+        data: Dict[UUID, Dict[str, Any]] = {}
+        for row in rows:
+            data[row["interview_id"]] = {
+                **row["data"],
+                **{name: row[name] for name in _INTERVIEW_COLUMNS},
+                "transcript": [],
+                "code_submissions": [],
+            }
+        for message in messages:
+            data[message["interview_id"]]["transcript"].append(
+                {"role": message["role"], "content": message["content"], "timestamp": message["timestamp"]}
+            )
+        for submission in submissions:
+            fields = {name: submission[name] for name in CodeResult.model_fields}
+            data[submission["interview_id"]]["code_submissions"].append(fields)
+
+        states = []
+        for interview_id in interview_ids:
+            if interview_id in data:
+                state = InterviewState.model_validate(data[interview_id])
+                state.mark_persisted()
+                states.append(state)
+        return states
+
+    async def _ensure_schema(self):
+        if self._schema_ready:
+            return
+        async with self.engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+        self._schema_ready = True
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        try:
+            await self.flush()
+        finally:
+            await self.engine.dispose()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "cached": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "rows_written": self.rows_written,
+        }
+
+
+def _interview_row(state: InterviewState) -> Dict[str, Any]:
+    return {
+        "interview_id": state.interview_id,
+        "candidate_id": state.candidate_id,
+        "current_phase": state.current_phase,
+        "interview_type": state.interview_type,
+        "created_at": state.created_at,
+        "updated_at": state.updated_at,
+        "data": state.model_dump(mode="json", exclude=_LIST_FIELDS | _INTERVIEW_COLUMNS),
+    }
+
+
+def _submission_row(interview_id: UUID, seq: int, result: CodeResult) -> Dict[str, Any]:
+    row = result.model_dump(exclude={"test_results"})
+    row.update(
+        interview_id=interview_id,
+        seq=seq,
+        test_results=[test.model_dump(mode="json") for test in result.test_results]
+    )
+    return row
@@ -0,0 +1,177 @@
+"""Structured JSON output: response schemas and tolerant parsing."""
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Type
+from pydantic import BaseModel
+
+# Keys the Gemini response-schema subset of OpenAPI understands
+_SCHEMA_KEYS = {"type", "format", "description", "nullable", "enum", "items", "properties", "required"}
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+class JSONRepairError(ValueError):
+    """Model output could not be parsed even after local repair."""
+
+
+@lru_cache(maxsize=None)
+def response_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Gemini response schema for the required fields of a Pydantic model.
+
+    Optional fields (e.g. debug data filled in server-side) are left out so
+    the model is never asked to produce them.
+
+    Args:
+        model: Pydantic model describing the expected reply
+
+    Returns:
+        Schema dict accepted as ``GenerationConfig.response_schema``
+    """
+    full = model.model_json_schema()
+    return _convert(full, full.get("$defs", {}))
+
+
+def _convert(node: Dict[str, Any], defs: Dict[str, Any]) -> Dict[str, Any]:
+    if "$ref" in node:
+        node = defs[node["$ref"].split("/")[-1]]
+
+    schema = {key: value for key, value in node.items() if key in _SCHEMA_KEYS}
+    if "properties" in node:
+        required = node.get("required", [])
+        schema["properties"] = {
+            name: _convert(prop, defs)
+            for name, prop in node["properties"].items()
+            if name in required
+        }
+        schema["required"] = list(required)
+    if "items" in node:
+        schema["items"] = _convert(node["items"], defs)
+    return schema
+
+
+def parse_json_lenient(text: str) -> Tuple[Dict[str, Any], bool]:
+    """
+    Parse a JSON object from model output, repairing it locally if needed.
+
+    Handles markdown fences, prose around the object, trailing commas,
+    Python literals and output truncated mid-string or mid-object.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        (parsed object, whether a repair was needed)
+
+    Raises:
+        JSONRepairError: If no JSON object can be recovered
+    """
+    cleaned = _FENCE.sub("", text.strip())
+    try:
+        value = json.loads(cleaned)
+        if isinstance(value, dict):
+            return value, False
+    except json.JSONDecodeError:
+        pass
+
+    start = cleaned.find("{")
+    if start < 0:
+        raise JSONRepairError(f"No JSON object in response: {cleaned[:200]!r}")
+
+    # Complete object followed by extra text
+    try:
+        value, _ = json.JSONDecoder().raw_decode(cleaned[start:])
+        if isinstance(value, dict):
+            return value, True
+    except json.JSONDecodeError:
+        pass
+
+    repaired = _close_truncated(_normalize_literals(cleaned[start:]))
+    repaired = _TRAILING_COMMA.sub(r"\1", repaired)
+    try:
+        value, _ = json.JSONDecoder().raw_decode(repaired)
+    except json.JSONDecodeError as e:
+        raise JSONRepairError(f"Unrepairable JSON response: {e}") from e
+    if not isinstance(value, dict):
+        raise JSONRepairError("Response is not a JSON object")
+    return value, True
+
+
+def _normalize_literals(text: str) -> str:
+    """Replace Python True/False/None outside strings."""
+    out: List[str] = []
+    in_string = False
+    escaped = False
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            index += 1
+            continue
+        if char == '"':
+            in_string = True
+            out.append(char)
+            index += 1
+            continue
+        for literal, replacement in _PY_LITERALS.items():
+            if text.startswith(literal, index):
+                out.append(replacement)
+                index += len(literal)
+                break
+        else:
+            out.append(char)
+            index += 1
+    return "".join(out)
+
+
+def _close_truncated(text: str) -> str:
+    """Close an unterminated string and any open objects/arrays."""
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+            if not stack:
+                break
+
+    if not stack and not in_string:
+        return text
+
+    repaired = text
+    if in_string:
+        if escaped:
+            repaired = repaired[:-1]
+        repaired += '"'
+
+    # Drop a dangling key, partial literal or separator the truncation left behind
+    partial = re.search(r',?\s*"[^"]*"\s*:\s*([a-z]+)$', repaired)
+    if not in_string and partial and partial.group(1) not in ("true", "false", "null"):
+        repaired = repaired[:partial.start()]
+    repaired = re.sub(r',\s*"[^"]*"\s*:?\s*$', "", repaired)
+    repaired = re.sub(r'[,:]\s*$', "", repaired)
+    repaired = re.sub(r'\{\s*"[^"]*"\s*$', "{", repaired)
+
+    return repaired + "".join(reversed(stack))
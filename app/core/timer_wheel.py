@@ -0,0 +1,134 @@
+"""Hierarchical timer wheel: O(1) schedule, reschedule and cancel for many timers."""
+import math
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class _Timer:
+    __slots__ = ("key", "tick", "payload", "slot")
+
+    def __init__(self, key: Hashable, tick: int, payload: Any):
+        self.key = key
+        self.tick = tick
+        self.payload = payload
+        self.slot: Optional[Dict[Hashable, "_Timer"]] = None
+
+
+class TimerWheel:
+    """
+    Timers keyed by an arbitrary hashable, bucketed by expiry tick.
+
+    Level 0 has one slot per tick; each level above covers ``slots`` times
+    the span of the one below (with the defaults: 32s, 34min, 36h, 97 days
+    at a 0.5s tick). A timer sits in the lowest level whose span reaches its
+    deadline and moves down a level each time its slot comes round, so
+    every timer is touched at most ``levels`` times however many are live.
+    Deadlines past the top level's span are parked there and re-placed.
+
+    Slots are dicts keyed by timer key, so scheduling, rescheduling and
+    cancelling are O(1). The wheel has no clock of its own: ``advance`` is
+    given the current time and returns what expired.
+    """
+
+    def __init__(self, tick_seconds: float = 0.5, slots: int = 64, levels: int = 4, now: float = 0.0):
+        self.tick_seconds = tick_seconds
+        self.slots = slots
+        self.levels = levels
+        self._wheels: List[List[Dict[Hashable, _Timer]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._timers: Dict[Hashable, _Timer] = {}
+        self._current = self._tick(now)
+        self.expired = 0
+        self.cascaded = 0
+
+    def _tick(self, when: float) -> int:
+        return math.floor(when / self.tick_seconds)
+
+    def schedule(self, key: Hashable, when: float, payload: Any = None) -> None:
+        """Set (or move) the timer for ``key`` to fire at time ``when``."""
+        timer = self._timers.get(key)
+        if timer is None:
+            timer = self._timers[key] = _Timer(key, 0, payload)
+        else:
+            del timer.slot[key]
+            timer.payload = payload
+        # Round up: a timer never fires before its deadline
+        timer.tick = max(math.ceil(when / self.tick_seconds), self._current + 1)
+        self._place(timer)
+
+    def cancel(self, key: Hashable) -> bool:
+        """Remove the timer for ``key``; returns whether there was one."""
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        del timer.slot[key]
+        return True
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """Deadline (rounded to the tick) and payload of a pending timer."""
+        timer = self._timers.get(key)
+        if timer is None:
+            return None
+        return timer.tick * self.tick_seconds, timer.payload
+
+    def advance(self, now: float) -> List[Tuple[Hashable, Any]]:
+        """
+        Move the wheel to ``now``.
+
+        Returns:
+            ``(key, payload)`` of every timer that expired, in deadline order
+        """
+        expired: List[Tuple[Hashable, Any]] = []
+        target = self._tick(now)
+        while self._current < target:
+            self._current += 1
+            self._cascade()
+            slot = self._wheels[0][self._current % self.slots]
+            if not slot:
+                continue
+            for key, timer in list(slot.items()):
+                del slot[key]
+                del self._timers[key]
+                expired.append((key, timer.payload))
+        self.expired += len(expired)
+        return expired
+
+    def _cascade(self):
+        """Move timers down from every upper-level slot that starts at this tick."""
+        span = 1
+        for level in range(1, self.levels):
+            span *= self.slots
+            if self._current % span:
+                break
+            slot = self._wheels[level][(self._current // span) % self.slots]
+            if not slot:
+                continue
+            timers = list(slot.values())
+            slot.clear()
+            for timer in timers:
+                self._place(timer)
+            self.cascaded += len(timers)
+
+    def _place(self, timer: _Timer):
+        delta = timer.tick - self._current
+        span = 1
+        for level in range(self.levels):
+            if delta < span * self.slots or level == self.levels - 1:
+                if delta >= span * self.slots:
+                    # Beyond the wheel: park in the farthest top-level slot, re-placed when reached
+                    index = (self._current // span - 1) % self.slots
+                else:
+                    index = (timer.tick // span) % self.slots
+                timer.slot = self._wheels[level][index]
+                timer.slot[timer.key] = timer
+                return
+            span *= self.slots
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": len(self._timers), "expired": self.expired, "cascaded": self.cascaded}
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
@@ -0,0 +1,157 @@
+"""Request-scoped stage timing, reported as a Server-Timing header."""
+import asyncio
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Set, Tuple
+from app.config import settings
+from app.core.profiling import SamplingProfiler
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["RequestTimer"]] = ContextVar("request_timer", default=None)
+
+
+class RequestTimer:
+    """Accumulated wall time per named stage of one request."""
+
+    def __init__(self, debug: bool = False):
+        self.started = time.perf_counter()
+        self.debug = debug
+        # stage -> (seconds, count), in first-seen order
+        self.stages: Dict[str, Tuple[float, int]] = {}
+        # Tasks doing this request's work (e.g. a coalesced turn), for the profiler
+        self.tasks: Set[asyncio.Task] = set()
+
+    def record(self, name: str, seconds: float):
+        total, count = self.stages.get(name, (0.0, 0))
+        self.stages[name] = (total + seconds, count + 1)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Stage timings in milliseconds, for the debug field."""
+        timings = {
+            name: {"ms": round(seconds * 1000, 3), "count": count}
+            for name, (seconds, count) in self.stages.items()
+        }
+        timings["total"] = {"ms": round(self.elapsed * 1000, 3), "count": 1}
+        return timings
+
+    def header(self) -> str:
+        """Server-Timing header value."""
+        parts = [
+            f"{name};dur={seconds * 1000:.1f}" + (f';desc="{count}x"' if count > 1 else "")
+            for name, (seconds, count) in self.stages.items()
+        ]
+        parts.append(f"total;dur={self.elapsed * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    """Timer of the request being handled, if any."""
+    return _current.get()
+
+
+def record(name: str, seconds: float):
+    """Add a measured duration to the current request's stage (no-op outside a request)."""
+    timer = _current.get()
+    if timer is not None:
+        timer.record(name, seconds)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as a stage of the current request."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.record(name, time.perf_counter() - start)
+
+
+def attach_current_task():
+    """Let the profiler follow work that runs in its own task (coalesced turns, SSE)."""
+    timer = _current.get()
+    task = asyncio.current_task()
+    if timer is not None and task is not None:
+        timer.tasks.add(task)
+
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware: per-request timer, Server-Timing header, profiler.
+
+    Stages recorded before the response starts are in the header; for
+    streamed responses that is everything up to the first byte. The
+    sampling profiler runs for a ``profile_sample_rate`` share of requests,
+    or when ``X-Profile: 1`` is sent and ``profile_allow_header`` is set, and
+    keeps stacks only for requests slower than ``profile_slow_ms``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        timer = RequestTimer(
+            debug=settings.timing_debug_field and headers.get(b"x-debug-timing") == b"1"
+        )
+        token = _current.set(timer)
+
+        profiler = None
+        if self._should_profile(headers):
+            profiler = SamplingProfiler(
+                asyncio.current_task(),
+                timer.tasks,
+                interval=settings.profile_interval_ms / 1000
+            )
+            profiler.start()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and settings.server_timing_enabled:
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timer.header().encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if profiler is not None:
+                profiler.stop()
+                if timer.elapsed * 1000 >= settings.profile_slow_ms:
+                    await self._dump(profiler, scope, timer)
+
+    @staticmethod
+    def _should_profile(headers: Dict[bytes, bytes]) -> bool:
+        if settings.profile_allow_header and headers.get(b"x-profile") == b"1":
+            return True
+        return settings.profile_sample_rate > 0 and random.random() < settings.profile_sample_rate
+
+    @staticmethod
+    async def _dump(profiler: SamplingProfiler, scope, timer: RequestTimer):
+        label = scope["path"].strip("/").replace("/", "_") or "root"
+        try:
+            path = await asyncio.to_thread(
+                profiler.dump,
+                settings.profile_output_dir,
+                f"{time.strftime('%Y%m%dT%H%M%S')}-{label}-{int(timer.elapsed * 1000)}ms"
+            )
+            logger.info(f"Slow request {scope['path']} ({timer.elapsed * 1000:.0f} ms) profiled to {path}")
+        except OSError as e:
+            logger.warning(f"Could not write profile: {e}")
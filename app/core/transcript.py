@@ -0,0 +1,187 @@
+"""Transcript message model and its compact in-memory log."""
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Iterator, List, Literal, Optional, Tuple, Union, overload
+from pydantic import BaseModel, Field, GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+
+class Message(BaseModel):
+    """Transcript message."""
+    role: Literal["user", "assistant", "system"]
+    content: str
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+
+# Roles are stored as one byte each
+_ROLES = ("user", "assistant", "system")
+_ROLE_CODES = {role: code for code, role in enumerate(_ROLES)}
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_epoch_us(value: datetime) -> int:
+    """Naive-UTC (or aware) datetime to integer epoch microseconds (exact)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_epoch_us(value: int) -> datetime:
+    """Epoch microseconds to the naive-UTC datetime the rest of the app uses."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class MessageLog:
+    """
+    Array-backed transcript that behaves like ``List[Message]``.
+
+    Each entry costs a role byte, an 8-byte integer timestamp and a reference
+    to its content string, instead of a full Pydantic model with its own
+    ``datetime`` and ``__dict__``. ``Message`` objects are only built when
+    an entry is read (indexing, slicing, iteration), i.e. at the API or
+    persistence boundary. Appending is the only supported mutation, which
+    matches how the transcript is used.
+    """
+
+    __slots__ = ("_roles", "_contents", "_timestamps")
+
+    def __init__(self, messages: Optional[Iterable[Union[Message, dict]]] = None):
+        self._roles = bytearray()
+        self._contents: List[str] = []
+        self._timestamps = array("q")  # Epoch microseconds
+        if messages:
+            self.extend(messages)
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[Union[Message, dict]]) -> "MessageLog":
+        """Build a log from validated messages (or plain dicts)."""
+        return cls(messages)
+
+    def append_entry(self, role: str, content: str, timestamp_us: Optional[int] = None):
+        """
+        Append without building a Message.
+
+        Args:
+            role: "user", "assistant" or "system"
+            content: Message text
+            timestamp_us: Epoch microseconds (defaults to now)
+        """
+        self._roles.append(_ROLE_CODES[role])
+        self._contents.append(content)
+        self._timestamps.append(timestamp_us if timestamp_us is not None else time.time_ns() // 1000)
+
+    def append(self, message: Union[Message, dict]):
+        """Append a Message (or a dict with the same fields)."""
+        if isinstance(message, dict):
+            message = Message.model_validate(message)
+        self.append_entry(message.role, message.content, _to_epoch_us(message.timestamp))
+
+    def extend(self, messages: Iterable[Union[Message, dict]]):
+        for message in messages:
+            self.append(message)
+
+    def raw_entries(self, start: int = 0) -> Tuple[bytes, List[str], bytes]:
+        """
+        Entries from ``start`` on in storage form, for binary persistence.
+
+        Returns:
+            Role codes, contents, and native int64 epoch-microsecond timestamps
+        """
+        return bytes(self._roles[start:]), self._contents[start:], self._timestamps[start:].tobytes()
+
+    def extend_raw(self, roles: bytes, contents: List[str], timestamps: bytes):
+        """Append entries in the form returned by ``raw_entries``."""
+        if not len(roles) == len(contents) == len(timestamps) // self._timestamps.itemsize:
+            raise ValueError("Raw transcript entries have mismatched lengths")
+        self._roles += roles
+        self._contents += contents
+        self._timestamps.frombytes(timestamps)
+
+    def role_at(self, index: int) -> str:
+        """Role of an entry without materializing it."""
+        return _ROLES[self._roles[index]]
+
+    def content_at(self, index: int) -> str:
+        """Content of an entry without materializing it."""
+        return self._contents[index]
+
+    def timestamp_at(self, index: int) -> float:
+        """Epoch seconds of an entry without materializing it."""
+        return self._timestamps[index] / 1_000_000
+
+    def _materialize(self, index: int) -> Message:
+        return Message.model_construct(
+            role=_ROLES[self._roles[index]],
+            content=self._contents[index],
+            timestamp=_from_epoch_us(self._timestamps[index])
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> Message: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Message]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self._contents)))]
+        if index < 0:
+            index += len(self._contents)
+        if not 0 <= index < len(self._contents):
+            raise IndexError("transcript index out of range")
+        return self._materialize(index)
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    def __iter__(self) -> Iterator[Message]:
+        for index in range(len(self._contents)):
+            yield self._materialize(index)
+
+    def __bool__(self) -> bool:
+        return bool(self._contents)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, MessageLog):
+            return (
+                self._roles == other._roles
+                and self._contents == other._contents
+                and self._timestamps == other._timestamps
+            )
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"MessageLog(len={len(self)})"
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + self._roles.__sizeof__()
+            + self._contents.__sizeof__()
+            + self._timestamps.__sizeof__()
+        )
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        """Validate from a list of messages; serialize back to one."""
+        list_schema = handler.generate_schema(List[Message])
+        from_list = core_schema.no_info_after_validator_function(cls.from_messages, list_schema)
+        return core_schema.json_or_python_schema(
+            json_schema=from_list,
+            python_schema=core_schema.union_schema([
+                core_schema.is_instance_schema(cls),
+                from_list,
+            ]),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                list,
+                return_schema=list_schema
+            )
+        )
@@ -1,10 +1,30 @@
 """FastAPI application entry point."""
+import asyncio
 import logging
-from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest, start_http_server
 from app.config import settings
-from app.api.v1 import interviews, health
+from app.api.v1 import exports, interviews, health
+from app.core.locks import submit_coalescer
+from app.core.sessions import session_registry
+from app.core.metrics import MetricsMiddleware, stats_collector
+from app.core.timing import TimingMiddleware
+from app.core.state_manager import (
+    clear_completion_hooks,
+    clear_state_listeners,
+    get_state_store,
+    register_completion_hook,
+    register_state_listener
+)
+from app.services.code_executor import build_code_executor, set_code_executor
+from app.services.gemini_service import gemini_service
+from app.services.judge_queue import build_judge_queue, set_judge_queue
+from app.services.session_timers import SessionTimers
+from app.services.submissions import build_submission_queue, set_submission_queue
+from app.agents.interviewer_agent import interviewer_agent
+from app.agents.judge_agent import judge_agent
 
 # Configure logging
 logging.basicConfig(
@@ -21,11 +41,168 @@ async def lifespan(app: FastAPI):
     logger.info("Starting AI Interview Platform...")
     logger.info(f"API Version: {settings.api_version}")
     logger.info(f"Gemini Models: {settings.gemini_model_interviewer} / {settings.gemini_model_judge}")
+    logger.info(f"State backend: {settings.state_backend}")
+    store = get_state_store()
+    
+    # Judge completed interviews in the background
+    judge_queue = None
+    if settings.judge_enabled:
+        judge_queue = build_judge_queue()
+        judge_queue.start()
+        set_judge_queue(judge_queue)
+        register_completion_hook(lambda state: judge_queue.submit(judge_agent.build_input(state)))
+        logger.info(f"Judge backend: {settings.judge_backend}")
+    
+    # Pre-warm the code execution sandboxes
+    code_executor = None
+    if settings.sandbox_enabled:
+        code_executor = await _start_code_executor()
+        set_code_executor(code_executor)
+    
+    # Run code submissions off the request path (code endpoints return 503 without it)
+    submission_queue = None
+    if settings.sandbox_enabled and (code_executor is not None or settings.submission_backend != "asyncio"):
+        submission_queue = build_submission_queue(code_executor)
+        submission_queue.start()
+        set_submission_queue(submission_queue)
+        logger.info(f"Submission backend: {settings.submission_backend}")
+    
+    # Silence nudges and phase time limits
+    session_timers = None
+    if settings.timers_enabled:
+        session_timers = SessionTimers(settings.timer_tick_seconds)
+        register_state_listener(session_timers.on_state_change)
+        session_timers.start()
+    
+    if settings.metrics_enabled:
+        _register_stats(store, judge_queue, code_executor, submission_queue, session_timers)
+        if settings.metrics_separate_port:
+            start_http_server(settings.prometheus_port)
+            logger.info(f"Metrics on port {settings.prometheus_port}")
+    
+    # Evict idle/completed interviews from the in-memory store
+    sweeper = None
+    if hasattr(store, "run_sweeper"):
+        sweeper = asyncio.create_task(store.run_sweeper(settings.state_sweep_interval_seconds))
+    
+    # Snapshot the in-memory store to disk; reload the last snapshot without blocking startup
+    restorer = None
+    if getattr(store, "snapshots", None) is not None:
+        store.snapshots.start()
+        restorer = asyncio.create_task(store.restore())
+    
+    # Pre-generate opening questions for known topics
+    if interviewer_agent.question_pool is not None and settings.question_pool_warm_topics:
+        interviewer_agent.question_pool.warm(
+            (topic, "ml_junior") for topic in settings.question_pool_warm_topics
+        )
     
     yield
     
     # Shutdown
     logger.info("Shutting down AI Interview Platform...")
+    if sweeper:
+        sweeper.cancel()
+        with suppress(asyncio.CancelledError):
+            await sweeper
+    if restorer:
+        restorer.cancel()
+        with suppress(asyncio.CancelledError):
+            await restorer
+    if session_timers:
+        clear_state_listeners()
+        await session_timers.close()
+    await interviewer_agent.close()
+    if submission_queue:
+        set_submission_queue(None)
+        await submission_queue.close()
+    if code_executor:
+        set_code_executor(None)
+        await code_executor.close()
+    if judge_queue:
+        clear_completion_hooks()
+        await judge_queue.close()
+        set_judge_queue(None)
+    await store.close()
+    await gemini_service.close()
+
+
+async def _start_code_executor():
+    """
+    Build and warm the sandbox pool, or return None if it cannot start.
+    
+    A host without a Docker daemon (or with the local backend refused) still
+    serves interviews; only code execution is unavailable.
+    """
+    try:
+        code_executor = build_code_executor()
+    except Exception as e:
+        logger.error(f"Code execution disabled, sandbox unavailable: {e}")
+        return None
+    try:
+        await code_executor.start()
+    except Exception as e:
+        logger.error(f"Code execution disabled, sandbox workers failed to start: {e}")
+        with suppress(Exception):
+            await code_executor.close()
+        return None
+    logger.info(f"Sandbox backend: {settings.sandbox_backend}")
+    return code_executor
+
+
+def _register_stats(store, judge_queue=None, code_executor=None, submission_queue=None, session_timers=None):
+    """Export the counters components already keep as Prometheus gauges."""
+    stats_collector.add("gemini_limiter", gemini_service.limiter.stats)
+    stats_collector.add("gemini_judge_limiter", gemini_service.judge_limiter.stats)
+    stats_collector.add("gemini_model_cache", gemini_service.model_cache_stats)
+    stats_collector.add("gemini_json", lambda: gemini_service.json_stats)
+    stats_collector.add(
+        "gemini_breaker",
+        lambda: {
+            name: {**breaker.stats(), "open": breaker.is_open()}
+            for name, breaker in gemini_service.breakers.items()
+        },
+        label="model"
+    )
+    stats_collector.add(
+        "gemini_hedging",
+        lambda: {name: hedger.stats() for name, hedger in gemini_service.hedgers.items()},
+        label="model"
+    )
+    stats_collector.add(
+        "gemini_router",
+        lambda: {name: {"routed": count} for name, count in gemini_service.router.routed.items()},
+        label="model"
+    )
+    stats_collector.add(
+        "gemini_router_decision",
+        lambda: {name: {"count": count} for name, count in gemini_service.router.decisions.items()},
+        label="decision"
+    )
+    stats_collector.add("submit_coalescer", submit_coalescer.stats)
+    stats_collector.add("ws_sessions", session_registry.stats)
+    if gemini_service.prefix_cache is not None:
+        stats_collector.add("prefix_cache", gemini_service.prefix_cache.stats)
+    if interviewer_agent.question_pool is not None:
+        stats_collector.add("question_pool", interviewer_agent.question_pool.stats)
+    if judge_queue is not None:
+        stats_collector.add("judge_queue", judge_queue.stats)
+    if code_executor is not None:
+        stats_collector.add("sandbox_pool", code_executor.stats)
+    if submission_queue is not None:
+        stats_collector.add("submission_queue", submission_queue.stats)
+    if session_timers is not None:
+        stats_collector.add("session_timers", session_timers.stats)
+    if hasattr(store, "stats"):
+        stats_collector.add("state_store", store.stats)
+    if getattr(store, "snapshots", None) is not None:
+        stats_collector.add("state_snapshots", store.snapshots.stats)
+    if hasattr(store, "phase_counts"):
+        stats_collector.add(
+            "live",
+            lambda: {phase: {"interviews": count} for phase, count in store.phase_counts().items()},
+            label="phase"
+        )
 
 
 # Create FastAPI app
@@ -45,9 +222,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency per route (pure ASGI, so streaming responses are timed to the end)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# Server-Timing header and per-request sampling profiler
+app.add_middleware(TimingMiddleware)
+
 # Include routers
 app.include_router(health.router, prefix=settings.api_prefix)
 app.include_router(interviews.router, prefix=settings.api_prefix)
+app.include_router(exports.router, prefix=settings.api_prefix)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    if not settings.metrics_enabled:
+        return Response(status_code=404)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.get("/")
@@ -1,8 +1,9 @@
 """Pydantic schemas for API requests and responses."""
 from datetime import datetime
-from typing import Optional, List, Literal
+from typing import Any, Dict, Optional, List, Literal
 from uuid import UUID
 from pydantic import BaseModel, Field
+from app.core.state_manager import CodeResult
 
 
 # Request Schemas
@@ -19,6 +20,12 @@ class InterviewResponseRequest(BaseModel):
     message: str = Field(..., min_length=1, max_length=2000)
 
 
+class SubmitCodeRequest(BaseModel):
+    """Request to run candidate code (the interview's problem and language by default)."""
+    code: str = Field(..., min_length=1, max_length=64 * 1024)
+    language: Optional[str] = None
+
+
 # Response Schemas
 class InterviewMeta(BaseModel):
     """Interview metadata in response."""
@@ -27,12 +34,14 @@ class InterviewMeta(BaseModel):
     flag_vague: bool
     flag_incorrect: bool
     end_theory_round: bool
+    mode: Literal["problem", "silent", "discussion", "end"]  # Coding sub-mode, applied in the coding phase only
 
 
 class InterviewerResponse(BaseModel):
     """Interviewer agent response."""
     speech: str
     meta: InterviewMeta
+    debug: Optional[Dict[str, Any]] = None  # Server-side stage timings (X-Debug-Timing: 1)
 
 
 class InterviewStateResponse(BaseModel):
@@ -56,6 +65,66 @@ class CreateInterviewResponse(BaseModel):
     interviewer_response: InterviewerResponse
 
 
+class TheoryScores(BaseModel):
+    """Judge scores for the theory round (0-5)."""
+    correctness: int
+    depth: int
+    clarity: int
+
+
+class CodingScores(BaseModel):
+    """Judge scores for the coding round (0-5)."""
+    correctness: int
+    approach: int
+    code_quality: int
+
+
+class Observations(BaseModel):
+    """Evidence the judge based its scores on."""
+    strengths: List[str]
+    weaknesses: List[str]
+    red_flags: List[str]
+
+
+class InterviewEvaluation(BaseModel):
+    """Judge output for one interview (see JUDGE_PROMPT)."""
+    overall_signal: Literal["strong", "medium", "weak"]
+    theory_scores: TheoryScores
+    coding_scores: CodingScores
+    observations: Observations
+    confidence_vs_evidence_gap: Literal["low", "medium", "high"]
+    hire_recommendation: Literal["hire", "borderline", "no-hire"]
+    justification: str
+
+
+class BatchEvaluationItem(InterviewEvaluation):
+    """One evaluation in a batched judge reply."""
+    interview_id: str
+
+
+class BatchEvaluation(BaseModel):
+    """Judge reply covering several interviews."""
+    evaluations: List[BatchEvaluationItem]
+
+
+class EvaluationResponse(BaseModel):
+    """Judge evaluation of a completed interview."""
+    interview_id: UUID
+    status: Literal["pending", "complete"]
+    evaluation: Optional[InterviewEvaluation] = None
+    judged_at: Optional[datetime] = None
+
+
+class SubmissionResponse(BaseModel):
+    """Code submission and, once it has run, its result."""
+    submission_id: UUID
+    interview_id: UUID
+    status: Literal["queued", "running", "complete", "failed"]
+    cached: bool = False  # Identical code was already submitted; no run was used
+    result: Optional[CodeResult] = None
+    error: Optional[str] = None
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
     status: str
@@ -0,0 +1,27 @@
+"""Celery application for background work (``celery -A app.services.celery_app worker``)."""
+import asyncio
+from typing import Optional
+from celery import Celery
+from app.config import settings
+
+celery_app = Celery(
+    "interview",
+    broker=settings.celery_broker_url,
+    backend=settings.celery_result_backend,
+    include=["app.services.judge_tasks", "app.services.code_tasks"]
+)
+celery_app.conf.update(
+    task_acks_late=True,  # A worker dying mid-task gets the task redelivered
+    worker_prefetch_multiplier=1
+)
+
+# One event loop per worker process, reused across tasks
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run_async(coro):
+    """Run a coroutine on the worker process's event loop."""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
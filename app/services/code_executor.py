@@ -0,0 +1,296 @@
+"""Code execution service: runs submissions on the warm sandbox pool."""
+import json
+import logging
+import math
+import os
+import secrets
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+from app.config import settings
+from app.core.problems import CodingProblem, TestCase, problem_registry
+from app.core.state_manager import CodeResult, TestCaseResult
+from app.services.sandbox import ExecutionOutcome, SandboxPool, build_sandbox_pool
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_LANGUAGES = ("python",)
+
+# Longest error message kept on a CodeResult
+_MAX_ERROR_CHARS = 2000
+
+# The test harness is itself the program each test run submits
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox", "harness.py")) as _f:
+    _HARNESS_SOURCE = _f.read()
+
+
+class CodeExecutor:
+    """Runs candidate code in a pooled sandbox and reports it as a ``CodeResult``."""
+
+    def __init__(self, pool: SandboxPool):
+        self.pool = pool
+
+    async def start(self):
+        """Warm up the sandbox pool."""
+        await self.pool.start()
+
+    async def close(self):
+        await self.pool.close()
+
+    async def run(self, code: str, language: str = "python", stdin: str = "") -> CodeResult:
+        """
+        Run a submission under the sandbox limits.
+
+        Args:
+            code: Submitted source code
+            language: Submission language
+            stdin: Standard input for the program
+
+        Returns:
+            CodeResult with ``compiled``, ``runtime_ms`` and any error filled in
+
+        Raises:
+            SandboxError: If the sandbox failed (not the submitted code)
+        """
+        if language not in SUPPORTED_LANGUAGES:
+            return self._unsupported(code, language)
+
+        async with self.pool.worker() as worker:
+            outcome = await worker.run(code, stdin)
+
+        return CodeResult(
+            submission_id=uuid4(),
+            language=language,
+            code=code,
+            compiled=outcome.compiled,
+            runtime_ms=round(outcome.runtime_ms, 3),
+            error=self._error(outcome)
+        )
+
+    async def run_tests(
+        self,
+        code: str,
+        problem: CodingProblem,
+        language: str = "python",
+        stop_on_failure: bool = False
+    ) -> CodeResult:
+        """
+        Run a problem's whole test suite against a submission in one sandbox run.
+
+        The harness executes the code once and calls the problem's function
+        for every test case in the same process, each under its own timeout.
+        Only the arguments go into the sandbox: the returned values are
+        compared with the expected ones here, where the submission cannot
+        reach them, and harness output that deviates from the expected event
+        sequence fails every test.
+
+        Args:
+            code: Submitted source code
+            problem: Coding problem with its test cases
+            language: Submission language
+            stop_on_failure: Report the tests after the first failure as not run
+
+        Returns:
+            CodeResult with per-test results; ``runtime_ms`` is the time
+            spent in the tests, and tests that did not run count as failed
+
+        Raises:
+            SandboxError: If the sandbox failed (not the submitted code)
+        """
+        if language not in SUPPORTED_LANGUAGES:
+            return self._unsupported(code, language)
+
+        calls = problem_registry.calls(problem)
+        token = secrets.token_hex(16)
+        job = json.dumps({
+            "token": token,
+            "code": code,
+            "function": problem.function,
+            "tests": calls,
+            "timeout": problem.test_timeout_seconds or settings.test_timeout_seconds,
+            "stop_on_error": stop_on_failure,
+        })
+        async with self.pool.worker() as worker:
+            outcome = await worker.run(_HARNESS_SOURCE, stdin=job)
+
+        try:
+            compiled, tests, done = _parse_run(_harness_events(outcome.stdout, token), problem)
+        except _HarnessProtocolError as e:
+            logger.warning(f"Rejected tampered test run for {problem.id}: {e}")
+            return CodeResult(
+                submission_id=uuid4(),
+                language=language,
+                code=code,
+                compiled=True,
+                tests_failed=len(problem.tests),
+                error="Test run rejected: the submission interfered with the test harness"
+            )
+
+        if stop_on_failure:
+            failed_at = next((index for index, test in enumerate(tests) if not test.passed), None)
+            if failed_at is not None:
+                del tests[failed_at + 1:]
+        passed = sum(test.passed for test in tests)
+
+        if compiled is not None and compiled.get("error"):
+            error = compiled["error"]
+        elif done is not None and done.get("error"):
+            error = done["error"]
+        elif done is None:
+            # Killed (time or memory limit) or crashed mid-suite
+            error = self._error(outcome) or "Test run ended early"
+        else:
+            error = next((test.error for test in tests if not test.passed), None)
+
+        return CodeResult(
+            submission_id=uuid4(),
+            language=language,
+            code=code,
+            compiled=compiled is not None and compiled["ok"] is True,
+            tests_passed=passed,
+            tests_failed=len(problem.tests) - passed,
+            runtime_ms=round(sum(test.runtime_ms for test in tests), 3) if tests else None,
+            error=str(error)[-_MAX_ERROR_CHARS:] if error else None,
+            test_results=tests
+        )
+
+    @staticmethod
+    def _unsupported(code: str, language: str) -> CodeResult:
+        return CodeResult(
+            submission_id=uuid4(),
+            language=language,
+            code=code,
+            compiled=False,
+            error=f"Unsupported language: {language}"
+        )
+
+    @staticmethod
+    def _error(outcome: ExecutionOutcome) -> Optional[str]:
+        """Candidate-facing error for a failed run, None for a clean one."""
+        if outcome.timed_out:
+            return f"Time limit exceeded ({settings.execution_timeout}s)"
+        if outcome.exit_code == 0:
+            return None
+        stderr = outcome.stderr.strip()
+        if "MemoryError" in stderr or outcome.exit_code == 137:
+            return "Memory limit exceeded"
+        return stderr[-_MAX_ERROR_CHARS:] or f"Exited with status {outcome.exit_code}"
+
+    def stats(self) -> Dict[str, float]:
+        return self.pool.stats()
+
+
+def _harness_events(stdout: str, token: str) -> List[Dict[str, Any]]:
+    """Harness event lines carrying this run's token (partial if the run was killed)."""
+    prefix = token + " "
+    events = []
+    for line in stdout.splitlines():
+        if not line.startswith(prefix):
+            continue
+        try:
+            event = json.loads(line[len(prefix):])
+        except ValueError:
+            continue
+        if isinstance(event, dict) and "event" in event:
+            events.append(event)
+    return events
+
+
+class _HarnessProtocolError(Exception):
+    """Harness output that the real harness cannot have produced (forged or interleaved events)."""
+
+
+def _parse_run(
+    events: List[Dict[str, Any]],
+    problem: CodingProblem
+) -> Tuple[Optional[Dict[str, Any]], List[TestCaseResult], Optional[Dict[str, Any]]]:
+    """
+    Check the harness event sequence and score the reported return values.
+
+    The only valid sequence is one ``compiled`` event, then at most one
+    ``test`` event per suite test in suite order (only after a clean
+    compile), then at most one ``done`` event, which ends the output. A
+    truncated sequence is valid (the run was killed).
+
+    Returns:
+        The compiled event, results of the tests that ran, and the done event
+
+    Raises:
+        _HarnessProtocolError: On any other sequence or a malformed event
+    """
+    compiled = done = None
+    results: List[TestCaseResult] = []
+    for event in events:
+        kind = event["event"]
+        if done is not None:
+            raise _HarnessProtocolError(f"{kind!r} event after done")
+        if compiled is None:
+            if kind != "compiled" or not isinstance(event.get("ok"), bool):
+                raise _HarnessProtocolError(f"{kind!r} event before compiled")
+            compiled = event
+        elif kind == "done":
+            done = event
+        elif kind != "test" or not compiled["ok"] or compiled.get("error"):
+            raise _HarnessProtocolError(f"Unexpected {kind!r} event")
+        elif len(results) >= len(problem.tests):
+            raise _HarnessProtocolError("More test events than tests")
+        else:
+            results.append(_score(event, problem.tests[len(results)], problem.tolerance))
+    return compiled, results, done
+
+
+def _score(event: Dict[str, Any], test: TestCase, tolerance: float) -> TestCaseResult:
+    """Result of one test from its harness event (which must be for ``test``)."""
+    runtime_ms, error = event.get("runtime_ms"), event.get("error")
+    if (
+        event.get("name") != test.name
+        or not isinstance(runtime_ms, (int, float))
+        or isinstance(runtime_ms, bool)
+        or not (error is None or isinstance(error, str))
+    ):
+        raise _HarnessProtocolError(f"Malformed or out-of-order event for test {test.name!r}")
+    if error is None and not _equal(event.get("value"), test.expected, tolerance):
+        error = f"Expected {json.dumps(test.expected)}, got {json.dumps(event.get('value'))}"[:_MAX_ERROR_CHARS]
+    return TestCaseResult(name=test.name, passed=error is None, runtime_ms=runtime_ms, error=error)
+
+
+def _equal(actual: Any, expected: Any, tolerance: float) -> bool:
+    """Compare a JSON-normalized return value with the expected one (floats within ``tolerance``)."""
+    if isinstance(expected, float) or (isinstance(actual, float) and isinstance(expected, int)):
+        return (
+            isinstance(actual, (int, float))
+            and not isinstance(actual, bool)
+            and math.isclose(actual, expected, rel_tol=tolerance, abs_tol=tolerance)
+        )
+    if isinstance(expected, list):
+        return (
+            isinstance(actual, list)
+            and len(actual) == len(expected)
+            and all(_equal(a, e, tolerance) for a, e in zip(actual, expected))
+        )
+    if isinstance(expected, dict):
+        return (
+            isinstance(actual, dict)
+            and actual.keys() == expected.keys()
+            and all(_equal(actual[key], expected[key], tolerance) for key in expected)
+        )
+    return actual == expected
+
+
+# Code executor, set up by the app lifespan when the sandbox is enabled
+_code_executor: Optional[CodeExecutor] = None
+
+
+def build_code_executor(backend: str = None) -> CodeExecutor:
+    """Code executor over the configured sandbox pool (not started)."""
+    return CodeExecutor(build_sandbox_pool(backend))
+
+
+def get_code_executor() -> Optional[CodeExecutor]:
+    """The running code executor, or None when the sandbox is disabled."""
+    return _code_executor
+
+
+def set_code_executor(executor: Optional[CodeExecutor]):
+    """Install (or clear) the code executor."""
+    global _code_executor
+    _code_executor = executor
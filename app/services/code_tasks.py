@@ -0,0 +1,26 @@
+"""Celery task for running code submissions."""
+from typing import Any, Dict, Optional
+from app.services.celery_app import celery_app, run_async
+from app.services.code_executor import CodeExecutor, build_code_executor
+from app.services.submissions import execute_submission
+
+# Warm sandbox pool per worker process, started by the first task
+_executor: Optional[CodeExecutor] = None
+
+
+@celery_app.task(name="code.run_submission")
+def run_submission(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one submission in this worker's sandbox pool.
+
+    Returns:
+        The CodeResult as JSON, collected by the API's submission queue
+    """
+    global _executor
+    if _executor is None:
+        executor = build_code_executor()
+        run_async(executor.start())
+        _executor = executor
+
+    result = run_async(execute_submission(_executor, job))
+    return result.model_dump(mode="json")
@@ -0,0 +1,69 @@
+"""Bounded concurrency for outbound LLM calls."""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+
+class ConcurrencyLimiter:
+    """
+    Cap the number of in-flight calls and make queueing visible.
+
+    Unlike a thread pool, waiting here costs a coroutine, not a thread, so
+    thousands of sessions can be parked while only ``limit`` calls are live.
+    """
+
+    def __init__(self, limit: int, name: str = "llm"):
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+        self.name = name
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        self.in_use = 0
+        self.waiting = 0
+        self.acquired_total = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.last_wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        """
+        Hold one concurrency slot for the duration of the block.
+
+        Yields:
+            Seconds spent waiting for the slot
+        """
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        waited = time.perf_counter() - start
+        self.in_use += 1
+        self.acquired_total += 1
+        self.wait_seconds_total += waited
+        self.last_wait_seconds = waited
+        if waited > self.wait_seconds_max:
+            self.wait_seconds_max = waited
+
+        try:
+            yield waited
+        finally:
+            self.in_use -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of limiter gauges and counters."""
+        avg_wait = self.wait_seconds_total / self.acquired_total if self.acquired_total else 0.0
+        return {
+            "limit": self.limit,
+            "in_use": self.in_use,
+            "queue_depth": self.waiting,
+            "acquired_total": self.acquired_total,
+            "wait_seconds_avg": avg_wait,
+            "wait_seconds_max": self.wait_seconds_max,
+            "wait_seconds_last": self.last_wait_seconds,
+        }
@@ -1,43 +1,273 @@
-"""Gemini API service with retry and circuit breaker."""
-import json
+"""Gemini API service with deadline-aware retries, circuit breaking and hedging."""
 import logging
 import asyncio
-from typing import Dict, Any, Optional
+import time
+from collections import OrderedDict
+from functools import lru_cache, partial
+from typing import Dict, Any, Optional, AsyncIterator, Tuple, Type
+from pydantic import BaseModel
 from tenacity import (
-    retry,
+    AsyncRetrying,
+    RetryCallState,
     stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type
+    wait_exponential_jitter,
+    retry_if_exception
 )
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 from app.config import settings
+from app.core.deadline import TurnDeadlineExceeded, cap_timeout, remaining
+from app.core.metrics import (
+    GEMINI_LATENCY,
+    GEMINI_QUEUE_WAIT,
+    GEMINI_RETRIES,
+    JSON_PARSE_LATENCY,
+    record_usage
+)
+from app.core import timing
+from app.core.prompts import JSON_REASK_PROMPT
+from app.core.structured_output import JSONRepairError, parse_json_lenient, response_schema
+from app.services.concurrency import ConcurrencyLimiter
+from app.services.model_router import ModelRouter
+from app.services.resilience import CircuitBreaker, Hedger, is_retryable
+from app.services.prefix_cache import (
+    PrefixCache,
+    GeminiPrefixCacheBackend,
+    LocalPrefixCacheBackend
+)
 
 logger = logging.getLogger(__name__)
 
+# Safety settings (permissive for interview context) - static, built once
+SAFETY_SETTINGS = {
+    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+}
+
+# An attempt is not worth starting with less of the turn left than this
+_MIN_ATTEMPT_SECONDS = 0.5
+
+_BACKOFF = wait_exponential_jitter(initial=0.2, max=2.0, jitter=0.2)
+
+# Model types that run on the judge limiter, off the live turn's path
+_BACKGROUND_MODEL_TYPES = ("judge", "summary")
+
+
+def _retry_wait(retry_state: RetryCallState) -> float:
+    """Jittered backoff, shortened so the next attempt still fits the deadline."""
+    wait = _BACKOFF(retry_state)
+    left = remaining()
+    if left is None:
+        return wait
+    return max(0.0, min(wait, left - _MIN_ATTEMPT_SECONDS))
+
+
+def _deadline_stop(retry_state: RetryCallState) -> bool:
+    """Stop retrying once the turn has too little time left for another attempt."""
+    left = remaining()
+    return left is not None and left < _MIN_ATTEMPT_SECONDS
+
+
+@lru_cache(maxsize=32)
+def _generation_config(
+    temperature: float,
+    max_output_tokens: int,
+    schema: Optional[Type[BaseModel]] = None
+) -> genai.GenerationConfig:
+    """Generation parameters, shared across calls with the same values."""
+    if schema is None:
+        return genai.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_output_tokens
+        )
+    # Structured output: the model is constrained to the schema's JSON
+    return genai.GenerationConfig(
+        temperature=temperature,
+        max_output_tokens=max_output_tokens,
+        response_mime_type="application/json",
+        response_schema=response_schema(schema)
+    )
+
 
 class GeminiService:
     """Service for interacting with Google Gemini API."""
     
     def __init__(self):
         genai.configure(api_key=settings.gemini_api_key)
-        # Create models with system instructions (will be set per-request)
         self.interviewer_model_name = settings.gemini_model_interviewer
+        self.interviewer_fallback_model_name = settings.gemini_model_interviewer_fallback
         self.judge_model_name = settings.gemini_model_judge
+        
+        # LRU cache of model handles keyed by (model name, system instruction)
+        self._models: "OrderedDict[Tuple[str, str], genai.GenerativeModel]" = OrderedDict()
+        self._model_cache_size = settings.gemini_model_cache_size
+        self.model_cache_hits = 0
+        self.model_cache_misses = 0
+        
+        # Explicit cap on in-flight Gemini calls (replaces the executor's thread cap)
+        self.limiter = ConcurrencyLimiter(settings.gemini_max_concurrency, name="gemini")
+        # Judge calls get their own small budget so they never queue ahead of live turns
+        self.judge_limiter = ConcurrencyLimiter(settings.judge_max_concurrency, name="gemini-judge")
+        self.use_async_client = settings.gemini_use_async_client
+        
+        # JSON parse outcomes: clean, locally repaired, failed, re-asked
+        self.json_stats = {"parsed": 0, "repaired": 0, "failed": 0, "reasked": 0}
+        
+        # Provider-side cache of static system instructions
+        self.prefix_cache = self._build_prefix_cache()
+        
+        # Per-model health: circuit breakers, hedging, latency/error-rate routing
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.hedgers: Dict[str, Hedger] = {}
+        self.retries = 0
+        self.router = ModelRouter(
+            p95_budget_seconds=settings.router_p95_budget_ms / 1000,
+            error_rate_budget=settings.router_error_rate_budget,
+            min_samples=settings.router_min_samples,
+            probe_interval_seconds=settings.router_probe_interval_seconds,
+            recovery_samples=settings.router_recovery_samples,
+            is_open=lambda model_name: model_name in self.breakers and self.breakers[model_name].is_open()
+        )
+    
+    @staticmethod
+    def _build_prefix_cache() -> Optional[PrefixCache]:
+        """Build the configured prefix cache ("gemini", "local" or "none")."""
+        backend = settings.gemini_prefix_cache_backend
+        if backend == "none":
+            return None
+        if backend == "gemini":
+            return PrefixCache(
+                GeminiPrefixCacheBackend(),
+                SAFETY_SETTINGS,
+                ttl_seconds=settings.gemini_prefix_cache_ttl_seconds,
+                refresh_margin_seconds=settings.gemini_prefix_cache_refresh_margin_seconds,
+                min_tokens=settings.gemini_prefix_cache_min_tokens
+            )
+        if backend == "local":
+            return PrefixCache(
+                LocalPrefixCacheBackend(),
+                SAFETY_SETTINGS,
+                ttl_seconds=settings.gemini_prefix_cache_ttl_seconds,
+                refresh_margin_seconds=settings.gemini_prefix_cache_refresh_margin_seconds
+            )
+        raise ValueError(f"Unknown prefix cache backend: {backend}")
+    
+    async def _resolve_model(self, model_name: str, system_instruction: str) -> genai.GenerativeModel:
+        """Model bound to a cached prefix when available, else a cached plain handle."""
+        if self.prefix_cache is not None:
+            model = await self.prefix_cache.get_model(model_name, system_instruction)
+            if model is not None:
+                return model
+        return self._get_model(model_name, system_instruction)
+    
+    async def close(self):
+        """Release provider-side resources (cached prefixes)."""
+        if self.prefix_cache is not None:
+            await self.prefix_cache.close()
+    
+    def _model_name(self, model_type: str) -> str:
+        """
+        Resolve a model type to a model name for the next call.
+        
+        Interviewer calls go through the router, which moves them to the
+        configured fallback model while the primary is over its latency or
+        error budget. Judge calls are not latency-critical and always use
+        the judge model. Transcript summaries are background work on the
+        interviewer model and are never routed.
+        """
+        if model_type == "summary":
+            return self.interviewer_model_name
+        if model_type != "interviewer":
+            return self.judge_model_name
+        if not settings.router_enabled:
+            return self.interviewer_model_name
+        return self.router.route(self.interviewer_model_name, self.interviewer_fallback_model_name)
+    
+    def _limiter(self, model_type: str) -> ConcurrencyLimiter:
+        """Concurrency limiter for a model type (judge and summary calls are capped separately)."""
+        return self.judge_limiter if model_type in _BACKGROUND_MODEL_TYPES else self.limiter
+    
+    def _get_model(self, model_name: str, system_instruction: str) -> genai.GenerativeModel:
+        """
+        Get a model handle for a system instruction, reusing cached handles.
+        
+        The system instruction only depends on the prompt template and its
+        parameters (e.g. the theory topic), so the set of live keys is small.
+        
+        Args:
+            model_name: Gemini model name
+            system_instruction: Rendered system instruction
+        
+        Returns:
+            Configured GenerativeModel
+        """
+        key = (model_name, system_instruction)
+        model = self._models.get(key)
+        if model is not None:
+            self._models.move_to_end(key)
+            self.model_cache_hits += 1
+            return model
+        
+        self.model_cache_misses += 1
+        model = genai.GenerativeModel(
+            model_name=model_name,
+            system_instruction=system_instruction,
+            safety_settings=SAFETY_SETTINGS
+        )
+        self._models[key] = model
+        if len(self._models) > self._model_cache_size:
+            self._models.popitem(last=False)
+        return model
+    
+    def model_cache_stats(self) -> Dict[str, int]:
+        """Model handle cache counters."""
+        return {
+            "size": len(self._models),
+            "capacity": self._model_cache_size,
+            "hits": self.model_cache_hits,
+            "misses": self.model_cache_misses,
+        }
+    
+    def _breaker(self, model_name: str) -> CircuitBreaker:
+        """Circuit breaker for a model, created on first use."""
+        breaker = self.breakers.get(model_name)
+        if breaker is None:
+            breaker = self.breakers[model_name] = CircuitBreaker(
+                model_name,
+                failure_threshold=settings.gemini_breaker_failure_threshold,
+                reset_seconds=settings.gemini_breaker_reset_seconds
+            )
+        return breaker
+    
+    def _hedger(self, model_name: str) -> Hedger:
+        hedger = self.hedgers.get(model_name)
+        if hedger is None:
+            hedger = self.hedgers[model_name] = Hedger(
+                self.router.latency_tracker(model_name),
+                min_delay=settings.gemini_hedge_min_delay_ms / 1000,
+                min_samples=settings.gemini_hedge_min_samples
+            )
+        return hedger
+    
+    def resilience_stats(self) -> Dict[str, Any]:
+        """Breaker state, hedging counters and routing decisions per model."""
+        return {
+            "retries": self.retries,
+            "breakers": {name: breaker.stats() for name, breaker in self.breakers.items()},
+            "hedging": {name: hedger.stats() for name, hedger in self.hedgers.items()},
+            "routing": self.router.stats(),
+        }
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((Exception,)),
-        reraise=True
-    )
     async def generate_response(
         self,
         prompt: str,
         system_instruction: str,
         model_type: str = "interviewer",
         temperature: float = 0.7,
-        max_output_tokens: int = 500
+        max_output_tokens: int = 500,
+        schema: Optional[Type[BaseModel]] = None
     ) -> str:
         """
         Generate a response from Gemini.
@@ -45,92 +275,417 @@ class GeminiService:
         Args:
             prompt: User prompt
             system_instruction: System instruction
-            model_type: "interviewer" or "judge"
+            model_type: "interviewer", "judge" or "summary"
             temperature: Sampling temperature
             max_output_tokens: Maximum output tokens
+            schema: Optional model to constrain the output to (JSON mode)
         
         Returns:
             Generated text response
+        
+        Transient errors (throttling, overload, timeouts) are retried up to
+        ``gemini_max_retries`` times with jittered backoff, never past the
+        current turn deadline. Each attempt is bounded by ``gemini_timeout``
+        and fails fast while the model's circuit is open. Interviewer calls
+        are routed per attempt, so a retry can land on the fallback model.
         """
+        generation_config = _generation_config(temperature, max_output_tokens, schema)
+        
         try:
-            model_name = self.interviewer_model_name if model_type == "interviewer" else self.judge_model_name
-            
-            # Create model with system instruction
-            model = genai.GenerativeModel(
-                model_name=model_name,
-                system_instruction=system_instruction
-            )
-            
-            # Configure safety settings (permissive for interview context)
-            safety_settings = {
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-            }
-            
-            # Configure generation parameters
-            generation_config = {
-                "temperature": temperature,
-                "max_output_tokens": max_output_tokens,
-            }
-            
-            # Run synchronous Gemini API call in thread pool
-            response = await asyncio.to_thread(
-                model.generate_content,
-                prompt,
-                generation_config=generation_config,
-                safety_settings=safety_settings
-            )
-            
-            return response.text
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(settings.gemini_max_retries + 1) | _deadline_stop,
+                wait=_retry_wait,
+                retry=retry_if_exception(is_retryable),
+                before_sleep=partial(self._log_retry, model_type),
+                reraise=True
+            ):
+                with attempt:
+                    return await self._attempt(model_type, system_instruction, prompt, generation_config)
             
         except Exception as e:
             logger.error(f"Gemini API error: {e}", exc_info=True)
             raise
     
+    def _log_retry(self, model_type: str, retry_state: RetryCallState):
+        self.retries += 1
+        GEMINI_RETRIES.labels(model_type).inc()
+        logger.warning(
+            f"Retrying Gemini call after {retry_state.outcome.exception()!r} "
+            f"(attempt {retry_state.attempt_number})"
+        )
+    
+    async def _attempt(
+        self,
+        model_type: str,
+        system_instruction: str,
+        prompt: str,
+        generation_config: genai.GenerationConfig
+    ) -> str:
+        """
+        One attempt: routing, breaker check, per-attempt timeout, optional hedging.
+        
+        The timeout also covers registering the prompt prefix on a cache miss.
+        A cancelled attempt (caller gone, losing hedge) says nothing about the
+        model's health and is not recorded.
+        """
+        timeout = cap_timeout(settings.gemini_timeout)
+        model_name = self._model_name(model_type)
+        breaker = self._breaker(model_name)
+        breaker.check()
+        
+        async def run():
+            model = await self._resolve_model(model_name, system_instruction)
+            call = partial(self._call, model_type, model_name, model, prompt, generation_config)
+            if settings.gemini_hedge_enabled and model_type != "summary":
+                return await self._hedger(model_name).run(call)
+            return await call()
+        
+        error: Optional[BaseException] = None
+        cancelled = False
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(run(), timeout)
+            return response.text
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        except asyncio.TimeoutError as e:
+            # At least this slow: keeps over-budget calls visible to the router
+            if model_type != "summary":
+                self.router.latency_tracker(model_name).record(time.perf_counter() - start)
+            if timeout < settings.gemini_timeout:
+                # Cut short by the turn deadline, not by a slow provider
+                error = TurnDeadlineExceeded("Turn deadline exceeded during Gemini call")
+                raise error from e
+            error = e
+            raise
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if cancelled:
+                breaker.record_ignored()
+            else:
+                self._record_outcome(model_type, model_name, breaker, error)
+    
+    async def _call(
+        self,
+        model_type: str,
+        model_name: str,
+        model: genai.GenerativeModel,
+        prompt: str,
+        generation_config: genai.GenerationConfig
+    ):
+        """Single provider call under the concurrency limiter; records its latency."""
+        async with self._limiter(model_type).slot() as waited:
+            GEMINI_QUEUE_WAIT.labels(model_type).observe(waited)
+            timing.record("gemini_queue", waited)
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                if self.use_async_client:
+                    response = await model.generate_content_async(
+                        prompt,
+                        generation_config=generation_config
+                    )
+                else:
+                    # Legacy path: synchronous call in the default thread pool
+                    response = await asyncio.to_thread(
+                        model.generate_content,
+                        prompt,
+                        generation_config=generation_config
+                    )
+                outcome = "ok"
+            except asyncio.CancelledError:
+                # Timed out, or the losing side of a hedge
+                outcome = "cancelled"
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                GEMINI_LATENCY.labels(model_type, model_name, outcome).observe(elapsed)
+            if model_type != "summary":
+                self.router.latency_tracker(model_name).record(elapsed)
+            timing.record("gemini_network", elapsed)
+        record_usage(model_type, getattr(response, "usage_metadata", None))
+        return response
+    
+    def _record_outcome(
+        self,
+        model_type: str,
+        model_name: str,
+        breaker: CircuitBreaker,
+        error: Optional[BaseException]
+    ):
+        """
+        Feed a call outcome to the breaker and router; client-side errors say nothing about health.
+        
+        Summaries share the interviewer model but not its limiter, so their
+        outcomes are left out of the signals that steer live turns (they
+        only release the probe slot they may hold).
+        """
+        if model_type == "summary":
+            breaker.record_ignored()
+            return
+        self.router.record(
+            model_name,
+            failed=error is not None and (is_retryable(error) or isinstance(error, TurnDeadlineExceeded))
+        )
+        if error is None:
+            breaker.record_success()
+        elif is_retryable(error):
+            breaker.record_failure()
+        else:
+            breaker.record_ignored()
+    
     async def generate_json_response(
         self,
         prompt: str,
         system_instruction: str,
-        model_type: str = "interviewer"
+        model_type: str = "interviewer",
+        schema: Optional[Type[BaseModel]] = None,
+        max_output_tokens: int = 500
     ) -> Dict[str, Any]:
         """
         Generate a JSON response from Gemini.
         
+        With a schema (and ``gemini_structured_output`` on) the model is
+        constrained to it server-side. Malformed or truncated output is
+        repaired locally; the model is re-asked only if that fails.
+        
         Args:
             prompt: User prompt
             system_instruction: System instruction
-            model_type: "interviewer" or "judge"
+            model_type: "interviewer", "judge" or "summary"
+            schema: Optional Pydantic model describing the reply
+            max_output_tokens: Maximum output tokens
         
         Returns:
             Parsed JSON response
         """
-        # Request JSON format
-        json_prompt = f"{prompt}\n\nIMPORTANT: Respond with valid JSON only. No markdown, no code blocks."
+        if not settings.gemini_structured_output:
+            schema = None
         
         response_text = await self.generate_response(
-            json_prompt,
+            self._json_prompt(prompt),
             system_instruction,
             model_type=model_type,
-            temperature=0.3  # Lower temperature for structured output
+            temperature=0.3,  # Lower temperature for structured output
+            max_output_tokens=max_output_tokens,
+            schema=schema
         )
         
-        # Clean response (remove markdown code blocks if present)
-        cleaned = response_text.strip()
-        if cleaned.startswith("```json"):
-            cleaned = cleaned[7:]
-        if cleaned.startswith("```"):
-            cleaned = cleaned[3:]
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3]
-        cleaned = cleaned.strip()
+        try:
+            return self.parse_json_text(response_text)
+        except ValueError:
+            if not settings.gemini_json_reask:
+                raise
+        
+        # Last resort: show the model its broken output and ask again
+        self.json_stats["reasked"] += 1
+        response_text = await self.generate_response(
+            JSON_REASK_PROMPT.format(prompt=prompt, response=response_text[:2000]),
+            system_instruction,
+            model_type=model_type,
+            temperature=0.0,
+            max_output_tokens=max_output_tokens,
+            schema=schema
+        )
+        return self.parse_json_text(response_text)
+    
+    async def stream_response(
+        self,
+        prompt: str,
+        system_instruction: str,
+        model_type: str = "interviewer",
+        temperature: float = 0.7,
+        max_output_tokens: int = 500,
+        schema: Optional[Type[BaseModel]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from Gemini chunk by chunk.
+        
+        Args:
+            prompt: User prompt
+            system_instruction: System instruction
+            model_type: "interviewer", "judge" or "summary"
+            temperature: Sampling temperature
+            max_output_tokens: Maximum output tokens
+            schema: Optional model to constrain the output to (JSON mode)
+        
+        Yields:
+            Text chunks as they arrive
+        
+        Streams are not retried (chunks may already be on the wire), but the
+        model's circuit breaker applies, and the turn deadline bounds the
+        wait for the stream to start (prefix registration included) and for
+        every chunk after it. A producer task reads the stream under the
+        limiter slot and buffers it, so the slot is freed when generation
+        ends, not when a slow consumer has read the last chunk. A stream
+        the caller abandons before generation ends is not recorded as a
+        success.
+        """
+        model_name = self._model_name(model_type)
+        timeout = cap_timeout(settings.gemini_timeout)
+        breaker = self._breaker(model_name)
+        breaker.check()
         
+        # Text chunks, then None, or the error that ended the stream;
+        # unbounded, max_output_tokens caps what can pile up
+        chunks: "asyncio.Queue[Any]" = asyncio.Queue()
+        producer = asyncio.create_task(self._stream_chunks(
+            chunks,
+            prompt,
+            system_instruction,
+            model_type,
+            model_name,
+            breaker,
+            _generation_config(temperature, max_output_tokens, schema),
+            timeout
+        ))
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    return
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                yield chunk
+        finally:
+            if not producer.done():
+                # Abandoned mid-stream: stop generating and give the slot back
+                producer.cancel()
+                await asyncio.wait([producer])
+    
+    async def _stream_chunks(
+        self,
+        chunks: "asyncio.Queue[Any]",
+        prompt: str,
+        system_instruction: str,
+        model_type: str,
+        model_name: str,
+        breaker: CircuitBreaker,
+        generation_config: genai.GenerationConfig,
+        timeout: float
+    ):
+        """Read a Gemini stream into ``chunks`` under a limiter slot (see ``stream_response``)."""
+        timing.attach_current_task()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        error: Optional[BaseException] = None
+        cancelled = False
+        try:
+            model = await asyncio.wait_for(self._resolve_model(model_name, system_instruction), timeout)
+            async with self._limiter(model_type).slot() as waited:
+                GEMINI_QUEUE_WAIT.labels(model_type).observe(waited)
+                timing.record("gemini_queue", waited)
+                start = time.perf_counter()
+                response = await asyncio.wait_for(
+                    model.generate_content_async(prompt, generation_config=generation_config, stream=True),
+                    deadline - loop.time()
+                )
+                usage = None
+                iterator = response.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(iterator.__anext__(), deadline - loop.time())
+                    except StopAsyncIteration:
+                        break
+                    # The final chunk carries the usage totals
+                    usage = getattr(chunk, "usage_metadata", None) or usage
+                    if chunk.text:
+                        chunks.put_nowait(chunk.text)
+                elapsed = time.perf_counter() - start
+                self.router.latency_tracker(model_name).record(elapsed)
+                GEMINI_LATENCY.labels(model_type, model_name, "ok").observe(elapsed)
+                timing.record("gemini_network", elapsed)
+                record_usage(model_type, usage)
+            chunks.put_nowait(None)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError) and timeout < settings.gemini_timeout:
+                # Cut short by the turn deadline, not by a slow provider
+                e = TurnDeadlineExceeded("Turn deadline exceeded during Gemini stream")
+            error = e
+            logger.error(f"Gemini streaming error: {e}", exc_info=True)
+            chunks.put_nowait(e)
+        finally:
+            if cancelled:
+                breaker.record_ignored()
+            else:
+                self._record_outcome(model_type, model_name, breaker, error)
+    
+    async def stream_json_response(
+        self,
+        prompt: str,
+        system_instruction: str,
+        model_type: str = "interviewer",
+        schema: Optional[Type[BaseModel]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the raw text of a JSON response from Gemini.
+        
+        The caller is responsible for incremental parsing; use
+        ``parse_json_text`` on the accumulated text once the stream ends.
+        
+        Args:
+            prompt: User prompt
+            system_instruction: System instruction
+            model_type: "interviewer", "judge" or "summary"
+            schema: Optional Pydantic model describing the reply
+        
+        Yields:
+            Raw text chunks of the JSON document
+        """
+        if not settings.gemini_structured_output:
+            schema = None
+        
+        async for chunk in self.stream_response(
+            self._json_prompt(prompt),
+            system_instruction,
+            model_type=model_type,
+            temperature=0.3,
+            schema=schema
+        ):
+            yield chunk
+    
+    @staticmethod
+    def _json_prompt(prompt: str) -> str:
+        """Append the JSON-only instruction to a prompt."""
+        return f"{prompt}\n\nIMPORTANT: Respond with valid JSON only. No markdown, no code blocks."
+    
+    def parse_json_text(self, response_text: str) -> Dict[str, Any]:
+        """
+        Parse a JSON completion, repairing fences, truncation and small syntax slips.
+        
+        Args:
+            response_text: Raw model output
+        
+        Returns:
+            Parsed JSON response
+        
+        Raises:
+            ValueError: If the output cannot be parsed even after repair
+        """
+        start = time.perf_counter()
         try:
-            return json.loads(cleaned)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {cleaned[:200]}")
+            parsed, repaired = parse_json_lenient(response_text)
+        except JSONRepairError as e:
+            JSON_PARSE_LATENCY.labels("failed").observe(time.perf_counter() - start)
+            self.json_stats["failed"] += 1
+            logger.error(f"Failed to parse JSON response: {response_text[:200]}")
             raise ValueError(f"Invalid JSON response from Gemini: {e}")
+        
+        elapsed = time.perf_counter() - start
+        JSON_PARSE_LATENCY.labels("repaired" if repaired else "parsed").observe(elapsed)
+        timing.record("json_parse", elapsed)
+        if repaired:
+            self.json_stats["repaired"] += 1
+            logger.warning(f"Repaired malformed JSON response: {response_text[:200]}")
+        else:
+            self.json_stats["parsed"] += 1
+        return parsed
 
 
 # Global instance
@@ -0,0 +1,381 @@
+"""Queue of completed interviews awaiting the judge (asyncio or Celery backend)."""
+import asyncio
+import contextvars
+import json
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+import redis.asyncio as redis
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JudgeResultStore(ABC):
+    """
+    Where evaluations are kept, keyed by interview ID.
+
+    Writes are first-wins: a retried or duplicated judge run never replaces
+    an evaluation a recruiter may already have read.
+    """
+
+    @abstractmethod
+    async def get(self, interview_id: str) -> Optional[Dict[str, Any]]:
+        """Stored record (``evaluation`` and ``judged_at``), or None if not judged yet."""
+
+    @abstractmethod
+    async def put_if_absent(self, interview_id: str, record: Dict[str, Any]) -> bool:
+        """Store a record unless one exists; returns whether it was stored."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class InMemoryJudgeResultStore(JudgeResultStore):
+    """Results in a process-local dict (single worker, asyncio backend only)."""
+
+    def __init__(self):
+        self._records: Dict[str, Dict[str, Any]] = {}
+
+    async def get(self, interview_id: str) -> Optional[Dict[str, Any]]:
+        return self._records.get(interview_id)
+
+    async def put_if_absent(self, interview_id: str, record: Dict[str, Any]) -> bool:
+        if interview_id in self._records:
+            return False
+        self._records[interview_id] = record
+        return True
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class RedisJudgeResultStore(JudgeResultStore):
+    """Results as JSON strings under ``{prefix}:judge:{id}``, written with SET NX."""
+
+    def __init__(self, client: "redis.Redis", prefix: str = None, ttl_seconds: Optional[int] = None):
+        self.client = client
+        self.prefix = prefix or settings.redis_state_prefix
+        self.ttl_seconds = ttl_seconds
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisJudgeResultStore":
+        """Create a store with a pooled client for the given Redis URL."""
+        return cls(
+            redis.Redis.from_url(url, decode_responses=True),
+            ttl_seconds=settings.judge_result_ttl_seconds
+        )
+
+    def _key(self, interview_id: str) -> str:
+        return f"{self.prefix}:judge:{interview_id}"
+
+    async def get(self, interview_id: str) -> Optional[Dict[str, Any]]:
+        value = await self.client.get(self._key(interview_id))
+        return json.loads(value) if value is not None else None
+
+    async def put_if_absent(self, interview_id: str, record: Dict[str, Any]) -> bool:
+        stored = await self.client.set(
+            self._key(interview_id),
+            json.dumps(record),
+            nx=True,
+            ex=self.ttl_seconds
+        )
+        return bool(stored)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def build_result_store(backend: str = None) -> JudgeResultStore:
+    """
+    Build the configured judge result store.
+
+    Args:
+        backend: "memory" or "redis" (defaults to ``settings.judge_result_backend``)
+
+    Returns:
+        Judge result store instance
+    """
+    backend = backend or settings.judge_result_backend
+    if backend == "memory":
+        return InMemoryJudgeResultStore()
+    if backend == "redis":
+        return RedisJudgeResultStore.from_url(settings.redis_url)
+    raise ValueError(f"Unknown judge result backend: {backend}")
+
+
+async def judge_and_store(inputs: List[Dict[str, Any]], results: JudgeResultStore) -> List[str]:
+    """
+    Evaluate a batch and store every evaluation that succeeded.
+
+    Interviews that already have a result are skipped, so a redelivered or
+    retried batch only spends judge calls on what is still missing.
+
+    Args:
+        inputs: Judge inputs from ``JudgeAgent.build_input``
+        results: Result store
+
+    Returns:
+        IDs of the interviews that could not be evaluated
+    """
+    from app.agents.judge_agent import judge_agent
+
+    todo = [item for item in inputs if await results.get(item["interview_id"]) is None]
+    if not todo:
+        return []
+
+    evaluations = await judge_agent.evaluate_batch(todo)
+    judged_at = datetime.utcnow().isoformat()
+    for interview_id, evaluation in evaluations.items():
+        await results.put_if_absent(interview_id, {"evaluation": evaluation, "judged_at": judged_at})
+    return [item["interview_id"] for item in todo if item["interview_id"] not in evaluations]
+
+
+class JudgeQueue(ABC):
+    """Accepts completed interviews and gets them judged in the background."""
+
+    def __init__(self, results: JudgeResultStore):
+        self.results = results
+        self.submitted = 0
+        self.duplicates = 0
+        self._pending: Set[str] = set()
+
+    async def submit(self, judge_input: Dict[str, Any]) -> bool:
+        """
+        Queue an interview for judging.
+
+        Args:
+            judge_input: Judge input from ``JudgeAgent.build_input``
+
+        Returns:
+            False if the interview is already queued or judged
+        """
+        interview_id = judge_input["interview_id"]
+        if interview_id in self._pending or await self.results.get(interview_id) is not None:
+            self.duplicates += 1
+            return False
+        self._pending.add(interview_id)
+        self.submitted += 1
+        await self._enqueue(judge_input)
+        return True
+
+    @abstractmethod
+    async def _enqueue(self, judge_input: Dict[str, Any]) -> None:
+        """Hand an accepted interview to the backend."""
+
+    def start(self) -> None:
+        """Start background work."""
+
+    async def close(self) -> None:
+        """Stop background work and release the result store."""
+        await self.results.close()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "pending": len(self._pending),
+            "submitted": self.submitted,
+            "duplicates": self.duplicates,
+        }
+
+
+class AsyncioJudgeQueue(JudgeQueue):
+    """
+    In-process judging: worker tasks pull batches off an asyncio queue.
+
+    Each worker takes up to ``batch_size`` interviews, waiting at most
+    ``batch_wait_seconds`` for a batch to fill, and judges them in one call.
+    Interviews that fail are requeued until ``max_attempts``. Judge calls go
+    through Gemini's separate judge limiter, so they never hold a slot a
+    live interviewer turn is waiting for.
+    """
+
+    def __init__(
+        self,
+        results: JudgeResultStore,
+        workers: int = 2,
+        batch_size: int = 4,
+        batch_wait_seconds: float = 2.0,
+        max_attempts: int = 3
+    ):
+        super().__init__(results)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self.max_attempts = max_attempts
+        self.judged = 0
+        self.failed = 0
+        self.batches = 0
+        self._queue: "asyncio.Queue[Tuple[Dict[str, Any], int]]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+    async def _enqueue(self, judge_input: Dict[str, Any]) -> None:
+        self._queue.put_nowait((judge_input, 1))
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            # Fresh context: workers must not inherit a request's deadline or timer
+            self._tasks.append(asyncio.create_task(
+                self._work(),
+                name=f"judge-worker-{index}",
+                context=contextvars.Context()
+            ))
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        await super().close()
+
+    async def _work(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                failed = set(await judge_and_store([item for item, _ in batch], self.results))
+            except Exception as e:
+                logger.error(f"Judge batch failed: {e}", exc_info=True)
+                failed = {item["interview_id"] for item, _ in batch}
+            self.batches += 1
+
+            for item, attempt in batch:
+                interview_id = item["interview_id"]
+                if interview_id not in failed:
+                    self.judged += 1
+                    self._pending.discard(interview_id)
+                elif attempt < self.max_attempts:
+                    self._queue.put_nowait((item, attempt + 1))
+                else:
+                    logger.error(f"Giving up judging {interview_id} after {attempt} attempts")
+                    self.failed += 1
+                    self._pending.discard(interview_id)
+
+    async def _next_batch(self) -> List[Tuple[Dict[str, Any], int]]:
+        """Wait for one interview, then up to ``batch_wait_seconds`` for more."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        fill_by = loop.time() + self.batch_wait_seconds
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            left = fill_by - loop.time()
+            if left <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), left))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            **super().stats(),
+            "queued": self._queue.qsize(),
+            "judged": self.judged,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+
+class CeleryJudgeQueue(JudgeQueue):
+    """
+    Judging on Celery workers (``celery -A app.services.celery_app worker``).
+
+    Interviews are grouped into batches of ``batch_size`` (or whatever has
+    arrived after ``batch_wait_seconds``) before one task is sent per batch.
+    Workers write to the shared Redis result store, which the API reads.
+    """
+
+    def __init__(self, results: JudgeResultStore, batch_size: int = 4, batch_wait_seconds: float = 2.0):
+        if isinstance(results, InMemoryJudgeResultStore):
+            raise ValueError("The Celery judge backend needs judge_result_backend='redis'")
+        super().__init__(results)
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self.sent = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def _enqueue(self, judge_input: Dict[str, Any]) -> None:
+        self._buffer.append(judge_input)
+        if len(self._buffer) >= self.batch_size:
+            await self._flush()
+        elif self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later(), context=contextvars.Context())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.batch_wait_seconds)
+        await self._flush()
+
+    async def _flush(self):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        from app.services.celery_app import celery_app
+
+        try:
+            # Publishing is a blocking broker round trip
+            await asyncio.to_thread(celery_app.send_task, "judge.evaluate_batch", args=[batch])
+            self.sent += 1
+        except Exception as e:
+            logger.error(f"Could not send judge batch of {len(batch)}: {e}")
+        finally:
+            # From here on the result store is the source of truth for duplicates
+            for item in batch:
+                self._pending.discard(item["interview_id"])
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+        await self._flush()
+        await super().close()
+
+    def stats(self) -> Dict[str, float]:
+        return {**super().stats(), "buffered": len(self._buffer), "batches_sent": self.sent}
+
+
+def build_judge_queue(backend: str = None) -> JudgeQueue:
+    """
+    Build the configured judge queue.
+
+    Args:
+        backend: "asyncio" or "celery" (defaults to ``settings.judge_backend``)
+
+    Returns:
+        Judge queue (not started)
+    """
+    backend = backend or settings.judge_backend
+    results = build_result_store()
+    if backend == "asyncio":
+        return AsyncioJudgeQueue(
+            results,
+            workers=settings.judge_workers,
+            batch_size=settings.judge_batch_size,
+            batch_wait_seconds=settings.judge_batch_wait_seconds,
+            max_attempts=settings.judge_max_attempts
+        )
+    if backend == "celery":
+        return CeleryJudgeQueue(
+            results,
+            batch_size=settings.judge_batch_size,
+            batch_wait_seconds=settings.judge_batch_wait_seconds
+        )
+    raise ValueError(f"Unknown judge backend: {backend}")
+
+
+# Judge queue, set up by the app lifespan when judging is enabled
+_judge_queue: Optional[JudgeQueue] = None
+
+
+def get_judge_queue() -> Optional[JudgeQueue]:
+    """The running judge queue, or None when judging is disabled."""
+    return _judge_queue
+
+
+def set_judge_queue(queue: Optional[JudgeQueue]):
+    """Install (or clear) the judge queue."""
+    global _judge_queue
+    _judge_queue = queue
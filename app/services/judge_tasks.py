@@ -0,0 +1,34 @@
+"""Celery task for batch judging."""
+from typing import Any, Dict, List, Optional
+from app.config import settings
+from app.services.celery_app import celery_app, run_async
+from app.services.judge_queue import JudgeResultStore, build_result_store, judge_and_store
+
+# Result store per worker process, reused across tasks
+_results: Optional[JudgeResultStore] = None
+
+
+@celery_app.task(
+    name="judge.evaluate_batch",
+    bind=True,
+    ignore_result=True,  # Evaluations live in the judge result store
+    max_retries=settings.judge_max_attempts - 1,
+    default_retry_delay=30
+)
+def evaluate_batch(self, inputs: List[Dict[str, Any]]) -> int:
+    """
+    Judge a batch of interviews and store the results.
+
+    The retry only re-judges interviews still missing a result.
+
+    Returns:
+        Number of interviews judged
+    """
+    global _results
+    if _results is None:
+        _results = build_result_store()
+
+    failed = run_async(judge_and_store(inputs, _results))
+    if failed:
+        raise self.retry(exc=RuntimeError(f"Judge failed for {len(failed)} of {len(inputs)} interviews"))
+    return len(inputs)
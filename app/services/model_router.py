@@ -0,0 +1,195 @@
+"""Latency-SLO routing between a primary model and a faster fallback."""
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+from app.services.resilience import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+
+class ErrorRateTracker:
+    """Rolling window of call outcomes."""
+
+    def __init__(self, window: int = 100):
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._errors = 0
+
+    def record(self, failed: bool):
+        if len(self._outcomes) == self._outcomes.maxlen and self._outcomes[0]:
+            self._errors -= 1
+        self._outcomes.append(failed)
+        if failed:
+            self._errors += 1
+
+    def rate(self) -> float:
+        return self._errors / len(self._outcomes) if self._outcomes else 0.0
+
+    def clear(self):
+        self._outcomes.clear()
+        self._errors = 0
+
+    def __len__(self) -> int:
+        return len(self._outcomes)
+
+
+class ModelRouter:
+    """
+    Picks the model for a call from rolling per-model latency and error rates.
+
+    While the primary model's p95 latency or error rate is within budget
+    every call goes to it. Once either budget is breached (or its circuit is
+    open) calls move to the fallback. The primary then only sees one probe
+    call every ``probe_interval_seconds``; its window is restarted at
+    failover so that ``recovery_samples`` healthy probes are enough to move
+    traffic back.
+    """
+
+    def __init__(
+        self,
+        p95_budget_seconds: float = 2.5,
+        error_rate_budget: float = 0.2,
+        min_samples: int = 20,
+        probe_interval_seconds: float = 5.0,
+        recovery_samples: int = 5,
+        window: int = 100,
+        is_open: Optional[Callable[[str], bool]] = None
+    ):
+        self.p95_budget_seconds = p95_budget_seconds
+        self.error_rate_budget = error_rate_budget
+        self.min_samples = min_samples
+        self.probe_interval_seconds = probe_interval_seconds
+        self.recovery_samples = recovery_samples
+        self.window = window
+        self.is_open = is_open or (lambda model_name: False)
+
+        self.latency: Dict[str, LatencyTracker] = {}
+        self.errors: Dict[str, ErrorRateTracker] = {}
+
+        # primary -> time of failover, for primaries currently failed over
+        self._failed_over: Dict[str, float] = {}
+        self._last_probe: Dict[str, float] = {}
+
+        self.routed: Dict[str, int] = {}
+        self.decisions: Dict[str, int] = {}
+        self.probes = 0
+
+    def latency_tracker(self, model_name: str) -> LatencyTracker:
+        """Rolling latency window for a model, created on first use."""
+        tracker = self.latency.get(model_name)
+        if tracker is None:
+            tracker = self.latency[model_name] = LatencyTracker(self.window)
+        return tracker
+
+    def _error_tracker(self, model_name: str) -> ErrorRateTracker:
+        tracker = self.errors.get(model_name)
+        if tracker is None:
+            tracker = self.errors[model_name] = ErrorRateTracker(self.window)
+        return tracker
+
+    def record(self, model_name: str, seconds: Optional[float] = None, failed: bool = False):
+        """
+        Record the outcome of a call.
+
+        Args:
+            model_name: Model that served the call
+            seconds: Provider latency, if the call completed
+            failed: Whether the call failed for a provider-side reason
+        """
+        if seconds is not None:
+            self.latency_tracker(model_name).record(seconds)
+        self._error_tracker(model_name).record(failed)
+
+    def route(self, primary: str, fallback: Optional[str]) -> str:
+        """
+        Model to use for the next call.
+
+        Args:
+            primary: Preferred model
+            fallback: Faster model to use while the primary is over budget
+
+        Returns:
+            Model name
+        """
+        if not fallback or fallback == primary:
+            return self._count(primary)
+
+        now = time.monotonic()
+        if primary not in self._failed_over:
+            reason = self._breach(primary, self.min_samples)
+            if reason is None or self.is_open(fallback):
+                return self._count(primary)
+            self._failover(primary, fallback, reason, now)
+            return self._count(fallback)
+
+        if self.is_open(fallback) and not self.is_open(primary):
+            self._failback(primary, "fallback_circuit_open")
+            return self._count(primary)
+
+        if len(self._error_tracker(primary)) >= self.recovery_samples:
+            if self._breach(primary, self.recovery_samples) is None:
+                self._failback(primary, "recovered")
+                return self._count(primary)
+
+        # Trickle probes to the primary so recovery can be observed
+        if now - self._last_probe.get(primary, 0.0) >= self.probe_interval_seconds and not self.is_open(primary):
+            self._last_probe[primary] = now
+            self.probes += 1
+            return self._count(primary)
+
+        return self._count(fallback)
+
+    def _breach(self, model_name: str, min_samples: int) -> Optional[str]:
+        """Which budget a model is breaching, or None if within budget."""
+        if self.is_open(model_name):
+            return "circuit_open"
+
+        errors = self._error_tracker(model_name)
+        if len(errors) < min_samples:
+            return None
+        if errors.rate() > self.error_rate_budget:
+            return "error_rate"
+
+        latency = self.latency_tracker(model_name)
+        if len(latency) >= min_samples and latency.percentile(0.95) > self.p95_budget_seconds:
+            return "p95_latency"
+        return None
+
+    def _failover(self, primary: str, fallback: str, reason: str, now: float):
+        logger.warning(f"Routing {primary} traffic to {fallback} ({reason})")
+        self._failed_over[primary] = now
+        self._last_probe[primary] = now
+        # Judge recovery only on probes made after the failover
+        self.latency_tracker(primary).clear()
+        self._error_tracker(primary).clear()
+        self._decide(f"failover_{reason}")
+
+    def _failback(self, primary: str, reason: str):
+        logger.info(f"Routing traffic back to {primary} ({reason})")
+        del self._failed_over[primary]
+        self._decide(f"failback_{reason}")
+
+    def _decide(self, decision: str):
+        self.decisions[decision] = self.decisions.get(decision, 0) + 1
+
+    def _count(self, model_name: str) -> str:
+        self.routed[model_name] = self.routed.get(model_name, 0) + 1
+        return model_name
+
+    def stats(self) -> Dict[str, object]:
+        """Routing decisions, per-model traffic and health."""
+        return {
+            "failed_over": sorted(self._failed_over),
+            "decisions": dict(self.decisions),
+            "routed": dict(self.routed),
+            "probes": self.probes,
+            "models": {
+                name: {
+                    "latency_p50": self.latency_tracker(name).percentile(0.5),
+                    "latency_p95": self.latency_tracker(name).percentile(0.95),
+                    "error_rate": self._error_tracker(name).rate(),
+                    "samples": len(self._error_tracker(name)),
+                }
+                for name in set(self.latency) | set(self.errors)
+            },
+        }
@@ -0,0 +1,262 @@
+"""Server-side caching of static system-instruction prefixes."""
+import asyncio
+import contextvars
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import count
+from typing import Any, Dict, Optional, Tuple
+import google.generativeai as genai
+from google.generativeai import caching
+
+logger = logging.getLogger(__name__)
+
+# After a failed registration, wait this long before trying the key again
+_FAILURE_BACKOFF_SECONDS = 600.0
+
+# Remembered uncacheable keys before the memo is reset
+_MAX_UNSUPPORTED_KEYS = 10000
+
+
+class PrefixCacheUnsupported(Exception):
+    """The backend cannot cache this prefix (too small, model unsupported, ...)."""
+
+
+@dataclass
+class CachedPrefix:
+    """A registered (model, system instruction) prefix."""
+    handle: Any
+    model: genai.GenerativeModel
+    expires_at: float
+    refreshing: bool = False
+
+
+class PrefixCacheBackend(ABC):
+    """Provider-side storage for cached prefixes."""
+
+    @abstractmethod
+    async def create(self, model_name: str, system_instruction: str, ttl_seconds: int) -> Any:
+        """Register a prefix and return its handle."""
+
+    @abstractmethod
+    async def refresh(self, handle: Any, ttl_seconds: int) -> None:
+        """Extend a handle's lifetime."""
+
+    @abstractmethod
+    async def delete(self, handle: Any) -> None:
+        """Release a handle."""
+
+    @abstractmethod
+    def model_for(self, handle: Any, safety_settings: Dict) -> genai.GenerativeModel:
+        """Model bound to a cached prefix."""
+
+
+class GeminiPrefixCacheBackend(PrefixCacheBackend):
+    """Gemini cached-content API (``google.generativeai.caching``)."""
+
+    async def create(self, model_name: str, system_instruction: str, ttl_seconds: int) -> Any:
+        try:
+            return await asyncio.to_thread(
+                caching.CachedContent.create,
+                model=model_name,
+                system_instruction=system_instruction,
+                ttl=timedelta(seconds=ttl_seconds)
+            )
+        except Exception as e:
+            raise PrefixCacheUnsupported(str(e)) from e
+
+    async def refresh(self, handle: Any, ttl_seconds: int) -> None:
+        await asyncio.to_thread(handle.update, ttl=timedelta(seconds=ttl_seconds))
+
+    async def delete(self, handle: Any) -> None:
+        await asyncio.to_thread(handle.delete)
+
+    def model_for(self, handle: Any, safety_settings: Dict) -> genai.GenerativeModel:
+        return genai.GenerativeModel.from_cached_content(
+            cached_content=handle,
+            safety_settings=safety_settings
+        )
+
+
+class LocalPrefixCacheBackend(PrefixCacheBackend):
+    """
+    In-process stand-in for tests and offline runs.
+
+    Handles are plain IDs and models carry the full system instruction, so
+    calls behave exactly as uncached ones while the cache bookkeeping
+    (registration, reuse, refresh) is exercised.
+    """
+
+    def __init__(self):
+        self._ids = count(1)
+        self.prefixes: Dict[str, Tuple[str, str]] = {}
+        self.refreshes = 0
+
+    async def create(self, model_name: str, system_instruction: str, ttl_seconds: int) -> Any:
+        handle = f"cachedContents/local-{next(self._ids)}"
+        self.prefixes[handle] = (model_name, system_instruction)
+        return handle
+
+    async def refresh(self, handle: Any, ttl_seconds: int) -> None:
+        self.refreshes += 1
+
+    async def delete(self, handle: Any) -> None:
+        self.prefixes.pop(handle, None)
+
+    def model_for(self, handle: Any, safety_settings: Dict) -> genai.GenerativeModel:
+        model_name, system_instruction = self.prefixes[handle]
+        return genai.GenerativeModel(
+            model_name=model_name,
+            system_instruction=system_instruction,
+            safety_settings=safety_settings
+        )
+
+
+class PrefixCache:
+    """
+    Register each (model, rendered system instruction) once and reuse it.
+
+    All sessions on the same topic share one handle. Handles are refreshed
+    in the background once they are within ``refresh_margin_seconds`` of
+    expiring, so a turn never waits on a refresh. Prefixes the backend
+    refuses (e.g. below the provider's minimum size) are remembered and
+    retried only after a backoff; callers fall back to an uncached model.
+    """
+
+    def __init__(
+        self,
+        backend: PrefixCacheBackend,
+        safety_settings: Dict,
+        ttl_seconds: int = 3600,
+        refresh_margin_seconds: int = 300,
+        min_tokens: int = 0,
+        max_entries: int = 256
+    ):
+        self.backend = backend
+        self.safety_settings = safety_settings
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.min_tokens = min_tokens
+        self.max_entries = max_entries
+
+        self._entries: Dict[Tuple[str, str], CachedPrefix] = {}
+        self._unsupported: Dict[Tuple[str, str], float] = {}
+        self._creating: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.hits = 0
+        self.creates = 0
+        self.refreshes = 0
+        self.failures = 0
+        self.skipped = 0
+
+    async def get_model(self, model_name: str, system_instruction: str) -> Optional[genai.GenerativeModel]:
+        """
+        Model bound to the cached prefix, or None when it cannot be cached.
+
+        Args:
+            model_name: Gemini model name
+            system_instruction: Rendered system instruction
+
+        Returns:
+            GenerativeModel using the cached prefix, or None
+        """
+        key = (model_name, system_instruction)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > now:
+            self.hits += 1
+            if entry.expires_at - now < self.refresh_margin_seconds and not entry.refreshing:
+                entry.refreshing = True
+                # Fresh context: the refresh must not inherit the turn's deadline or timer
+                asyncio.create_task(self._refresh(key, entry), context=contextvars.Context())
+            return entry.model
+
+        if self._unsupported.get(key, 0.0) > now:
+            self.skipped += 1
+            return None
+
+        if len(self._unsupported) > _MAX_UNSUPPORTED_KEYS:
+            self._unsupported.clear()
+
+        if len(system_instruction) // 4 < self.min_tokens:
+            self._unsupported[key] = float("inf")
+            self.skipped += 1
+            return None
+
+        # Single-flight registration: concurrent first turns share one create
+        pending = self._creating.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._creating[key] = future
+        try:
+            model = await self._create(key)
+            future.set_result(model)
+            return model
+        finally:
+            if not future.done():
+                # Creator was cancelled; waiters fall back to an uncached model
+                future.set_result(None)
+            del self._creating[key]
+
+    async def _create(self, key: Tuple[str, str]) -> Optional[genai.GenerativeModel]:
+        model_name, system_instruction = key
+        try:
+            handle = await self.backend.create(model_name, system_instruction, self.ttl_seconds)
+        except Exception as e:
+            self.failures += 1
+            self._unsupported[key] = time.monotonic() + _FAILURE_BACKOFF_SECONDS
+            logger.info(f"Prefix cache unavailable for {model_name}: {e}")
+            return None
+
+        self.creates += 1
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            # Drop the oldest registration; its handle is released in the background
+            oldest_key = next(iter(self._entries))
+            oldest = self._entries.pop(oldest_key)
+            asyncio.create_task(self._release(oldest), context=contextvars.Context())
+        model = self.backend.model_for(handle, self.safety_settings)
+        self._entries[key] = CachedPrefix(
+            handle=handle,
+            model=model,
+            expires_at=time.monotonic() + self.ttl_seconds
+        )
+        return model
+
+    async def _refresh(self, key: Tuple[str, str], entry: CachedPrefix):
+        try:
+            await self.backend.refresh(entry.handle, self.ttl_seconds)
+            entry.expires_at = time.monotonic() + self.ttl_seconds
+            self.refreshes += 1
+        except Exception as e:
+            # Let it expire; the next turn after expiry registers a new handle
+            logger.warning(f"Prefix cache refresh failed for {key[0]}: {e}")
+        finally:
+            entry.refreshing = False
+
+    async def _release(self, entry: CachedPrefix):
+        try:
+            await self.backend.delete(entry.handle)
+        except Exception as e:
+            logger.warning(f"Failed to delete cached prefix: {e}")
+
+    async def close(self):
+        """Release every registered handle."""
+        entries, self._entries = self._entries, {}
+        for entry in entries.values():
+            await self._release(entry)
+
+    def stats(self) -> Dict[str, int]:
+        """Prefix cache counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "creates": self.creates,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "skipped": self.skipped,
+        }
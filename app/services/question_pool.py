@@ -0,0 +1,143 @@
+"""Pre-generated opening questions so interview creation skips the LLM."""
+import asyncio
+import contextvars
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (theory_topic, interview_type) -> interviewer response with "speech" and "meta"
+QuestionGenerator = Callable[[str, str], Awaitable[Dict[str, Any]]]
+
+PoolKey = Tuple[str, str]
+
+
+class OpeningQuestionPool:
+    """
+    Background-refilled pool of Phase-1 questions per (topic, interview_type).
+
+    The opening question only depends on the topic and interview type, so it
+    can be generated before anyone asks for it. ``pop`` is a pure in-memory
+    operation; every pop (hit or miss) tops the key back up to ``depth`` in
+    the background. Questions older than ``max_age_seconds`` are discarded
+    so candidates on a popular topic do not all hear the same few questions.
+    """
+
+    def __init__(
+        self,
+        generate: QuestionGenerator,
+        depth: int = 3,
+        max_age_seconds: float = 1800,
+        max_keys: int = 500,
+        refill_concurrency: int = 4
+    ):
+        self.generate = generate
+        self.depth = depth
+        self.max_age_seconds = max_age_seconds
+        self.max_keys = max_keys
+
+        self._pools: "OrderedDict[PoolKey, Deque[Tuple[float, Dict[str, Any]]]]" = OrderedDict()
+        self._refilling: Set[PoolKey] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._refill_slots = asyncio.Semaphore(refill_concurrency)
+
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.expired = 0
+        self.failures = 0
+
+    @staticmethod
+    def _key(theory_topic: str, interview_type: str) -> PoolKey:
+        return (" ".join(theory_topic.lower().split()), interview_type)
+
+    def pop(self, theory_topic: str, interview_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Take a pre-generated opening question, if one is ready.
+
+        Args:
+            theory_topic: Interview theory topic
+            interview_type: Interview type
+
+        Returns:
+            Interviewer response dict, or None on a miss
+        """
+        key = self._key(theory_topic, interview_type)
+        pool = self._pools.get(key)
+        response = None
+
+        if pool is not None:
+            self._pools.move_to_end(key)
+            cutoff = time.monotonic() - self.max_age_seconds
+            while pool and pool[0][0] < cutoff:
+                pool.popleft()
+                self.expired += 1
+            if pool:
+                response = pool.popleft()[1]
+
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        self._schedule_refill(key, theory_topic, interview_type)
+        return response
+
+    def warm(self, keys: Iterable[Tuple[str, str]]):
+        """Start filling the pool for known (topic, interview_type) pairs."""
+        for theory_topic, interview_type in keys:
+            self._schedule_refill(self._key(theory_topic, interview_type), theory_topic, interview_type)
+
+    def _schedule_refill(self, key: PoolKey, theory_topic: str, interview_type: str):
+        if key in self._refilling:
+            return
+        self._refilling.add(key)
+        # Fresh context: a refill must not inherit the triggering request's deadline or timer
+        task = asyncio.create_task(
+            self._refill(key, theory_topic, interview_type),
+            context=contextvars.Context()
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refill(self, key: PoolKey, theory_topic: str, interview_type: str):
+        try:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = deque()
+                while len(self._pools) > self.max_keys:
+                    self._pools.popitem(last=False)
+
+            while len(pool) < self.depth:
+                async with self._refill_slots:
+                    try:
+                        response = await self.generate(theory_topic, interview_type)
+                    except Exception as e:
+                        # Stop on failure; the next pop retries
+                        self.failures += 1
+                        logger.warning(f"Opening question pre-generation failed: {e}")
+                        return
+                pool.append((time.monotonic(), response))
+                self.generated += 1
+        finally:
+            self._refilling.discard(key)
+
+    async def close(self):
+        """Cancel in-flight refills."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Pool counters and depth."""
+        return {
+            "keys": len(self._pools),
+            "ready": sum(len(pool) for pool in self._pools.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "generated": self.generated,
+            "expired": self.expired,
+            "failures": self.failures,
+        }
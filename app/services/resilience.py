@@ -0,0 +1,211 @@
+"""Failure handling for LLM calls: error classification, circuit breaking, hedging."""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+from google.api_core import exceptions as google_exceptions
+from app.core.deadline import TurnDeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Provider errors worth another attempt: overload, throttling, transient faults
+_RETRYABLE_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.Aborted,
+    google_exceptions.Unknown,
+    asyncio.TimeoutError,
+    ConnectionError,
+)
+
+
+class CircuitOpenError(Exception):
+    """Calls to a model are being short-circuited after repeated failures."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether an error is transient and the call may succeed if repeated.
+
+    Client errors (bad request, auth, blocked content, invalid output), an
+    open circuit and an exhausted turn deadline are permanent for this turn.
+    """
+    if isinstance(error, (CircuitOpenError, TurnDeadlineExceeded)):
+        return False
+    return isinstance(error, _RETRYABLE_ERRORS)
+
+
+class LatencyTracker:
+    """Rolling window of call latencies with cached percentiles."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._sorted: Optional[list] = None
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+        self._sorted = None
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency at ``fraction`` (e.g. 0.95), or None with no samples."""
+        if not self._samples:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        index = min(len(self._sorted) - 1, int(fraction * len(self._sorted)))
+        return self._sorted[index]
+
+    def clear(self):
+        self._samples.clear()
+        self._sorted = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open breaker for one model.
+
+    After ``failure_threshold`` consecutive transient failures the circuit
+    opens and calls fail fast for ``reset_seconds``. Then a single probe is
+    let through; its outcome closes the circuit or re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+        self.opened = 0
+
+    def check(self):
+        """
+        Admit a call or fail fast.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or a probe is already running)
+        """
+        if self.state == "closed":
+            return
+
+        if self.state == "open":
+            if self.is_open():
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuit open for {self.name}")
+            self.state = "half_open"
+
+        if self._probe_in_flight:
+            self.rejected += 1
+            raise CircuitOpenError(f"Circuit half-open for {self.name}, probe in flight")
+        self._probe_in_flight = True
+
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected without a probe."""
+        return self.state == "open" and time.monotonic() - self.opened_at < self.reset_seconds
+
+    def record_success(self):
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        if self.state != "closed":
+            logger.info(f"Circuit closed for {self.name}")
+        self.state = "closed"
+
+    def record_failure(self):
+        self._probe_in_flight = False
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Circuit opened for {self.name} after {self.consecutive_failures} failures")
+                self.opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def record_ignored(self):
+        """Release a probe slot for a call whose outcome says nothing about health."""
+        self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class Hedger:
+    """
+    Fire a backup call when the first one is slower than usual.
+
+    The backup starts once the first call has run longer than the observed
+    p95 (never earlier than ``min_delay``); whichever succeeds first wins
+    and the other is cancelled. Until ``min_samples`` latencies are known,
+    calls are not hedged.
+    """
+
+    def __init__(self, tracker: LatencyTracker, min_delay: float = 0.25, min_samples: int = 20):
+        self.tracker = tracker
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None if hedging is off for now."""
+        if len(self.tracker) < self.min_samples:
+            return None
+        return max(self.min_delay, self.tracker.percentile(0.95))
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Run ``call``, hedging it with a second invocation if it is slow."""
+        delay = self.delay()
+        if delay is None:
+            return await call()
+
+        first = asyncio.ensure_future(call())
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return first.result()
+
+            self.hedged += 1
+            backup = asyncio.ensure_future(call())
+            tasks.add(backup)
+
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "delay_seconds": self.delay(),
+        }
@@ -0,0 +1,18 @@
+# Code execution sandboxes
+from app.services.sandbox.base import (
+    ExecutionOutcome,
+    SandboxError,
+    SandboxLimits,
+    SandboxPool,
+    SandboxWorker
+)
+from app.services.sandbox.factory import build_sandbox_pool
+
+__all__ = [
+    "ExecutionOutcome",
+    "SandboxError",
+    "SandboxLimits",
+    "SandboxPool",
+    "SandboxWorker",
+    "build_sandbox_pool",
+]
@@ -0,0 +1,219 @@
+"""Sandbox worker interface and the warm worker pool."""
+import asyncio
+import contextvars
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+
+
+def parse_size(value: str) -> int:
+    """Docker-style size ("512m", "1g", "65536") to bytes."""
+    match = re.fullmatch(r"\s*(\d+)\s*([bkmg]?)b?\s*", str(value).lower())
+    if match is None:
+        raise ValueError(f"Invalid size: {value!r}")
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2)]
+
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    """Resource limits applied to every run."""
+    memory_bytes: int
+    cpus: float  # CPU share, e.g. docker_cpu_quota / 100000
+    pids: int
+    timeout_seconds: float
+    output_bytes: int
+    network_mode: str = "none"
+
+
+@dataclass
+class ExecutionOutcome:
+    """What one run of a submission produced."""
+    compiled: bool
+    exit_code: Optional[int]
+    stdout: str
+    stderr: str
+    runtime_ms: float
+    timed_out: bool = False
+    max_rss_kb: Optional[int] = None
+
+
+class SandboxError(RuntimeError):
+    """The sandbox itself failed (not the submitted code)."""
+
+
+class SandboxWorker(ABC):
+    """
+    One warm, isolated execution environment.
+
+    A worker runs one submission at a time. Between runs the pool calls
+    ``reset``, which must leave no files or processes from the previous run.
+    Raising ``SandboxError`` (or any other exception) from ``run`` or
+    ``reset`` marks the worker broken; the pool replaces it.
+    """
+
+    @abstractmethod
+    async def start(self) -> None:
+        """Bring the worker up (the slow part, done before it is needed)."""
+
+    @abstractmethod
+    async def run(self, code: str, stdin: str = "") -> ExecutionOutcome:
+        """Run a Python submission under the worker's limits."""
+
+    @abstractmethod
+    async def reset(self) -> None:
+        """Remove everything the last run left behind."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Tear the worker down."""
+
+
+class SandboxPool:
+    """
+    Fixed number of pre-warmed sandbox workers.
+
+    Workers are started up front, so a run only waits for an idle worker,
+    never for a cold start. After each run the worker is reset in the
+    background and returned to the pool; a worker that fails (or fails to
+    reset) is closed and replaced by a fresh one.
+    """
+
+    def __init__(self, factory: Callable[[], SandboxWorker], size: int, name: str = "sandbox"):
+        if size < 1:
+            raise ValueError("Sandbox pool size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self.name = name
+        self._idle: "asyncio.Queue[SandboxWorker]" = asyncio.Queue()
+        self._background: Set[asyncio.Task] = set()
+        self._closed = False
+        self.waiting = 0
+        self.in_use = 0
+        self.runs = 0
+        self.replaced = 0
+        self.start_failures = 0
+        self.warm_seconds: List[float] = []
+
+    async def start(self):
+        """Start every worker; fails if none could be started."""
+        results = await asyncio.gather(
+            *(self._spawn() for _ in range(self.size)),
+            return_exceptions=True
+        )
+        started = [worker for worker in results if isinstance(worker, SandboxWorker)]
+        for error in results:
+            if isinstance(error, BaseException):
+                logger.error(f"Could not start {self.name} worker: {error}")
+                self._in_background(self._respawn())
+        if not started:
+            raise SandboxError(f"No {self.name} worker could be started")
+        for worker in started:
+            self._idle.put_nowait(worker)
+        logger.info(f"{self.name} pool warm: {len(started)}/{self.size} workers")
+
+    async def _spawn(self) -> SandboxWorker:
+        worker = self.factory()
+        start = time.perf_counter()
+        await worker.start()
+        self.warm_seconds = (self.warm_seconds + [time.perf_counter() - start])[-50:]
+        return worker
+
+    @asynccontextmanager
+    async def worker(self) -> AsyncIterator[SandboxWorker]:
+        """Hold an idle worker for one run."""
+        if self._closed:
+            raise SandboxError(f"{self.name} pool is closed")
+        self.waiting += 1
+        try:
+            worker = await self._idle.get()
+        finally:
+            self.waiting -= 1
+
+        self.in_use += 1
+        self.runs += 1
+        healthy = False
+        try:
+            yield worker
+            healthy = True
+        finally:
+            self.in_use -= 1
+            # Reset off the caller's path; the result is already on its way
+            self._in_background(self._recycle(worker) if healthy else self._replace(worker))
+
+    async def _recycle(self, worker: SandboxWorker):
+        try:
+            await worker.reset()
+        except Exception as e:
+            logger.warning(f"{self.name} worker failed to reset, replacing it: {e}")
+            await self._replace(worker)
+            return
+        if self._closed:
+            await worker.close()
+        else:
+            self._idle.put_nowait(worker)
+
+    async def _replace(self, worker: SandboxWorker):
+        self.replaced += 1
+        try:
+            await worker.close()
+        except Exception as e:
+            logger.warning(f"Error closing {self.name} worker: {e}")
+        await self._respawn()
+
+    async def _respawn(self):
+        """Start a replacement worker, backing off while starts keep failing."""
+        delay = 0.5
+        while not self._closed:
+            try:
+                worker = await self._spawn()
+            except Exception as e:
+                self.start_failures += 1
+                logger.error(f"Could not start {self.name} worker, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+                continue
+            if self._closed:
+                await worker.close()
+            else:
+                self._idle.put_nowait(worker)
+            return
+
+    def _in_background(self, coro):
+        # Fresh context: pool upkeep is not part of the request that triggered it
+        task = asyncio.create_task(coro, context=contextvars.Context())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def close(self):
+        """Close idle workers; busy ones are closed as they come back."""
+        self._closed = True
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        while not self._idle.empty():
+            worker = self._idle.get_nowait()
+            try:
+                await worker.close()
+            except Exception as e:
+                logger.warning(f"Error closing {self.name} worker: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        warm = self.warm_seconds
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "runs": self.runs,
+            "replaced": self.replaced,
+            "start_failures": self.start_failures,
+            "warm_start_ms_avg": sum(warm) / len(warm) * 1000 if warm else 0.0,
+        }
@@ -0,0 +1,147 @@
+"""Docker sandbox backend: one warm, locked-down container per worker."""
+import asyncio
+import base64
+import time
+from typing import Optional
+import docker
+from docker.errors import DockerException
+from app.services.sandbox.base import ExecutionOutcome, SandboxError, SandboxLimits, SandboxWorker
+
+_WORKDIR = "/sandbox"
+_USER = "65534:65534"  # nobody
+_CPU_PERIOD = 100000
+
+# Exit code of the runner when the submission does not compile
+_COMPILE_FAILED = 86
+
+# Code and stdin arrive base64-encoded in the exec environment (the archive
+# API cannot write into the tmpfs workdir). Compiles first so a syntax error
+# is told apart from a failing run.
+_RUNNER = f"""\
+import base64, io, os, sys
+source = base64.b64decode(os.environ.pop("SANDBOX_CODE")).decode("utf-8")
+sys.stdin = io.StringIO(base64.b64decode(os.environ.pop("SANDBOX_STDIN")).decode("utf-8"))
+try:
+    code = compile(source, "main.py", "exec")
+except (SyntaxError, ValueError) as e:
+    import traceback
+    sys.stderr.write("".join(traceback.format_exception_only(type(e), e)))
+    sys.exit({_COMPILE_FAILED})
+exec(code, {{"__name__": "__main__", "__file__": "main.py"}})
+"""
+
+# Kill every process of the sandbox user except PID 1 (the container's sleep), then wipe the workdir
+_RESET = f"kill -9 -1 2>/dev/null; rm -rf {_WORKDIR}/* {_WORKDIR}/.[!.]* 2>/dev/null; true"
+
+
+class DockerSandboxWorker(SandboxWorker):
+    """
+    Runs submissions in a long-lived container started with the docker_* limits.
+
+    The container is created once (no network, read-only root, memory/CPU/
+    pids limits, all capabilities dropped, running as nobody) and idles on
+    ``sleep``; each run ``exec``s the code under ``timeout`` in a tmpfs
+    workdir. ``reset`` kills leftover processes and wipes the workdir, so
+    nothing carries over to the next candidate.
+    """
+
+    def __init__(self, client: "docker.DockerClient", image: str, limits: SandboxLimits):
+        self.client = client
+        self.image = image
+        self.limits = limits
+        self.container = None
+
+    async def start(self) -> None:
+        limits = self.limits
+        try:
+            self.container = await asyncio.to_thread(
+                self.client.containers.run,
+                self.image,
+                ["sleep", "infinity"],
+                detach=True,
+                auto_remove=True,
+                user=_USER,
+                working_dir=_WORKDIR,
+                network_mode=limits.network_mode,
+                mem_limit=limits.memory_bytes,
+                memswap_limit=limits.memory_bytes,
+                cpu_period=_CPU_PERIOD,
+                cpu_quota=int(limits.cpus * _CPU_PERIOD),
+                pids_limit=limits.pids,
+                read_only=True,
+                tmpfs={_WORKDIR: f"rw,nosuid,nodev,size={limits.output_bytes * 16 + 1024 * 1024},mode=1777"},
+                cap_drop=["ALL"],
+                security_opt=["no-new-privileges"],
+                labels={"app": "interview-sandbox"}
+            )
+        except DockerException as e:
+            raise SandboxError(f"Could not start sandbox container: {e}") from e
+
+    async def run(self, code: str, stdin: str = "") -> ExecutionOutcome:
+        return await asyncio.to_thread(self._run, code, stdin)
+
+    def _run(self, code: str, stdin: str) -> ExecutionOutcome:
+        limits = self.limits
+        api = self.client.api
+        stdout, stderr = bytearray(), bytearray()
+        try:
+            start = time.perf_counter()
+            exec_id = api.exec_create(
+                self.container.id,
+                ["timeout", "-s", "KILL", str(limits.timeout_seconds), "python", "-I", "-c", _RUNNER],
+                user=_USER,
+                workdir=_WORKDIR,
+                environment={"SANDBOX_CODE": _b64(code), "SANDBOX_STDIN": _b64(stdin)}
+            )["Id"]
+            # Streamed so a flood of output is never buffered past the cap; the rest is drained and dropped
+            for out, err in api.exec_start(exec_id, stream=True, demux=True):
+                _append_capped(stdout, out, limits.output_bytes)
+                _append_capped(stderr, err, limits.output_bytes)
+            runtime = time.perf_counter() - start
+            exit_code = api.exec_inspect(exec_id)["ExitCode"]
+        except DockerException as e:
+            raise SandboxError(f"Sandbox exec failed: {e}") from e
+
+        return ExecutionOutcome(
+            compiled=exit_code != _COMPILE_FAILED,
+            exit_code=exit_code,
+            stdout=_decode(stdout),
+            stderr=_decode(stderr),
+            runtime_ms=runtime * 1000,
+            # 128 + SIGKILL from timeout (the OOM killer exits the same way, but early)
+            timed_out=exit_code == 137 and runtime >= limits.timeout_seconds
+        )
+
+    async def reset(self) -> None:
+        await asyncio.to_thread(self._reset)
+
+    def _reset(self):
+        try:
+            self.container.exec_run(["sh", "-c", _RESET], user=_USER)
+            self.container.reload()
+        except DockerException as e:
+            raise SandboxError(f"Sandbox reset failed: {e}") from e
+        if self.container.status != "running":
+            raise SandboxError(f"Sandbox container is {self.container.status}")
+
+    async def close(self) -> None:
+        if self.container is None:
+            return
+        try:
+            await asyncio.to_thread(self.container.kill)
+        except DockerException:
+            # Already gone (auto_remove)
+            pass
+
+
+def _b64(text: str) -> str:
+    return base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+
+def _append_capped(buffer: bytearray, chunk: Optional[bytes], limit: int):
+    if chunk and len(buffer) < limit:
+        buffer += chunk[:limit - len(buffer)]
+
+
+def _decode(data: bytearray) -> str:
+    return data.decode("utf-8", errors="replace")
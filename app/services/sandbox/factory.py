@@ -0,0 +1,50 @@
+"""Sandbox pool construction from settings."""
+from app.config import settings
+from app.services.sandbox.base import SandboxLimits, SandboxPool, parse_size
+
+
+def sandbox_limits() -> SandboxLimits:
+    """Run limits from the docker_* and execution settings."""
+    return SandboxLimits(
+        memory_bytes=parse_size(settings.docker_mem_limit),
+        cpus=settings.docker_cpu_quota / 100000,
+        pids=settings.docker_pids_limit,
+        timeout_seconds=settings.execution_timeout,
+        output_bytes=settings.sandbox_output_limit_bytes,
+        network_mode=settings.docker_network_mode
+    )
+
+
+def build_sandbox_pool(backend: str = None) -> SandboxPool:
+    """
+    Build the configured sandbox pool (not started).
+
+    Args:
+        backend: "local" or "docker" (defaults to ``settings.sandbox_backend``)
+
+    Returns:
+        Sandbox pool of ``settings.sandbox_pool_size`` workers
+    """
+    backend = backend or settings.sandbox_backend
+    limits = sandbox_limits()
+
+    if backend == "local":
+        if not settings.sandbox_allow_local:
+            raise ValueError(
+                "The local sandbox runs candidate code on this host without filesystem isolation; "
+                "set sandbox_allow_local for development or use the docker backend"
+            )
+        from app.services.sandbox.local import LocalSandboxWorker
+        return SandboxPool(lambda: LocalSandboxWorker(limits), settings.sandbox_pool_size, name="sandbox-local")
+
+    if backend == "docker":
+        import docker
+        from app.services.sandbox.docker_sandbox import DockerSandboxWorker
+        client = docker.from_env()
+        return SandboxPool(
+            lambda: DockerSandboxWorker(client, settings.sandbox_docker_image, limits),
+            settings.sandbox_pool_size,
+            name="sandbox-docker"
+        )
+
+    raise ValueError(f"Unknown sandbox backend: {backend}")
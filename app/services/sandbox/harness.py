@@ -0,0 +1,123 @@
+"""Single-pass test harness, submitted to a sandbox as the program to run.
+
+Reads one JSON job on stdin: the candidate's code, the function to call,
+the test calls (arguments only) and a random per-run token. The code is
+compiled and executed once; each test then calls the function under its own
+timeout, in the same process. One line per event, prefixed with the token,
+is written to stdout as it happens:
+
+    <token> {"event": "compiled", "ok": true}
+    <token> {"event": "test", "name": "...", "value": [0, 1], "runtime_ms": 0.1, "error": null}
+    <token> {"event": "done"}
+
+The harness never sees expected results and never decides whether a test
+passed: the executor compares the reported values outside the sandbox. The
+candidate's code shares this process, so it can reach the token and
+``emit`` (frames, gc) and write events of its own. The executor accepts
+only the exact sequence above, one event per test in suite order, and fails
+the whole run on anything else. A forger can at most report return values
+it computed itself. What the candidate prints goes to a buffer that is
+dropped. If the sandbox kills the run, the events written so far still tell
+which tests ran. Standard library only.
+"""
+import io
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+
+# Longest error message reported per test
+_MAX_ERROR_CHARS = 500
+
+
+class _TestTimeout(BaseException):
+    """Raised in the candidate's code when a test runs out of time (not catchable as Exception)."""
+
+
+def _on_alarm(signum, frame):
+    raise _TestTimeout()
+
+
+def _normalize(value):
+    """Candidate return value as JSON would see it (tuples become lists, keys strings)."""
+    return json.loads(json.dumps(value, default=repr))
+
+
+def _error_text(error: BaseException) -> str:
+    # Drop the harness's own frame
+    text = "".join(traceback.format_exception(type(error), error, error.__traceback__.tb_next))
+    return text[-_MAX_ERROR_CHARS:]
+
+
+def main():
+    job = json.load(sys.stdin)
+    prefix = job.pop("token") + " "
+    events = os.fdopen(os.dup(1), "w", buffering=1)
+
+    def emit(**event):
+        events.write(prefix + json.dumps(event) + "\n")
+
+    with open("main.py", "w") as f:
+        f.write(job["code"])
+    try:
+        code = compile(job["code"], "main.py", "exec")
+    except (SyntaxError, ValueError) as e:
+        emit(event="compiled", ok=False, error="".join(traceback.format_exception_only(type(e), e)))
+        return
+
+    tests = job["tests"]
+    timeout = job["timeout"]
+    signal.signal(signal.SIGALRM, _on_alarm)
+
+    namespace = {"__name__": "__main__", "__file__": "main.py"}
+    sys.stdout = io.StringIO()
+    try:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        exec(code, namespace)
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    except _TestTimeout:
+        emit(event="compiled", ok=True, error=f"Module code exceeded the {timeout:g}s time limit")
+        return
+    except BaseException as e:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        emit(event="compiled", ok=True, error=_error_text(e))
+        return
+    emit(event="compiled", ok=True)
+
+    function = namespace.get(job["function"])
+    if not callable(function):
+        emit(event="done", error=f"Function {job['function']}() is not defined")
+        return
+
+    for test in tests:
+        sys.stdout = io.StringIO()
+        value = error = None
+        start = time.perf_counter()
+        try:
+            signal.setitimer(signal.ITIMER_REAL, test.get("timeout", timeout))
+            try:
+                value = function(*test.get("args", []), **test.get("kwargs", {}))
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+            elapsed = time.perf_counter() - start
+            value = _normalize(value)
+        except _TestTimeout:
+            elapsed = time.perf_counter() - start
+            value = None
+            error = f"Time limit exceeded ({test.get('timeout', timeout):g}s)"
+        except BaseException as e:
+            elapsed = time.perf_counter() - start
+            value = None
+            error = _error_text(e)
+
+        emit(event="test", name=test["name"], value=value, runtime_ms=round(elapsed * 1000, 3), error=error)
+        if error is not None and job.get("stop_on_error"):
+            break
+
+    emit(event="done")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Local sandbox backend: a pre-forked zygote process per worker."""
+import asyncio
+import json
+import math
+import os
+import sys
+from typing import Any, Dict, Optional
+from app.services.sandbox.base import ExecutionOutcome, SandboxError, SandboxLimits, SandboxWorker
+
+_ZYGOTE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zygote.py")
+
+# The zygote and its children get only this environment, never the API's (keys, URLs)
+_ZYGOTE_ENV = {"PATH": os.defpath, "LANG": "C.UTF-8"}
+
+# Replies carry up to two outputs of output_bytes each, JSON-escaped
+_REPLY_BUFFER_BYTES = 8 * 1024 * 1024
+
+# Allowance on top of the run timeout for forking and reporting back
+_PROTOCOL_GRACE_SECONDS = 2.0
+
+
+class LocalSandboxWorker(SandboxWorker):
+    """
+    Runs submissions in rlimited children of a warm zygote process.
+
+    The zygote (``zygote.py``) is a bare interpreter that has already paid
+    its startup cost; each run forks a child with memory (RLIMIT_AS), CPU
+    time, process count and file size limits, a fresh working directory,
+    its own process group and, where permitted, an empty network namespace.
+    This needs no Docker daemon, but it is not a security boundary against
+    hostile code (no filesystem or user isolation: submissions can read
+    whatever the API's user can), so the factory refuses it unless
+    ``sandbox_allow_local`` is set. Use the Docker backend in production.
+    """
+
+    def __init__(self, limits: SandboxLimits):
+        self.limits = limits
+        self._process: Optional[asyncio.subprocess.Process] = None
+
+    async def start(self) -> None:
+        self._process = await asyncio.create_subprocess_exec(
+            sys.executable, "-I", _ZYGOTE,
+            env=_ZYGOTE_ENV,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=_REPLY_BUFFER_BYTES
+        )
+        await self._request({"ping": True}, timeout=10.0)
+
+    async def run(self, code: str, stdin: str = "") -> ExecutionOutcome:
+        limits = self.limits
+        reply = await self._request(
+            {
+                "code": code,
+                "stdin": stdin,
+                "timeout": limits.timeout_seconds,
+                "limits": {
+                    "memory_bytes": limits.memory_bytes,
+                    # rlimits cannot express a CPU share; cap CPU time at the share of the timeout
+                    "cpu_seconds": max(1, math.ceil(limits.timeout_seconds * limits.cpus)),
+                    "pids": limits.pids,
+                    "output_bytes": limits.output_bytes,
+                    "file_bytes": limits.output_bytes * 16,
+                    "network_mode": limits.network_mode,
+                },
+            },
+            timeout=limits.timeout_seconds + _PROTOCOL_GRACE_SECONDS
+        )
+        if "error" in reply:
+            raise SandboxError(f"Zygote failed: {reply['error']}")
+        return ExecutionOutcome(
+            compiled=reply["compiled"],
+            exit_code=reply["exit_code"],
+            stdout=reply["stdout"],
+            stderr=reply["stderr"],
+            runtime_ms=reply["runtime_ms"],
+            timed_out=reply["timed_out"],
+            max_rss_kb=reply["max_rss_kb"]
+        )
+
+    async def reset(self) -> None:
+        # Each run already gets a fresh directory and process group; check the zygote survived it
+        await self._request({"ping": True}, timeout=_PROTOCOL_GRACE_SECONDS)
+
+    async def _request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        process = self._process
+        if process is None or process.returncode is not None:
+            raise SandboxError("Zygote is not running")
+        try:
+            process.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+            await process.stdin.drain()
+            line = await asyncio.wait_for(process.stdout.readline(), timeout)
+        except (asyncio.TimeoutError, ConnectionError, ValueError) as e:
+            raise SandboxError(f"Zygote did not answer: {e!r}") from e
+        if not line:
+            raise SandboxError("Zygote exited")
+        return json.loads(line)
+
+    async def close(self) -> None:
+        process = self._process
+        if process is None or process.returncode is not None:
+            return
+        process.kill()
+        await process.wait()
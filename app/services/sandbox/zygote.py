@@ -0,0 +1,187 @@
+"""Pre-forked sandbox process: forks one rlimited child per submission.
+
+Started as ``python -I zygote.py`` by ``LocalSandboxWorker``. Reads one JSON
+job per line on stdin and writes one JSON result per line on stdout. The
+zygote never runs submitted code itself, so it stays clean between runs;
+each child gets a fresh working directory, its own process group (killed
+as a whole afterwards) and, where the kernel allows, its own network
+namespace. Standard library only: the warm process must not import the app.
+"""
+import ctypes
+import json
+import os
+import resource
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+_CLONE_NEWUSER = 0x10000000
+_CLONE_NEWNET = 0x40000000
+
+
+def _set_limit(kind: int, value: int):
+    try:
+        resource.setrlimit(kind, (value, value))
+    except (ValueError, OSError):
+        # Cannot raise a hard limit above the zygote's own; keep the lower one
+        pass
+
+
+def _unshare_network() -> bool:
+    """Move into an empty network namespace (no interfaces up); False if not permitted."""
+    libc = ctypes.CDLL(None, use_errno=True)
+    # Root can unshare the network directly; others need a user namespace too
+    for flags in (_CLONE_NEWNET, _CLONE_NEWUSER | _CLONE_NEWNET):
+        if libc.unshare(flags) == 0:
+            return True
+    return False
+
+
+def _child(job: dict, workdir: str, status_fd: int):
+    """Runs in the forked child; never returns."""
+    os.setsid()
+    os.chdir(workdir)
+
+    limits = job["limits"]
+    if limits["network_mode"] == "none":
+        _unshare_network()
+    _set_limit(resource.RLIMIT_AS, limits["memory_bytes"])
+    _set_limit(resource.RLIMIT_CPU, limits["cpu_seconds"])
+    # Counted per user, and not enforced for root
+    _set_limit(resource.RLIMIT_NPROC, limits["pids"])
+    # Output beyond this fails to write (EFBIG); only output_bytes of it is read back
+    _set_limit(resource.RLIMIT_FSIZE, limits["file_bytes"])
+    _set_limit(resource.RLIMIT_CORE, 0)
+
+    for fd, name, flags in (
+        (0, "stdin.txt", os.O_RDONLY),
+        (1, "stdout.txt", os.O_WRONLY | os.O_CREAT | os.O_TRUNC),
+        (2, "stderr.txt", os.O_WRONLY | os.O_CREAT | os.O_TRUNC),
+    ):
+        target = os.open(name, flags, 0o600)
+        os.dup2(target, fd)
+        os.close(target)
+    # The zygote's stdin buffer may hold the next job; never let the child see it
+    sys.stdin = open(0, "r", closefd=False)
+    sys.stdout = open(1, "w", closefd=False)
+    sys.stderr = open(2, "w", closefd=False)
+
+    status = 1
+    try:
+        source = job["code"]
+        try:
+            code = compile(source, "main.py", "exec")
+        except (SyntaxError, ValueError) as e:
+            sys.stderr.write("".join(traceback.format_exception_only(type(e), e)))
+            return
+        os.write(status_fd, b"c")
+        os.close(status_fd)
+
+        try:
+            exec(code, {"__name__": "__main__", "__file__": "main.py", "__builtins__": __builtins__})
+            status = 0
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException as e:
+            # Drop the zygote's own frame from the traceback
+            sys.stderr.write("".join(traceback.format_exception(type(e), e, e.__traceback__.tb_next)))
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(status)
+
+
+def _read(path: str, limit: int) -> str:
+    try:
+        with open(path, "rb") as f:
+            return f.read(limit).decode("utf-8", errors="replace")
+    except OSError:
+        return ""
+
+
+def _kill_group(pid: int):
+    for kill in (os.killpg, os.kill):
+        try:
+            kill(pid, signal.SIGKILL)
+            return
+        except (ProcessLookupError, PermissionError):
+            continue
+
+
+def run_job(job: dict) -> dict:
+    limits = job["limits"]
+    workdir = tempfile.mkdtemp(prefix="sandbox-")
+    try:
+        # On disk as well, so tracebacks can show the offending lines
+        with open(os.path.join(workdir, "main.py"), "w") as f:
+            f.write(job["code"])
+        with open(os.path.join(workdir, "stdin.txt"), "w") as f:
+            f.write(job.get("stdin", ""))
+        status_r, status_w = os.pipe()
+
+        sys.stdout.flush()
+        killed = threading.Event()
+        start = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(status_r)
+                _child(job, workdir, status_w)
+            finally:
+                os._exit(127)
+        os.close(status_w)
+
+        def on_timeout():
+            killed.set()
+            _kill_group(pid)
+
+        timer = threading.Timer(job["timeout"], on_timeout)
+        timer.start()
+        _, wait_status, usage = os.wait4(pid, 0)
+        runtime = time.perf_counter() - start
+        timer.cancel()
+        # No thread may be alive at the next fork
+        timer.join()
+        # Reap anything the submission left running in its process group
+        _kill_group(pid)
+
+        compiled = os.read(status_r, 1) == b"c"
+        os.close(status_r)
+
+        exit_code = os.waitstatus_to_exitcode(wait_status)
+        timed_out = killed.is_set() or exit_code == -signal.SIGXCPU
+        return {
+            "compiled": compiled,
+            "exit_code": exit_code,
+            "timed_out": timed_out,
+            "runtime_ms": runtime * 1000,
+            "max_rss_kb": usage.ru_maxrss,
+            "stdout": _read(os.path.join(workdir, "stdout.txt"), limits["output_bytes"]),
+            "stderr": _read(os.path.join(workdir, "stderr.txt"), limits["output_bytes"]),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    for line in sys.stdin:
+        job = json.loads(line)
+        if job.get("ping"):
+            reply = {"ok": True}
+        else:
+            try:
+                reply = run_job(job)
+            except Exception as e:
+                reply = {"error": f"{type(e).__name__}: {e}"}
+        sys.stdout.write(json.dumps(reply) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Silence nudges and phase time limits for every live interview, on one timer wheel."""
+import asyncio
+import contextvars
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set
+from uuid import UUID
+from app.config import settings
+from app.core.locks import interview_locks
+from app.core.sessions import session_registry
+from app.core.state_manager import InterviewState, get_interview_state, update_interview_state
+from app.core.timer_wheel import TimerWheel
+
+logger = logging.getLogger(__name__)
+
+_NUDGES = {
+    "theory": "Take your time. Would you like me to rephrase the question?",
+    "coding": "How is it going? Feel free to think out loud.",
+}
+
+_THEORY_TIME_UP = "We're out of time for this part. Let's move on to the coding problem."
+_CODING_TIME_UP = "That's all the time we have. Thank you for your time today."
+
+
+def _epoch(value: datetime) -> float:
+    """Stored datetimes are naive UTC."""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class SessionTimers:
+    """
+    Per-worker scheduler for interview timeouts.
+
+    Two timers per interview live on a single ``TimerWheel`` driven by one
+    task, instead of a sleeping task per interview:
+
+    - ``silence``: restarted by every transcript message. When it fires and
+      the candidate has an open WebSocket session, the interviewer nudges
+      them (at most ``silence_max_nudges`` times per silence).
+    - ``phase``: set when a phase starts. Theory running over its limit
+      moves the interview on to coding; coding over its limit completes it.
+
+    State changes reach the wheel through a state listener, so restarting a
+    timer on ``add_message`` is one dict update. When a timer fires, the
+    state is re-read under the interview lock and the timer is moved instead
+    if another worker has seen newer activity.
+    """
+
+    def __init__(self, tick_seconds: float = 0.5, max_concurrent_callbacks: int = 32):
+        self.wheel = TimerWheel(tick_seconds, now=time.time())
+        self.nudges = 0
+        self.phase_timeouts = 0
+        self._callbacks = asyncio.Semaphore(max_concurrent_callbacks)
+        self._running: Set[asyncio.Task] = set()
+        self._driver: Optional[asyncio.Task] = None
+
+    # Scheduling
+
+    def on_state_change(self, state: InterviewState, event: str) -> None:
+        """State listener: restart the silence timer, or set the phase timer."""
+        if state.current_phase == "complete":
+            self.wheel.cancel((state.interview_id, "silence"))
+            self.wheel.cancel((state.interview_id, "phase"))
+        elif event == "message":
+            self._schedule_silence(state, time.time(), nudges=0)
+            if (state.interview_id, "phase") not in self.wheel:
+                # First activity seen by this worker (new interview, or after a restart)
+                self._schedule_phase(state)
+        elif event == "phase":
+            self._schedule_phase(state)
+
+    def _silence_seconds(self, state: InterviewState) -> float:
+        if state.current_phase == "coding" and state.coding_mode == "silent":
+            return settings.silent_coding_nudge_seconds
+        return settings.silence_nudge_seconds
+
+    def _schedule_silence(self, state: InterviewState, since: float, nudges: int):
+        delay = self._silence_seconds(state)
+        self.wheel.schedule((state.interview_id, "silence"), since + delay, (delay, nudges))
+
+    def _schedule_phase(self, state: InterviewState):
+        phase = state.current_phase
+        limit = {
+            "theory": settings.theory_time_limit_seconds,
+            "coding": settings.coding_time_limit_seconds,
+        }.get(phase)
+        started = state.phase_start_times.get(phase)
+        if limit is None or started is None:
+            self.wheel.cancel((state.interview_id, "phase"))
+            return
+        self.wheel.schedule((state.interview_id, "phase"), _epoch(started) + limit, phase)
+
+    # Firing
+
+    def start(self) -> None:
+        # Fresh context: the driver must not inherit a request's deadline or timer
+        self._driver = asyncio.create_task(self._drive(), name="session-timers", context=contextvars.Context())
+
+    async def _drive(self):
+        while True:
+            await asyncio.sleep(self.wheel.tick_seconds)
+            for (interview_id, kind), payload in self.wheel.advance(time.time()):
+                task = asyncio.create_task(self._fire(interview_id, kind, payload))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _fire(self, interview_id: UUID, kind: str, payload):
+        async with self._callbacks:
+            try:
+                if kind == "silence":
+                    await self._on_silence(interview_id, *payload)
+                else:
+                    await self._on_phase_timeout(interview_id, payload)
+            except Exception as e:
+                logger.error(f"{kind} timer failed for {interview_id}: {e}", exc_info=True)
+
+    async def _on_silence(self, interview_id: UUID, delay: float, nudges: int):
+        if interview_id not in session_registry:
+            return  # Nobody to nudge; the next message restarts the timer
+        async with interview_locks.hold(interview_id):
+            state = await get_interview_state(interview_id)
+            if state is None or state.current_phase == "complete" or not state.transcript:
+                return
+            last_message = state.transcript.timestamp_at(-1)
+            if last_message + delay > time.time() + self.wheel.tick_seconds:
+                # Newer activity than this timer knew about (e.g. handled by another worker)
+                self._schedule_silence(state, last_message, nudges)
+                return
+
+            speech = _NUDGES[state.current_phase]
+            state.silence_duration += delay
+            state.add_message("assistant", speech)
+            await update_interview_state(state)
+            self.nudges += 1
+            if nudges + 1 < settings.silence_max_nudges:
+                # Overrides the restart add_message just triggered
+                self._schedule_silence(state, time.time(), nudges + 1)
+            else:
+                self.wheel.cancel((interview_id, "silence"))
+        session_registry.send(interview_id, {"type": "nudge", "speech": speech})
+
+    async def _on_phase_timeout(self, interview_id: UUID, phase: str):
+        async with interview_locks.hold(interview_id):
+            state = await get_interview_state(interview_id)
+            if state is None or state.current_phase != phase:
+                return
+            started = state.phase_start_times.get(phase)
+            limit = settings.theory_time_limit_seconds if phase == "theory" else settings.coding_time_limit_seconds
+            if started is None or limit is None:
+                return
+            if _epoch(started) + limit > time.time() + self.wheel.tick_seconds:
+                self._schedule_phase(state)
+                return
+
+            if phase == "theory":
+                state.enter_phase("coding")
+                speech = _THEORY_TIME_UP
+            else:
+                state.enter_phase("complete")
+                speech = _CODING_TIME_UP
+            state.add_message("assistant", speech)
+            await update_interview_state(state)
+            self.phase_timeouts += 1
+
+        session_registry.send(interview_id, {"type": "phase", "current_phase": state.current_phase, "speech": speech})
+        if state.current_phase == "complete":
+            session_registry.send(interview_id, {"type": "complete"})
+
+    async def close(self) -> None:
+        """Stop the driver and any callbacks still running."""
+        tasks = list(self._running)
+        if self._driver is not None:
+            tasks.append(self._driver)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self.wheel.stats(),
+            "running": len(self._running),
+            "nudges": self.nudges,
+            "phase_timeouts": self.phase_timeouts,
+        }
@@ -0,0 +1,592 @@
+"""Asynchronous code submissions: quotas, dedupe, background execution, long-polling."""
+import asyncio
+import contextvars
+import hashlib
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from uuid import UUID, uuid4
+import redis.asyncio as redis
+from pydantic import BaseModel
+from app.config import settings
+from app.core.locks import interview_locks
+from app.core.sessions import session_registry
+from app.core.state_manager import CodeResult, get_interview_state, update_interview_state
+
+logger = logging.getLogger(__name__)
+
+# Long-polls re-read the store this often, for results finished by another process
+_POLL_SECONDS = 0.25
+
+# Celery results are checked this often
+_CELERY_POLL_SECONDS = 0.2
+
+
+class QuotaExceeded(Exception):
+    """The interview has used all of its ``max_runs_per_interview`` runs."""
+
+
+class SubmissionRecord(BaseModel):
+    """A queued, running or finished code submission."""
+    submission_id: UUID
+    interview_id: UUID
+    status: Literal["queued", "running", "complete", "failed"]
+    content_hash: str
+    language: str
+    problem_id: Optional[str] = None
+    result: Optional[CodeResult] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("complete", "failed")
+
+
+def content_hash(code: str, language: str, problem_id: Optional[str]) -> str:
+    """Identity of a submission for dedupe: same code, language and problem."""
+    return hashlib.sha256(f"{language}\0{problem_id or ''}\0{code}".encode("utf-8")).hexdigest()
+
+
+class SubmissionStore(ABC):
+    """
+    Submission records plus the per-interview run quota and dedupe index.
+
+    ``reserve`` is the single atomic step that either finds an identical
+    earlier submission, refuses a run over quota, or counts a new run and
+    stores its record. A dedupe entry therefore never exists without its
+    record; a missing record means it expired.
+    """
+
+    @abstractmethod
+    async def reserve(self, record: SubmissionRecord, limit: int) -> Tuple[str, Optional[UUID]]:
+        """
+        Claim a run for a new submission's content and store its record.
+
+        Returns:
+            ("new", None), ("duplicate", earlier submission ID) or ("quota", None)
+        """
+
+    @abstractmethod
+    async def release(self, interview_id: UUID, digest: str, submission_id: UUID) -> None:
+        """
+        Give back a run and forget its content, if the content still maps to ``submission_id``.
+
+        Used when the run failed to execute or the record expired; the
+        submission ID check keeps a stale caller from releasing a newer claim.
+        """
+
+    @abstractmethod
+    async def get(self, submission_id: UUID) -> Optional[SubmissionRecord]:
+        """Submission by ID, or None if unknown or expired."""
+
+    @abstractmethod
+    async def put(self, record: SubmissionRecord) -> None:
+        """Store a new or updated submission."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class InMemorySubmissionStore(SubmissionStore):
+    """Process-local submissions (single API worker); entries expire after ``ttl_seconds`` (None = never)."""
+
+    def __init__(self, ttl_seconds: Optional[float]):
+        self.ttl_seconds = ttl_seconds
+        self._records: "OrderedDict[UUID, Tuple[float, SubmissionRecord]]" = OrderedDict()
+        # interview -> (last touched, runs used, content hash -> submission)
+        self._interviews: "OrderedDict[UUID, Tuple[float, int, Dict[str, UUID]]]" = OrderedDict()
+
+    async def reserve(self, record, limit):
+        self._expire()
+        interview_id, digest = record.interview_id, record.content_hash
+        _, runs, hashes = self._interviews.pop(interview_id, (0.0, 0, {}))
+        existing = hashes.get(digest)
+        if existing is not None:
+            outcome = ("duplicate", existing)
+        elif runs >= limit:
+            outcome = ("quota", None)
+        else:
+            runs += 1
+            hashes[digest] = record.submission_id
+            await self.put(record)
+            outcome = ("new", None)
+        self._interviews[interview_id] = (time.monotonic(), runs, hashes)
+        return outcome
+
+    async def release(self, interview_id, digest, submission_id):
+        entry = self._interviews.get(interview_id)
+        if entry is not None and entry[2].get(digest) == submission_id:
+            del entry[2][digest]
+            self._interviews[interview_id] = (entry[0], entry[1] - 1, entry[2])
+
+    async def get(self, submission_id):
+        entry = self._records.get(submission_id)
+        return entry[1] if entry is not None else None
+
+    async def put(self, record):
+        self._records.pop(record.submission_id, None)
+        self._records[record.submission_id] = (time.monotonic(), record)
+
+    def _expire(self):
+        if self.ttl_seconds is None:
+            return
+        # Both dicts are in last-touched order, so expired entries are at the front
+        cutoff = time.monotonic() - self.ttl_seconds
+        for entries in (self._records, self._interviews):
+            while entries:
+                key, entry = next(iter(entries.items()))
+                if entry[0] > cutoff:
+                    break
+                del entries[key]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class RedisSubmissionStore(SubmissionStore):
+    """
+    Submissions in Redis, shared by every API worker and Celery worker.
+
+    Keys per interview: ``{prefix}:{id}:runs`` (run counter) and
+    ``{prefix}:{id}:code_hashes`` (hash of content -> submission). Records
+    are JSON strings under ``{prefix}:submission:{id}``. Claims and
+    releases are optimistic transactions (WATCH / MULTI) over the
+    interview's keys, retried when a concurrent submit changes them.
+    """
+
+    def __init__(self, client: "redis.Redis", prefix: str = None, ttl_seconds: Optional[int] = None):
+        self.client = client
+        self.prefix = prefix or settings.redis_state_prefix
+        self.ttl_seconds = ttl_seconds
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisSubmissionStore":
+        """Create a store with a pooled client for the given Redis URL."""
+        return cls(
+            redis.Redis.from_url(url, decode_responses=True),
+            ttl_seconds=settings.submission_ttl_seconds
+        )
+
+    def _keys(self, interview_id: UUID) -> Tuple[str, str]:
+        base = f"{self.prefix}:{interview_id}"
+        return f"{base}:runs", f"{base}:code_hashes"
+
+    def _record_key(self, submission_id: UUID) -> str:
+        return f"{self.prefix}:submission:{submission_id}"
+
+    async def reserve(self, record, limit):
+        runs_key, hashes_key = self._keys(record.interview_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(runs_key, hashes_key)
+                    existing = await pipe.hget(hashes_key, record.content_hash)
+                    if existing:
+                        return "duplicate", UUID(existing)
+                    if int(await pipe.get(runs_key) or 0) >= limit:
+                        return "quota", None
+
+                    pipe.multi()
+                    pipe.hset(hashes_key, record.content_hash, str(record.submission_id))
+                    pipe.incr(runs_key)
+                    pipe.set(self._record_key(record.submission_id), record.model_dump_json(), ex=self.ttl_seconds)
+                    if self.ttl_seconds:
+                        pipe.expire(runs_key, self.ttl_seconds)
+                        pipe.expire(hashes_key, self.ttl_seconds)
+                    await pipe.execute()
+                    return "new", None
+                except redis.WatchError:
+                    continue
+
+    async def release(self, interview_id, digest, submission_id):
+        runs_key, hashes_key = self._keys(interview_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(hashes_key)
+                    if await pipe.hget(hashes_key, digest) != str(submission_id):
+                        return
+                    pipe.multi()
+                    pipe.hdel(hashes_key, digest)
+                    pipe.decr(runs_key)
+                    await pipe.execute()
+                    return
+                except redis.WatchError:
+                    continue
+
+    async def get(self, submission_id):
+        value = await self.client.get(self._record_key(submission_id))
+        return SubmissionRecord.model_validate_json(value) if value is not None else None
+
+    async def put(self, record):
+        await self.client.set(
+            self._record_key(record.submission_id),
+            record.model_dump_json(),
+            ex=self.ttl_seconds
+        )
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def build_submission_store(backend: str = None) -> SubmissionStore:
+    """
+    Build the configured submission store.
+
+    Args:
+        backend: "memory" or "redis" (defaults to ``settings.submission_store_backend``)
+
+    Returns:
+        Submission store instance
+    """
+    backend = backend or settings.submission_store_backend
+    if backend == "memory":
+        return InMemorySubmissionStore(settings.submission_ttl_seconds)
+    if backend == "redis":
+        return RedisSubmissionStore.from_url(settings.redis_url)
+    raise ValueError(f"Unknown submission store backend: {backend}")
+
+
+async def execute_submission(executor, job: Dict[str, Any]) -> CodeResult:
+    """
+    Run one submission job: the problem's test suite, or the plain program.
+
+    Args:
+        executor: CodeExecutor
+        job: ``submission_id``, ``code``, ``language`` and ``problem_id``
+
+    Returns:
+        CodeResult carrying the submission's ID
+    """
+    from app.core.problems import problem_registry
+
+    problem = problem_registry.get(job["problem_id"]) if job.get("problem_id") else None
+    if problem is not None:
+        result = await executor.run_tests(job["code"], problem, language=job["language"])
+    else:
+        result = await executor.run(job["code"], language=job["language"])
+    return result.model_copy(update={"submission_id": UUID(job["submission_id"])})
+
+
+class SubmissionQueue(ABC):
+    """
+    Accepts code submissions and runs them off the request path.
+
+    ``submit`` returns as soon as the run is queued. Identical code resent
+    for the same interview (and problem) gets the earlier submission back,
+    finished or not, without using another run. Runs that could not execute
+    (sandbox or broker failure) are not charged against the quota.
+    """
+
+    def __init__(self, store: SubmissionStore):
+        self.store = store
+        self.submitted = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        # Long-poll wakeups, dropped when the run finishes or the last waiter leaves
+        self._events: Dict[UUID, asyncio.Event] = {}
+        self._waiters: Dict[UUID, int] = {}
+
+    async def submit(
+        self,
+        interview_id: UUID,
+        code: str,
+        language: str,
+        problem_id: Optional[str] = None
+    ) -> Tuple[SubmissionRecord, bool]:
+        """
+        Queue a run of a submission.
+
+        Args:
+            interview_id: Interview the submission belongs to
+            code: Submitted source code
+            language: Submission language
+            problem_id: Coding problem whose tests to run, if any
+
+        Returns:
+            The submission and whether it is an earlier identical one
+
+        Raises:
+            QuotaExceeded: If the interview has no runs left
+        """
+        record = SubmissionRecord(
+            submission_id=uuid4(),
+            interview_id=interview_id,
+            status="queued",
+            content_hash=content_hash(code, language, problem_id),
+            language=language,
+            problem_id=problem_id,
+            created_at=datetime.utcnow()
+        )
+        for _ in range(2):
+            outcome, existing = await self.store.reserve(record, settings.max_runs_per_interview)
+            if outcome != "duplicate":
+                break
+            earlier = await self.store.get(existing)
+            if earlier is not None:
+                self.deduplicated += 1
+                return earlier, True
+            # The earlier record expired; forget it (unless reclaimed meanwhile) and count a new run
+            await self.store.release(interview_id, record.content_hash, existing)
+
+        if outcome != "new":
+            self.rejected += 1
+            raise QuotaExceeded(f"Interview {interview_id} has used its {settings.max_runs_per_interview} runs")
+
+        self.submitted += 1
+        job = {
+            "submission_id": str(record.submission_id),
+            "code": code,
+            "language": language,
+            "problem_id": problem_id,
+        }
+        try:
+            await self._dispatch(record, job)
+        except Exception as e:
+            logger.error(f"Could not queue submission {record.submission_id}: {e}", exc_info=True)
+            await self._fail(record, "Could not queue the run, please try again")
+        return record, False
+
+    @abstractmethod
+    async def _dispatch(self, record: SubmissionRecord, job: Dict[str, Any]) -> None:
+        """Hand a queued submission to the backend."""
+
+    async def get(self, submission_id: UUID) -> Optional[SubmissionRecord]:
+        return await self.store.get(submission_id)
+
+    async def wait(self, submission_id: UUID, timeout: float) -> Optional[SubmissionRecord]:
+        """
+        Long-poll a submission until it finishes or ``timeout`` passes.
+
+        Returns:
+            The latest record (possibly still queued or running), or None if unknown
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        self._waiters[submission_id] = self._waiters.get(submission_id, 0) + 1
+        try:
+            while True:
+                record = await self.store.get(submission_id)
+                left = deadline - loop.time()
+                if record is None or record.finished or left <= 0:
+                    return record
+                event = self._events.setdefault(submission_id, asyncio.Event())
+                try:
+                    await asyncio.wait_for(event.wait(), min(left, _POLL_SECONDS))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # A run that never finishes (or expires first) must not keep its event
+            waiters = self._waiters.pop(submission_id) - 1
+            if waiters:
+                self._waiters[submission_id] = waiters
+            else:
+                self._events.pop(submission_id, None)
+
+    async def _running(self, record: SubmissionRecord):
+        record.status = "running"
+        await self.store.put(record)
+
+    async def _complete(self, record: SubmissionRecord, result: CodeResult):
+        record.status = "complete"
+        record.result = result
+        record.finished_at = datetime.utcnow()
+        await self.store.put(record)
+        self.completed += 1
+        self._notify(record)
+
+        # The judge reads code submissions from the interview state
+        async with interview_locks.hold(record.interview_id):
+            state = await get_interview_state(record.interview_id)
+            if state is not None:
+                state.add_code_submission(result)
+                await update_interview_state(state)
+
+    async def _fail(self, record: SubmissionRecord, error: str):
+        record.status = "failed"
+        record.error = error
+        record.finished_at = datetime.utcnow()
+        await self.store.put(record)
+        await self.store.release(record.interview_id, record.content_hash, record.submission_id)
+        self.failed += 1
+        self._notify(record)
+
+    def _notify(self, record: SubmissionRecord):
+        event = self._events.pop(record.submission_id, None)
+        if event is not None:
+            event.set()
+        # Candidates with an open session get the result without polling
+        session_registry.send(record.interview_id, {
+            "type": "submission",
+            **record.model_dump(mode="json", exclude={"content_hash"}),
+        })
+
+    def start(self) -> None:
+        """Start background work."""
+
+    async def close(self) -> None:
+        """Stop background work and release the store."""
+        await self.store.close()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+            "waiters": len(self._events),
+        }
+
+
+class AsyncioSubmissionQueue(SubmissionQueue):
+    """
+    Runs submissions in this process: worker tasks feed the warm sandbox pool.
+
+    The event loop only waits on the sandbox, so runs never block request
+    handling; ``workers`` bounds how many run at once (match the pool size).
+    """
+
+    def __init__(self, store: SubmissionStore, executor, workers: int = 4):
+        super().__init__(store)
+        self.executor = executor
+        self.workers = workers
+        self._queue: "asyncio.Queue[Tuple[SubmissionRecord, Dict[str, Any]]]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+    async def _dispatch(self, record, job):
+        self._queue.put_nowait((record, job))
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            # Fresh context: workers must not inherit a request's deadline or timer
+            self._tasks.append(asyncio.create_task(
+                self._work(),
+                name=f"submission-worker-{index}",
+                context=contextvars.Context()
+            ))
+
+    async def _work(self):
+        while True:
+            record, job = await self._queue.get()
+            try:
+                await self._running(record)
+                result = await execute_submission(self.executor, job)
+            except Exception as e:
+                logger.error(f"Submission {record.submission_id} failed to run: {e}", exc_info=True)
+                await self._fail(record, "The code runner failed, please try again")
+                continue
+            try:
+                await self._complete(record, result)
+            except Exception as e:
+                logger.error(f"Could not record submission {record.submission_id}: {e}", exc_info=True)
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        await super().close()
+
+    def stats(self) -> Dict[str, float]:
+        return {**super().stats(), "queued": self._queue.qsize()}
+
+
+class CelerySubmissionQueue(SubmissionQueue):
+    """
+    Runs submissions on Celery workers (``code.run_submission``).
+
+    Each worker process keeps its own warm sandbox pool. Results come back
+    through the Celery result backend; one poller task collects them and
+    records them here, in the process that accepted the submission.
+    """
+
+    def __init__(self, store: SubmissionStore):
+        super().__init__(store)
+        self._in_flight: Dict[UUID, Tuple[SubmissionRecord, Any]] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+    async def _dispatch(self, record, job):
+        from app.services.celery_app import celery_app
+
+        # Publishing is a blocking broker round trip
+        async_result = await asyncio.to_thread(celery_app.send_task, "code.run_submission", args=[job])
+        self._in_flight[record.submission_id] = (record, async_result)
+
+    def start(self) -> None:
+        self._poller = asyncio.create_task(self._poll(), name="submission-poller", context=contextvars.Context())
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(_CELERY_POLL_SECONDS)
+            if not self._in_flight:
+                continue
+            in_flight = list(self._in_flight.values())
+            try:
+                ready = await asyncio.to_thread(lambda: [item for item in in_flight if item[1].ready()])
+            except Exception as e:
+                logger.warning(f"Could not poll Celery results: {e}")
+                continue
+            for record, async_result in ready:
+                self._in_flight.pop(record.submission_id, None)
+                try:
+                    if async_result.successful():
+                        await self._complete(record, CodeResult.model_validate(async_result.result))
+                    else:
+                        logger.error(f"Submission {record.submission_id} failed on a worker: {async_result.result!r}")
+                        await self._fail(record, "The code runner failed, please try again")
+                except Exception as e:
+                    logger.error(f"Could not record submission {record.submission_id}: {e}", exc_info=True)
+
+    async def close(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            await asyncio.gather(self._poller, return_exceptions=True)
+        await super().close()
+
+    def stats(self) -> Dict[str, float]:
+        return {**super().stats(), "in_flight": len(self._in_flight)}
+
+
+def build_submission_queue(executor=None, backend: str = None) -> SubmissionQueue:
+    """
+    Build the configured submission queue.
+
+    Args:
+        executor: CodeExecutor for the asyncio backend
+        backend: "asyncio" or "celery" (defaults to ``settings.submission_backend``)
+
+    Returns:
+        Submission queue (not started)
+    """
+    backend = backend or settings.submission_backend
+    store = build_submission_store()
+    if backend == "asyncio":
+        if executor is None:
+            raise ValueError("The asyncio submission backend needs the code sandbox (sandbox_enabled)")
+        return AsyncioSubmissionQueue(store, executor, workers=settings.sandbox_pool_size)
+    if backend == "celery":
+        return CelerySubmissionQueue(store)
+    raise ValueError(f"Unknown submission backend: {backend}")
+
+
+# Submission queue, set up by the app lifespan
+_submission_queue: Optional[SubmissionQueue] = None
+
+
+def get_submission_queue() -> Optional[SubmissionQueue]:
+    """The running submission queue, or None when code execution is off."""
+    return _submission_queue
+
+
+def set_submission_queue(queue: Optional[SubmissionQueue]):
+    """Install (or clear) the submission queue."""
+    global _submission_queue
+    _submission_queue = queue
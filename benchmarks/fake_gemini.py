@@ -0,0 +1,160 @@
+"""Offline stand-in for the Gemini API with configurable latency and failures.
+
+``FakeGeminiBackend.install(gemini_service)`` replaces the model handles the
+service creates, so everything above it (retries, circuit breaker, router,
+limiter, JSON parsing, streaming) runs unchanged without a network or key.
+"""
+import asyncio
+import json
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+from google.api_core import exceptions as google_exceptions
+
+_SPEECH = [
+    "Can you explain how {topic} shows up when you train a model?",
+    "Good. What happens to it as you add more training data?",
+    "How would you detect it from training and validation curves?",
+    "Which regularization techniques would you reach for, and why?",
+    "Walk me through a concrete example from a project you worked on.",
+]
+
+
+@dataclass
+class LatencyProfile:
+    """Latency and failure behaviour of the fake backend."""
+
+    median_ms: float = 800.0  # Time to first token (log-normal median)
+    sigma: float = 0.4  # Log-normal spread; 0 gives a fixed latency
+    chunk_ms: float = 30.0  # Gap between streamed chunks
+    chunks: int = 8  # Chunks per response
+    error_rate: float = 0.0  # Share of calls that fail
+    throttle_share: float = 0.5  # Of failures, share that are 429s (rest 503s)
+    seed: Optional[int] = None
+
+    def first_token_seconds(self, rng: random.Random) -> float:
+        if self.sigma <= 0:
+            return self.median_ms / 1000
+        return rng.lognormvariate(0, self.sigma) * self.median_ms / 1000
+
+
+class _Chunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _Stream:
+    def __init__(self, chunks: List[str], chunk_seconds: float):
+        self._chunks = chunks
+        self._chunk_seconds = chunk_seconds
+
+    async def __aiter__(self) -> AsyncIterator[_Chunk]:
+        for chunk in self._chunks:
+            await asyncio.sleep(self._chunk_seconds)
+            yield _Chunk(chunk)
+
+
+class FakeGenerativeModel:
+    """Implements the subset of ``genai.GenerativeModel`` the service uses."""
+
+    def __init__(self, backend: "FakeGeminiBackend", model_name: str, system_instruction: str):
+        self.backend = backend
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+
+    async def generate_content_async(self, prompt: str, generation_config: Any = None, stream: bool = False):
+        backend = self.backend
+        backend.calls += 1
+        await asyncio.sleep(backend.profile.first_token_seconds(backend.rng))
+        backend.raise_injected_error()
+
+        text = backend.reply(prompt, generation_config)
+        if stream:
+            return _Stream(_split(text, backend.profile.chunks), backend.profile.chunk_ms / 1000)
+        await asyncio.sleep(backend.profile.chunks * backend.profile.chunk_ms / 1000)
+        return _Response(text)
+
+    def generate_content(self, prompt: str, generation_config: Any = None):
+        backend = self.backend
+        backend.calls += 1
+        time.sleep(backend.profile.first_token_seconds(backend.rng))
+        backend.raise_injected_error()
+        time.sleep(backend.profile.chunks * backend.profile.chunk_ms / 1000)
+        return _Response(backend.reply(prompt, generation_config))
+
+
+class FakeGeminiBackend:
+    """Source of fake model handles sharing one latency profile and counters."""
+
+    def __init__(self, profile: Optional[LatencyProfile] = None):
+        self.profile = profile or LatencyProfile()
+        self.rng = random.Random(self.profile.seed)
+        self.calls = 0
+        self.errors = 0
+
+    def install(self, service):
+        """Make ``service`` (a GeminiService) talk to this backend."""
+        service.prefix_cache = None
+        service._models.clear()
+        service._get_model = lambda model_name, system_instruction: FakeGenerativeModel(
+            self, model_name, system_instruction
+        )
+
+    def raise_injected_error(self):
+        if self.profile.error_rate and self.rng.random() < self.profile.error_rate:
+            self.errors += 1
+            if self.rng.random() < self.profile.throttle_share:
+                raise google_exceptions.TooManyRequests("fake: rate limited")
+            raise google_exceptions.ServiceUnavailable("fake: overloaded")
+
+    def reply(self, prompt: str, generation_config: Any = None) -> str:
+        """A plausible completion: interviewer or judge JSON, or prose for summaries."""
+        wants_json = "valid JSON" in prompt or getattr(generation_config, "response_mime_type", None)
+        if not wants_json:
+            return "The candidate explained the core idea and its main causes."
+
+        if '"theory_transcript"' in prompt:
+            ids = re.findall(r'"interview_id": "([^"]+)"', prompt)
+            if prompt.startswith("Evaluate each"):
+                return json.dumps({"evaluations": [
+                    {"interview_id": interview_id, **self._evaluation()} for interview_id in ids
+                ]})
+            return json.dumps(self._evaluation())
+
+        # Two sentences, so streaming clients can speak the first one early
+        speech = "Thanks for that. " + self.rng.choice(_SPEECH).format(topic="this")
+        return json.dumps({
+            "speech": speech,
+            "meta": {
+                "phase": 1,
+                "followup_used": self.rng.random() < 0.5,
+                "flag_vague": False,
+                "flag_incorrect": False,
+                "end_theory_round": False,
+            },
+        })
+
+
+    def _evaluation(self) -> Dict[str, Any]:
+        score = self.rng.randint(1, 5)
+        return {
+            "overall_signal": "medium",
+            "theory_scores": {"correctness": score, "depth": score, "clarity": score},
+            "coding_scores": {"correctness": 0, "approach": 0, "code_quality": 0},
+            "observations": {"strengths": ["Explained the core idea"], "weaknesses": [], "red_flags": []},
+            "confidence_vs_evidence_gap": "low",
+            "hire_recommendation": "borderline",
+            "justification": "Solid theory answers; no coding evidence.",
+        }
+
+
+def _split(text: str, parts: int) -> List[str]:
+    size = max(1, -(-len(text) // max(parts, 1)))
+    return [text[i:i + size] for i in range(0, len(text), size)]
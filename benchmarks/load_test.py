@@ -0,0 +1,286 @@
+"""Offline load test: N concurrent interviews against the app with a fake Gemini.
+
+Drives the real FastAPI app in-process (httpx ASGITransport, lifespan run)
+through create_interview and submit_response (or the SSE endpoint, called
+as a raw ASGI app so time to first speech event is measurable) and
+reports latency percentiles per endpoint, throughput, event-loop lag and
+memory per session. No network access or API key is needed.
+
+Usage:
+    python -m benchmarks.load_test [--interviews 200] [--concurrency 50] [--turns 6]
+        [--latency-ms 800] [--sigma 0.4] [--error-rate 0.0] [--stream]
+        [--json report.json] [--max-p95-ms 3000]
+
+With ``--max-p95-ms`` the exit status is non-zero when any endpoint's p95
+exceeds the budget, so the run can gate CI.
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+from typing import Dict, List, Optional
+
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+# No Docker daemon needed offline; the benchmark never runs candidate code
+os.environ.setdefault("SANDBOX_BACKEND", "local")
+os.environ.setdefault("SANDBOX_ALLOW_LOCAL", "true")
+
+import httpx  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.gemini_service import gemini_service  # noqa: E402
+from app.core.state_manager import get_state_store  # noqa: E402
+from benchmarks.fake_gemini import FakeGeminiBackend, LatencyProfile  # noqa: E402
+
+_ANSWERS = [
+    "Overfitting is when the model memorizes noise in the training data.",
+    "It gets worse with more parameters and better with more data.",
+    "The validation loss starts going up while training loss keeps falling.",
+    "L2 regularization, dropout and early stopping all reduce variance.",
+    "On a churn model we saw it and fixed it with fewer features and more data.",
+    "I think that covers the main trade-offs between bias and variance.",
+]
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Recorder:
+    """Per-endpoint latencies and failures."""
+
+    def __init__(self):
+        self.latency: Dict[str, List[float]] = {}
+        self.failures: Dict[str, int] = {}
+
+    def record(self, endpoint: str, seconds: float, ok: bool = True):
+        self.latency.setdefault(endpoint, []).append(seconds)
+        if not ok:
+            self.failures[endpoint] = self.failures.get(endpoint, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            endpoint: {
+                "count": len(samples),
+                "failures": self.failures.get(endpoint, 0),
+                "p50_ms": percentile(samples, 0.50) * 1000,
+                "p95_ms": percentile(samples, 0.95) * 1000,
+                "p99_ms": percentile(samples, 0.99) * 1000,
+                "max_ms": max(samples) * 1000,
+            }
+            for endpoint, samples in sorted(self.latency.items())
+        }
+
+
+async def _monitor_loop_lag(samples: List[float], interval: float = 0.01):
+    """Sample how late the event loop wakes a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - start - interval))
+
+
+async def _timed_post(client: httpx.AsyncClient, recorder: Recorder, endpoint: str, url: str, body: dict):
+    start = time.perf_counter()
+    try:
+        response = await client.post(url, json=body)
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        response, ok = None, False
+    recorder.record(endpoint, time.perf_counter() - start, ok)
+    return response if ok else None
+
+
+async def _timed_stream(recorder: Recorder, path: str, body: dict):
+    """
+    POST to an SSE endpoint by calling the ASGI app directly.
+
+    httpx's ASGITransport buffers the whole response body, which would hide
+    when the first ``speech`` event actually left the app.
+    """
+    payload = json.dumps(body).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"host", b"bench")],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await asyncio.Event().wait()  # No disconnect until the response ends
+
+    start = time.perf_counter()
+    first_speech: Optional[float] = None
+    status_code = 500
+    ok = False
+
+    async def send(message):
+        nonlocal first_speech, status_code, ok
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            chunk = message.get("body", b"")
+            if first_speech is None and b"event: speech" in chunk:
+                first_speech = time.perf_counter() - start
+            if b"event: meta" in chunk:
+                ok = status_code < 400
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        ok = False
+    recorder.record("respond_stream", time.perf_counter() - start, ok)
+    if first_speech is not None:
+        recorder.record("respond_stream_first_speech", first_speech)
+
+
+async def _run_interview(client: httpx.AsyncClient, recorder: Recorder, index: int, turns: int, stream: bool):
+    response = await _timed_post(client, recorder, "create_interview", "/api/v1/interviews", {
+        "candidate_name": f"Candidate {index}",
+        "theory_topic": "bias-variance tradeoff",
+        "interview_type": "ml_junior",
+    })
+    if response is None:
+        return
+    interview_id = response.json()["interview_id"]
+
+    for turn in range(turns):
+        body = {"message": f"{_ANSWERS[turn % len(_ANSWERS)]} ({index}.{turn})"}
+        url = f"/api/v1/interviews/{interview_id}/respond"
+        if stream:
+            await _timed_stream(recorder, url + "/stream", body)
+        else:
+            await _timed_post(client, recorder, "submit_response", url, body)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, object]:
+    backend = FakeGeminiBackend(LatencyProfile(
+        median_ms=args.latency_ms,
+        sigma=args.sigma,
+        chunk_ms=args.chunk_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ))
+    backend.install(gemini_service)
+
+    recorder = Recorder()
+    lag: List[float] = []
+    slots = asyncio.Semaphore(args.concurrency)
+    rss_before_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    async def bounded(index: int):
+        async with slots:
+            await _run_interview(client, recorder, index, args.turns, args.stream)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            monitor = asyncio.create_task(_monitor_loop_lag(lag))
+            start = time.perf_counter()
+            await asyncio.gather(*(bounded(i) for i in range(args.interviews)))
+            elapsed = time.perf_counter() - start
+            monitor.cancel()
+
+        store = get_state_store()
+        store_stats = store.stats() if hasattr(store, "stats") else {}
+
+    rss_growth_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before_kb
+    requests = sum(len(samples) for name, samples in recorder.latency.items() if not name.endswith("first_speech"))
+    live = store_stats.get("live_count") or args.interviews
+
+    return {
+        "config": vars(args),
+        "elapsed_seconds": elapsed,
+        "throughput_rps": requests / elapsed,
+        "interviews_per_second": args.interviews / elapsed,
+        "endpoints": recorder.summary(),
+        "event_loop_lag_ms": {
+            "p50": percentile(lag, 0.50) * 1000,
+            "p99": percentile(lag, 0.99) * 1000,
+            "max": max(lag, default=0.0) * 1000,
+        },
+        "memory": {
+            "rss_growth_kb_per_session": rss_growth_kb / args.interviews,
+            "store_bytes_per_session": store_stats.get("bytes_estimate", 0) / live if live else 0,
+        },
+        "gemini": {
+            "calls": backend.calls,
+            "injected_errors": backend.errors,
+            "limiter": gemini_service.limiter.stats(),
+            "resilience": gemini_service.resilience_stats(),
+        },
+    }
+
+
+def _print_report(report: Dict[str, object]):
+    print(f"elapsed {report['elapsed_seconds']:.1f}s, "
+          f"{report['throughput_rps']:.1f} req/s, {report['interviews_per_second']:.2f} interviews/s")
+    print(f"{'endpoint':<28} {'count':>6} {'fail':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for endpoint, row in report["endpoints"].items():
+        print(
+            f"{endpoint:<28} {row['count']:>6} {row['failures']:>5} {row['p50_ms']:>8.1f} "
+            f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}"
+        )
+    lag = report["event_loop_lag_ms"]
+    print(f"event loop lag ms: p50 {lag['p50']:.2f}  p99 {lag['p99']:.2f}  max {lag['max']:.2f}")
+    memory = report["memory"]
+    print(f"memory per session: {memory['rss_growth_kb_per_session']:.1f} KB RSS growth, "
+          f"{memory['store_bytes_per_session']:,.0f} B in the state store")
+    gemini = report["gemini"]
+    print(f"gemini calls {gemini['calls']}, injected errors {gemini['injected_errors']}, "
+          f"retries {gemini['resilience']['retries']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--interviews", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--stream", action="store_true", help="Use the SSE endpoint for turns")
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Median time to first token")
+    parser.add_argument("--sigma", type=float, default=0.4, help="Log-normal latency spread")
+    parser.add_argument("--chunk-ms", type=float, default=30.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--max-p95-ms", type=float, help="Fail if any endpoint's p95 exceeds this")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    _print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+    if args.max_p95_ms is not None:
+        over = [
+            endpoint for endpoint, row in report["endpoints"].items()
+            if row["p95_ms"] > args.max_p95_ms
+        ]
+        if over:
+            print(f"p95 budget of {args.max_p95_ms:.0f} ms exceeded by: {', '.join(over)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Scheduler CPU for silence timers across many concurrent sessions.
+
+Runs the same workload on a real event loop with two schedulers:
+
+- ``wheel``: one TimerWheel advanced by a single task every tick (what
+  app.services.session_timers does)
+- ``tasks``: one asyncio task sleeping per session, cancelled and recreated
+  whenever the session's timer restarts
+
+Every session restarts its silence timer on average every ``--turn-seconds``
+(a message), spread evenly over the run. CPU is process time per second of
+wall time, so it includes the event loop's own timer bookkeeping.
+
+Usage:
+    python -m benchmarks.session_timers [--sessions 1000 5000 10000 20000] [--seconds 3]
+"""
+import argparse
+import asyncio
+import gc
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+from app.core.timer_wheel import TimerWheel
+
+_TICK_SECONDS = 0.5
+_SILENCE_SECONDS = 45.0
+
+
+class _WheelScheduler:
+    def __init__(self):
+        self.wheel = TimerWheel(_TICK_SECONDS, now=time.time())
+        self.fired = 0
+        self._driver = asyncio.create_task(self._drive())
+
+    async def _drive(self):
+        while True:
+            await asyncio.sleep(_TICK_SECONDS)
+            self.fired += len(self.wheel.advance(time.time()))
+
+    def restart(self, session: int):
+        self.wheel.schedule(session, time.time() + _SILENCE_SECONDS)
+
+    async def close(self):
+        self._driver.cancel()
+
+
+class _TaskScheduler:
+    def __init__(self):
+        self.tasks: Dict[int, asyncio.Task] = {}
+        self.fired = 0
+
+    async def _sleep(self):
+        await asyncio.sleep(_SILENCE_SECONDS)
+        self.fired += 1
+
+    def restart(self, session: int):
+        task = self.tasks.get(session)
+        if task is not None:
+            task.cancel()
+        self.tasks[session] = asyncio.create_task(self._sleep())
+
+    async def close(self):
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+
+async def _run(make: Callable[[], object], sessions: int, seconds: float, turn_seconds: float) -> Tuple[float, float]:
+    """Returns (CPU ms to start every session's timer, CPU ms per wall second afterwards)."""
+    rng = random.Random(7)
+    gc.collect()
+
+    cpu = time.process_time()
+    scheduler = make()
+    for session in range(sessions):
+        scheduler.restart(session)
+    setup = (time.process_time() - cpu) * 1000
+
+    # Messages per 10ms slice, so restarts arrive spread over the run
+    per_slice = sessions / turn_seconds / 100
+    carry = 0.0
+    cpu = time.process_time()
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        carry += per_slice
+        for _ in range(int(carry)):
+            scheduler.restart(rng.randrange(sessions))
+        carry -= int(carry)
+        await asyncio.sleep(0.01)
+    steady = (time.process_time() - cpu) * 1000 / (time.perf_counter() - started)
+
+    await scheduler.close()
+    return setup, steady
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1000, 5000, 10000, 20000])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--turn-seconds", type=float, default=20.0, help="Mean time between a session's messages")
+    args = parser.parse_args()
+
+    schedulers: List[Tuple[str, Callable[[], object]]] = [("wheel", _WheelScheduler), ("tasks", _TaskScheduler)]
+    baseline = asyncio.run(_run(_WheelScheduler, 0, args.seconds, args.turn_seconds))[1]
+    print(f"idle loop: {baseline:.1f} CPU ms/s")
+    print(f"{'sessions':>9} {'msgs/s':>7} " + " ".join(f"{name + ' setup ms':>16} {name + ' ms/s':>11}" for name, _ in schedulers))
+    for sessions in args.sessions:
+        row = f"{sessions:>9} {sessions / args.turn_seconds:>7.0f} "
+        for _, make in schedulers:
+            setup, steady = asyncio.run(_run(make, sessions, args.seconds, args.turn_seconds))
+            row += f"{setup:>16.1f} {steady:>11.1f} "
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
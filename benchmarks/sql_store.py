@@ -0,0 +1,119 @@
+"""Per-turn cost of the SQL state store, and a round-trip check of what it wrote.
+
+Runs concurrent interviews against SQLStateStore: each turn appends a
+candidate and an interviewer message and saves twice (as a turn does), then
+sleeps. Reports save and get latency, how many flushes the writes took, and
+reloads every interview from a fresh store to check nothing was lost.
+
+Defaults to a throwaway SQLite file (aiosqlite); pass a PostgreSQL URL to
+measure against a real server.
+
+Usage:
+    python -m benchmarks.sql_store [--url postgresql+asyncpg://...] [--interviews 200] [--revalidate]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import List
+from uuid import uuid4
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core.state_manager import CodeResult, InterviewState
+from app.core.stores.sql_store import SQLStateStore
+
+_ANSWER = "Regularization adds a penalty on weight size so the model cannot fit noise. "
+
+
+def _percentile(values: List[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[int(q) - 1] if len(values) > 1 else values[0]
+
+
+async def _interview(store: SQLStateStore, turns: int, think_seconds: float, saves: List[float], gets: List[float]):
+    state = InterviewState(
+        interview_id=uuid4(),
+        candidate_id=uuid4(),
+        candidate_name="Candidate",
+        theory_topic="regularization",
+        phase_start_times={"theory": datetime.utcnow()}
+    )
+    state.add_message("assistant", "What is regularization?")
+    await store.save(state)
+
+    for turn in range(turns):
+        await asyncio.sleep(think_seconds)
+        start = time.perf_counter()
+        state = await store.get(state.interview_id)
+        gets.append(time.perf_counter() - start)
+
+        state.add_message("user", f"{turn}: {_ANSWER}")
+        start = time.perf_counter()
+        await store.save(state)
+        state.add_message("assistant", "Why does that reduce variance?")
+        if turn == turns - 1:
+            state.add_code_submission(CodeResult(submission_id=uuid4(), language="python", code="pass", compiled=True))
+        await store.save(state)
+        saves.append((time.perf_counter() - start) / 2)
+    return state
+
+
+async def _run(url: str, interviews: int, turns: int, think_seconds: float, revalidate: bool):
+    store = SQLStateStore(create_async_engine(url), revalidate=revalidate)
+    saves: List[float] = []
+    gets: List[float] = []
+    started = time.perf_counter()
+    states = await asyncio.gather(*[
+        _interview(store, turns, think_seconds, saves, gets) for _ in range(interviews)
+    ])
+    await store.flush()
+    elapsed = time.perf_counter() - started
+    stats = store.stats()
+    await store.close()
+
+    # Read everything back through a fresh store
+    reader = SQLStateStore(create_async_engine(url), create_tables=False)
+    mismatched = 0
+    for state in states:
+        loaded = await reader.get(state.interview_id)
+        if (
+            loaded is None
+            or loaded.transcript != state.transcript
+            or loaded.code_submissions != state.code_submissions
+            or loaded.current_phase != state.current_phase
+        ):
+            mismatched += 1
+    await reader.close()
+
+    print(f"{interviews} interviews x {turns} turns in {elapsed:.1f}s")
+    print(f"save per call ms: p50 {_percentile(saves, 50) * 1000:.3f}  p99 {_percentile(saves, 99) * 1000:.3f}")
+    print(f"get ms:           p50 {_percentile(gets, 50) * 1000:.3f}  p99 {_percentile(gets, 99) * 1000:.3f}")
+    saves_total = interviews * (1 + 2 * turns)
+    print(
+        f"{saves_total} saves in {stats['flushes']} flushes "
+        f"({stats['rows_written']} rows, {stats['flush_errors']} errors)"
+    )
+    print(f"round trip: {len(states) - mismatched}/{len(states)} interviews identical")
+    return mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None, help="Database URL (default: temporary SQLite file)")
+    parser.add_argument("--interviews", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--think-ms", type=float, default=200.0, help="Candidate think time per turn")
+    parser.add_argument("--revalidate", action="store_true", help="Check cached states against updated_at")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.url or f"sqlite+aiosqlite:///{os.path.join(directory, 'interviews.db')}"
+        mismatched = asyncio.run(_run(
+            url, args.interviews, args.turns, args.think_ms / 1000, revalidate=args.revalidate
+        ))
+    raise SystemExit(1 if mismatched else 0)
+
+
+if __name__ == "__main__":
+    main()
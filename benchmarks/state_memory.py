@@ -0,0 +1,82 @@
+"""Memory per interview session at different transcript lengths.
+
+Compares the compact MessageLog-backed InterviewState against a plain
+List[Message] transcript holding the same content.
+
+Usage:
+    python -m benchmarks.state_memory [--sessions 200] [--lengths 10 100 1000]
+"""
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List, Tuple
+from uuid import uuid4
+from app.core.state_manager import InterviewState, Message
+
+# Typical length of a spoken turn
+_CONTENT = "Overfitting is when the model fits noise in the training data. "
+
+
+def _content(i: int) -> str:
+    # Distinct strings so nothing is shared between messages
+    return f"{i}: {_CONTENT}"
+
+
+def _compact_session(messages: int) -> InterviewState:
+    state = InterviewState(
+        interview_id=uuid4(),
+        candidate_id=uuid4(),
+        candidate_name="Candidate",
+        theory_topic="bias-variance tradeoff",
+        phase_start_times={"theory": datetime.utcnow()}
+    )
+    for i in range(messages):
+        state.add_message("user" if i % 2 else "assistant", _content(i))
+    return state
+
+
+def _list_session(messages: int) -> Tuple[InterviewState, List[Message]]:
+    # Same state without a transcript, plus the transcript as Message models
+    transcript = [
+        Message(role="user" if i % 2 else "assistant", content=_content(i))
+        for i in range(messages)
+    ]
+    return _compact_session(0), transcript
+
+
+def _measure(build: Callable[[int], object], sessions: int, messages: int) -> float:
+    """Average bytes allocated per session."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    held = [build(messages) for _ in range(sessions)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del held
+    return total / sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    content_bytes = lambda n: sum(len(_content(i)) + 49 for i in range(n))  # str objects
+
+    print(f"{'messages':>9} {'compact B/session':>18} {'list B/session':>15} {'content B':>10} {'ratio':>6}")
+    for length in args.lengths:
+        sessions = max(1, args.sessions * 10 // max(length, 10))
+        compact = _measure(_compact_session, sessions, length)
+        legacy = _measure(_list_session, sessions, length)
+        print(
+            f"{length:>9} {compact:>18,.0f} {legacy:>15,.0f} "
+            f"{content_bytes(length):>10,} {legacy / compact:>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
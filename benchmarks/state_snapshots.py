@@ -0,0 +1,156 @@
+"""Cost of snapshotting the in-memory store, and how fast a restarted worker is back.
+
+Fills an InMemoryStateStore with ``--interviews`` live interviews of
+``--turns`` turns each, snapshots them, then keeps ``--active`` of them
+talking for a few flush intervals. Reports:
+
+- how long each flush held the event loop (capturing records) versus the
+  time spent encoding and writing in the worker thread
+- event loop lag measured by a ticker while flushes run
+- after a simulated restart: time until the first request for an old
+  interview is answered, and until every interview is back in memory
+
+Usage:
+    python -m benchmarks.state_snapshots [--interviews 10000] [--turns 12] [--active 2000]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import List
+from uuid import uuid4
+from app.core.state_manager import InterviewState
+from app.core.stores.memory import InMemoryStateStore
+from app.core.stores.snapshots import StateSnapshotter
+
+_QUESTION = "Can you explain the bias-variance tradeoff and how it guides model selection?"
+_ANSWER = "A simpler model underfits and has high bias; a flexible one overfits and has high variance. "
+
+
+def _interview(turns: int) -> InterviewState:
+    state = InterviewState(
+        interview_id=uuid4(),
+        candidate_id=uuid4(),
+        candidate_name="Candidate",
+        theory_topic="bias-variance"
+    )
+    for turn in range(turns):
+        state.add_message("assistant", _QUESTION)
+        state.add_message("user", f"{turn}: {_ANSWER * 3}")
+    return state
+
+
+async def _lag_probe(lags: List[float], interval: float = 0.005):
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def _timed_flush(snapshots: StateSnapshotter) -> tuple:
+    """(total seconds, seconds spent in the worker thread) for one flush."""
+    in_thread = 0.0
+    append = snapshots._append
+
+    def timed_append(records):
+        nonlocal in_thread
+        started = time.perf_counter()
+        try:
+            return append(records)
+        finally:
+            in_thread += time.perf_counter() - started
+
+    snapshots._append = timed_append
+    started = time.perf_counter()
+    await snapshots.flush()
+    snapshots._append = append
+    return time.perf_counter() - started, in_thread
+
+
+async def _write(directory: str, interviews: int, turns: int, active: int, rounds: int):
+    snapshots = StateSnapshotter(directory, compact_bytes=1 << 40)
+    store = InMemoryStateStore(snapshots=snapshots)
+    states = [_interview(turns) for _ in range(interviews)]
+    for state in states:
+        await store.save(state)
+
+    total, in_thread = await _timed_flush(snapshots)
+    size = os.path.getsize(snapshots.log_path)
+    print(f"initial flush of {interviews} interviews: {total * 1000:.0f}ms "
+          f"({(total - in_thread) * 1000:.0f}ms on the loop), {size / 1e6:.1f}MB")
+
+    lags: List[float] = []
+    loop_ms, thread_ms = [], []
+    for _ in range(rounds):
+        for state in states[:active]:
+            state.add_message("user", _ANSWER)
+            state.add_message("assistant", _QUESTION)
+            await store.save(state)
+        probe = asyncio.create_task(_lag_probe(lags))
+        await asyncio.sleep(0)
+        total, in_thread = await _timed_flush(snapshots)
+        probe.cancel()
+        loop_ms.append((total - in_thread) * 1000)
+        thread_ms.append(in_thread * 1000)
+    appended = os.path.getsize(snapshots.log_path) - size
+    print(f"incremental flush of {active} interviews: {statistics.median(loop_ms):.1f}ms capturing on the loop, "
+          f"{statistics.median(thread_ms):.1f}ms writing in the thread, {appended / rounds / 1e3:.0f}KB per flush")
+    print(f"loop lag during flushes: max {max(lags, default=0) * 1000:.1f}ms")
+
+    started = time.perf_counter()
+    await asyncio.to_thread(snapshots._compact)
+    print(f"compaction (worker thread): {(time.perf_counter() - started) * 1000:.0f}ms, "
+          f"snapshot {os.path.getsize(snapshots.snapshot_path) / 1e6:.1f}MB")
+    await store.close()
+    return states
+
+
+async def _restart(directory: str, states: List[InterviewState]):
+    started = time.perf_counter()
+    store = InMemoryStateStore(snapshots=StateSnapshotter(directory))
+    store.snapshots.start()
+    restorer = asyncio.create_task(store.restore())
+    lags: List[float] = []
+    probe = asyncio.create_task(_lag_probe(lags))
+
+    target = states[len(states) // 2]
+    state = await store.get(target.interview_id)
+    first = time.perf_counter() - started
+    await restorer
+    restored = time.perf_counter() - started
+    probe.cancel()
+
+    identical = 0
+    for original in states:
+        identical += (await store.get(original.interview_id)).transcript == original.transcript
+    print(f"restart: first request answered after {first * 1000:.0f}ms, "
+          f"all {len(store)} interviews in memory after {restored * 1000:.0f}ms "
+          f"(max loop lag while restoring {max(lags, default=0) * 1000:.1f}ms)")
+    print(f"round trip: {identical}/{len(states)} transcripts identical, first read correct: "
+          f"{state.transcript == target.transcript}")
+    await store.close()
+    return identical == len(states)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--interviews", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=12, help="Turns already taken per interview")
+    parser.add_argument("--active", type=int, default=2000, help="Interviews with a new turn per flush")
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        states = asyncio.run(_write(directory, args.interviews, args.turns, args.active, args.rounds))
+        ok = asyncio.run(_restart(directory, states))
+    finally:
+        shutil.rmtree(directory)
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
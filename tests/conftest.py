@@ -0,0 +1,5 @@
+"""Shared test setup."""
+import os
+
+# Settings require an API key at import time; unit tests never call Gemini
+os.environ.setdefault("GEMINI_API_KEY", "test")
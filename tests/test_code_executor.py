@@ -0,0 +1,79 @@
+"""CodeExecutor.run_tests: scoring happens outside the sandbox and cannot be forged."""
+import asyncio
+import pytest
+from app.core.problems import problem_registry
+from app.services.code_executor import CodeExecutor
+from app.services.sandbox.base import SandboxPool
+from app.services.sandbox.factory import sandbox_limits
+from app.services.sandbox.local import LocalSandboxWorker
+
+_SOLUTION = """
+def two_sum(nums, target):
+    seen = {}
+    for index, value in enumerate(nums):
+        if target - value in seen:
+            return [seen[target - value], index]
+        seen[value] = index
+"""
+
+# Walks up to the harness's main() frame and reports every test as passed
+_FORGE_EVENTS = """
+import sys
+harness = sys._getframe(1).f_locals
+for test in harness["tests"]:
+    harness["emit"](event="test", name=test["name"], passed=True, runtime_ms=0.1, error=None)
+
+def two_sum(*args, **kwargs):
+    return None
+"""
+
+# Forges the whole run and exits before the real events: only the values count
+_FORGE_RUN = """
+import os, sys
+harness = sys._getframe(1).f_locals
+harness["emit"](event="compiled", ok=True)
+for test in harness["tests"]:
+    harness["emit"](event="test", name=test["name"], value=None, passed=True, runtime_ms=0.1, error=None)
+harness["emit"](event="done")
+harness["events"].flush()
+os._exit(0)
+"""
+
+
+def _run_tests(code: str, **options):
+    async def run():
+        pool = SandboxPool(lambda: LocalSandboxWorker(sandbox_limits()), 1, name="sandbox-test")
+        executor = CodeExecutor(pool)
+        await executor.start()
+        try:
+            return await executor.run_tests(code, problem_registry.get("two_sum"), **options)
+        finally:
+            await executor.close()
+
+    return asyncio.run(run())
+
+
+def test_correct_solution_passes():
+    result = _run_tests(_SOLUTION)
+    assert (result.tests_passed, result.tests_failed) == (6, 0)
+    assert result.error is None
+
+
+def test_wrong_answer_fails_with_expected_value():
+    result = _run_tests("def two_sum(nums, target):\n    return [0, 1]\n")
+    # Right for "basic" and "duplicates" only
+    assert (result.tests_passed, result.tests_failed) == (2, 4)
+    assert result.error.startswith("Expected [1, 2], got [0, 1]")
+
+
+def test_stop_on_failure_reports_later_tests_as_not_run():
+    result = _run_tests("def two_sum(nums, target):\n    return [0, 1]\n", stop_on_failure=True)
+    assert [test.name for test in result.test_results] == ["basic", "middle"]
+    assert (result.tests_passed, result.tests_failed) == (1, 5)
+
+
+@pytest.mark.parametrize("payload", [_FORGE_EVENTS, _FORGE_RUN], ids=["frame-walk", "forged-run"])
+def test_forged_harness_events_score_nothing(payload):
+    result = _run_tests(payload)
+    assert result.tests_passed == 0
+    assert result.tests_failed == 6
@@ -0,0 +1,58 @@
+"""GeminiService.stream_response: limiter slot lifetime and per-chunk deadline."""
+import asyncio
+import pytest
+from app.config import settings
+from app.services.gemini_service import GeminiService
+from benchmarks.fake_gemini import FakeGeminiBackend, LatencyProfile
+
+
+def _service(**profile) -> GeminiService:
+    service = GeminiService()
+    FakeGeminiBackend(LatencyProfile(median_ms=1, sigma=0, **profile)).install(service)
+    return service
+
+
+def test_slow_consumer_does_not_hold_the_slot():
+    async def run():
+        service = _service(chunk_ms=1, chunks=4)
+        stream = service.stream_response("Hello", "System")
+        in_use = []
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            await asyncio.sleep(0.05)
+            in_use.append(service.limiter.in_use)
+        return "".join(chunks), in_use, service.limiter.in_use
+
+    text, in_use, after = asyncio.run(run())
+    assert text
+    # Generation (4 ms) ends long before the reader gets to the last chunk
+    assert in_use[-1] == 0 and after == 0
+
+
+def test_abandoned_stream_releases_the_slot():
+    async def run():
+        service = _service(chunk_ms=20, chunks=8)
+        stream = service.stream_response("Hello", "System")
+        await stream.__anext__()
+        await stream.aclose()
+        return service.limiter.in_use
+
+    assert asyncio.run(run()) == 0
+
+
+def test_stalled_chunk_hits_the_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "gemini_timeout", 0.2)
+
+    async def run():
+        service = _service(chunk_ms=1000, chunks=2)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with pytest.raises(asyncio.TimeoutError):
+            async for _ in service.stream_response("Hello", "System"):
+                pass
+        return loop.time() - start, service.limiter.in_use
+
+    elapsed, in_use = asyncio.run(run())
+    assert elapsed < 0.5
+    assert in_use == 0
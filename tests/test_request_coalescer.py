@@ -0,0 +1,109 @@
+"""RequestCoalescer: one execution per key, replayed for the TTL."""
+import asyncio
+import pytest
+from app.core.locks import RequestCoalescer
+
+
+class _Work:
+    """Factory that counts its runs and blocks until released."""
+
+    def __init__(self, result="done", error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return f"{self.result}-{self.calls}"
+
+
+def test_concurrent_duplicates_share_one_execution():
+    async def scenario():
+        coalescer = RequestCoalescer(ttl_seconds=30)
+        work = _Work()
+        calls = [asyncio.create_task(coalescer.run("key", work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        work.release.set()
+        results = await asyncio.gather(*calls)
+        return work.calls, results, coalescer.stats()
+
+    calls, results, stats = asyncio.run(scenario())
+    assert calls == 1
+    assert results == ["done-1"] * 5
+    assert stats["executed"] == 1 and stats["coalesced"] == 4
+
+
+def test_finished_result_replayed_within_ttl():
+    async def scenario():
+        coalescer = RequestCoalescer(ttl_seconds=30)
+        work = _Work()
+        work.release.set()
+        return work, [await coalescer.run("key", work), await coalescer.run("key", work)]
+
+    work, results = asyncio.run(scenario())
+    assert work.calls == 1
+    assert results == ["done-1", "done-1"]
+
+
+def test_zero_ttl_coalesces_only_in_flight():
+    async def scenario():
+        coalescer = RequestCoalescer(ttl_seconds=30)
+        work = _Work()
+        first = asyncio.create_task(coalescer.run("key", work, ttl_seconds=0))
+        second = asyncio.create_task(coalescer.run("key", work, ttl_seconds=0))
+        await asyncio.sleep(0)
+        work.release.set()
+        in_flight = await asyncio.gather(first, second)
+        later = await coalescer.run("key", work, ttl_seconds=0)
+        return work.calls, in_flight, later, coalescer.stats()["entries"]
+
+    calls, in_flight, later, entries = asyncio.run(scenario())
+    assert in_flight == ["done-1", "done-1"]
+    assert later == "done-2"
+    assert calls == 2
+    assert entries == 0
+
+
+def test_failures_are_not_cached():
+    async def scenario():
+        coalescer = RequestCoalescer(ttl_seconds=30)
+        failing = _Work(error=RuntimeError("boom"))
+        failing.release.set()
+        with pytest.raises(RuntimeError):
+            await coalescer.run("key", failing)
+        working = _Work()
+        working.release.set()
+        return await coalescer.run("key", working)
+
+    assert asyncio.run(scenario()) == "done-1"
+
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    async def scenario():
+        coalescer = RequestCoalescer(ttl_seconds=30)
+        work = _Work()
+        first = asyncio.create_task(coalescer.run("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        retry = asyncio.create_task(coalescer.run("key", work))
+        await asyncio.sleep(0)
+        work.release.set()
+        return work.calls, await retry
+
+    calls, result = asyncio.run(scenario())
+    assert calls == 1
+    assert result == "done-1"
+
+
+def test_keys_are_independent():
+    async def scenario():
+        coalescer = RequestCoalescer(ttl_seconds=30)
+        work = _Work()
+        work.release.set()
+        return await coalescer.run("a", work), await coalescer.run("b", work)
+
+    assert asyncio.run(scenario()) == ("done-1", "done-2")
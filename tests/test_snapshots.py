@@ -0,0 +1,152 @@
+"""StateSnapshotter: incremental records and replay of torn or damaged logs."""
+import asyncio
+import os
+from uuid import uuid4
+import msgpack
+from app.core.state_manager import InterviewState
+from app.core.stores.snapshots import StateSnapshotter, _replay
+
+
+def _state(turns: int = 2) -> InterviewState:
+    state = InterviewState(
+        interview_id=uuid4(),
+        candidate_id=uuid4(),
+        candidate_name="Candidate",
+        theory_topic="bias-variance"
+    )
+    for turn in range(turns):
+        state.add_message("assistant", f"Question {turn}?")
+        state.add_message("user", f"Answer {turn}.")
+    return state
+
+
+def _write(directory, *batches):
+    """Flush each batch of states in turn; returns the log size after every flush."""
+    async def run():
+        snapshots = StateSnapshotter(str(directory))
+        sizes = []
+        for batch in batches:
+            for state in batch():
+                snapshots.mark(state)
+            await snapshots.flush()
+            sizes.append(os.path.getsize(snapshots.log_path))
+        return sizes
+
+    return asyncio.run(run())
+
+
+def _restore(directory, *states):
+    async def run():
+        snapshots = StateSnapshotter(str(directory))
+        await snapshots.load()
+        return [await snapshots.take(state.interview_id) for state in states], snapshots
+
+    return asyncio.run(run())
+
+
+def test_incremental_records_round_trip(tmp_path):
+    state = _state()
+
+    def second_turn():
+        state.add_message("assistant", "Follow-up?")
+        state.theory_phase = 2
+        return [state]
+
+    _write(tmp_path, lambda: [state], second_turn)
+    (restored,), snapshots = _restore(tmp_path, state)
+
+    assert restored.transcript == state.transcript
+    assert restored.theory_phase == 2
+    assert snapshots.stats()["restored"] == 1
+
+
+def test_torn_tail_keeps_earlier_records_and_is_cut_off(tmp_path):
+    state = _state()
+
+    def second_turn():
+        state.add_message("assistant", "This record gets torn.")
+        return [state]
+
+    first_size, second_size = _write(tmp_path, lambda: [state], second_turn)
+    log_path = tmp_path / "states.log"
+    os.truncate(log_path, second_size - 5)
+
+    (restored,), _ = _restore(tmp_path, state)
+
+    assert len(restored.transcript) == 4
+    assert restored.transcript == state.transcript[:4]
+    # Later appends must not land after the partial record
+    assert os.path.getsize(log_path) == first_size
+
+
+def test_appends_after_a_torn_tail_replay_cleanly(tmp_path):
+    state = _state()
+    _, size = _write(tmp_path, lambda: [state], lambda: [state])
+    log_path = tmp_path / "states.log"
+    with open(log_path, "ab") as file:
+        file.write(b"\x99\xa3put")  # Start of a record, never finished
+
+    async def resume():
+        snapshots = StateSnapshotter(str(tmp_path))
+        restored = await snapshots.take(state.interview_id)
+        truncated_to = os.path.getsize(log_path)
+        restored.add_message("user", "After the restart.")
+        snapshots.mark(restored)
+        await snapshots.flush()
+        return restored, truncated_to
+
+    restored, truncated_to = asyncio.run(resume())
+    assert truncated_to == size
+
+    (again,), _ = _restore(tmp_path, state)
+    assert again.transcript == restored.transcript
+    assert again.transcript[-1].content == "After the restart."
+
+
+def test_record_extending_missing_entries_is_dropped(tmp_path):
+    kept, damaged = _state(), _state()
+    _write(tmp_path, lambda: [kept, damaged])
+    log_path = tmp_path / "states.log"
+
+    # Hand-written record continuing from an offset that was never written
+    record = ["put", damaged.interview_id.bytes, {}, 99, b"", [], b"", 0, []]
+    with open(log_path, "ab") as file:
+        file.write(msgpack.packb(record))
+
+    entries, _ = _replay([str(log_path)])
+    assert set(entries) == {kept.interview_id.bytes}
+
+
+def test_forget_writes_a_tombstone(tmp_path):
+    kept, deleted = _state(), _state()
+
+    async def run():
+        snapshots = StateSnapshotter(str(tmp_path))
+        snapshots.mark(kept)
+        snapshots.mark(deleted)
+        await snapshots.flush()
+        snapshots.forget(deleted.interview_id)
+        await snapshots.flush()
+
+    asyncio.run(run())
+    (restored_kept, restored_deleted), snapshots = _restore(tmp_path, kept, deleted)
+    assert restored_kept is not None
+    assert restored_deleted is None
+    assert snapshots.loaded == 1
+
+
+def test_compaction_then_replayed_log_is_idempotent(tmp_path):
+    state = _state()
+    _write(tmp_path, lambda: [state])
+    log_path = tmp_path / "states.log"
+    with open(log_path, "rb") as file:
+        log = file.read()
+
+    snapshots = StateSnapshotter(str(tmp_path))
+    snapshots._compact()
+    # A crash between the snapshot rename and the log truncation replays the log twice
+    with open(log_path, "wb") as file:
+        file.write(log)
+
+    (restored,), _ = _restore(tmp_path, state)
+    assert restored.transcript == state.transcript
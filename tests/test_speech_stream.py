@@ -0,0 +1,60 @@
+"""SpeechStreamParser: sentences out of a streamed JSON reply."""
+import json
+import pytest
+from app.core.speech_stream import SpeechStreamParser
+
+
+def _feed_all(parser: SpeechStreamParser, chunks):
+    sentences = []
+    for chunk in chunks:
+        sentences.extend(parser.feed(chunk))
+    return sentences
+
+
+def test_emits_sentences_as_their_end_arrives():
+    parser = SpeechStreamParser()
+    assert parser.feed('{"speech": "Hello there. How') == ["Hello there."]
+    assert parser.feed(" are you?") == []
+    assert parser.feed(' Fine", "meta": {}}') == ["How are you?", "Fine"]
+    assert parser.speech_closed
+    assert parser.emitted_speech == "Hello there. How are you? Fine"
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7])
+def test_chunk_boundaries_do_not_matter(size):
+    speech = 'Say "bias" \\ variance.\nThen stop! Café time? Done'
+    text = json.dumps({"speech": speech, "meta": {"phase": 1}})
+    parser = SpeechStreamParser()
+
+    sentences = _feed_all(parser, [text[i:i + size] for i in range(0, len(text), size)])
+
+    assert sentences == ['Say "bias" \\ variance.', "Then stop!", "Café time?", "Done"]
+    assert parser.text == text
+
+
+def test_split_key_and_unicode_escape():
+    parser = SpeechStreamParser()
+    chunks = ['{"spe', 'ech"', ' :  "Caf\\u00', 'e9 open. ', 'Next"}']
+    assert _feed_all(parser, chunks) == ["Café open.", "Next"]
+
+
+def test_ignores_output_after_speech_closes():
+    parser = SpeechStreamParser()
+    parser.feed('{"speech": "One."')
+    assert parser.feed(', "meta": {"note": "Not speech. At all. "}}') == []
+    assert parser.emitted_speech == "One."
+
+
+def test_flush_returns_unterminated_remainder():
+    parser = SpeechStreamParser()
+    assert parser.feed('{"speech": "First. Cut off mid') == ["First."]
+    assert not parser.speech_closed
+    assert parser.flush() == ["Cut off mid"]
+    assert parser.flush() == []
+
+
+def test_no_speech_field():
+    parser = SpeechStreamParser()
+    assert _feed_all(parser, ['{"meta": ', '{"phase": 1}}']) == []
+    assert parser.flush() == []
+    assert parser.emitted_speech == ""
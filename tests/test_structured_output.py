@@ -0,0 +1,50 @@
+"""parse_json_lenient: local repair of malformed model JSON."""
+import pytest
+from app.core.structured_output import JSONRepairError, parse_json_lenient
+
+
+def test_valid_object_needs_no_repair():
+    assert parse_json_lenient('{"speech": "Hi", "meta": {"phase": 1}}') == (
+        {"speech": "Hi", "meta": {"phase": 1}}, False
+    )
+
+
+def test_markdown_fence():
+    assert parse_json_lenient('```json\n{"a": 1}\n```') == ({"a": 1}, False)
+
+
+def test_prose_around_object():
+    assert parse_json_lenient('Sure! Here it is: {"a": [1, 2]} Hope that helps.') == ({"a": [1, 2]}, True)
+
+
+def test_trailing_commas():
+    assert parse_json_lenient('{"a": [1, 2,], "b": {"c": 3,},}') == ({"a": [1, 2], "b": {"c": 3}}, True)
+
+
+def test_python_literals_outside_strings_only():
+    value, repaired = parse_json_lenient('{"flag": True, "none": None, "text": "True or None"}')
+    assert repaired
+    assert value == {"flag": True, "none": None, "text": "True or None"}
+
+
+def test_truncated_mid_string():
+    value, repaired = parse_json_lenient('{"speech": "The model memorizes the tr')
+    assert repaired
+    assert value == {"speech": "The model memorizes the tr"}
+
+
+def test_truncated_mid_object():
+    value, repaired = parse_json_lenient('{"speech": "Done.", "meta": {"phase": 2, "flags": [true')
+    assert repaired
+    assert value == {"speech": "Done.", "meta": {"phase": 2, "flags": [True]}}
+
+
+def test_escaped_quote_in_truncated_string():
+    value, _ = parse_json_lenient('{"speech": "He said \\"hi')
+    assert value == {"speech": 'He said "hi'}
+
+
+@pytest.mark.parametrize("text", ["", "no json here", "[1, 2, 3]", '{"a": }'])
+def test_unrecoverable(text):
+    with pytest.raises(JSONRepairError):
+        parse_json_lenient(text)
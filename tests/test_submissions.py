@@ -0,0 +1,131 @@
+"""Submission stores: atomic run claims, dedupe and compare-and-delete release."""
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+import pytest
+from fakeredis import aioredis
+from app.services.submissions import (
+    InMemorySubmissionStore,
+    RedisSubmissionStore,
+    SubmissionQueue,
+    SubmissionRecord,
+    content_hash,
+)
+
+
+def _redis_store(ttl_seconds=3600):
+    return RedisSubmissionStore(aioredis.FakeRedis(decode_responses=True), prefix="test", ttl_seconds=ttl_seconds)
+
+
+STORES = {
+    "memory": lambda: InMemorySubmissionStore(3600),
+    "redis": _redis_store,
+    "redis-no-ttl": lambda: _redis_store(None),
+}
+
+
+def _record(interview_id, code="def f(): pass"):
+    return SubmissionRecord(
+        submission_id=uuid4(),
+        interview_id=interview_id,
+        status="queued",
+        content_hash=content_hash(code, "python", None),
+        language="python",
+        created_at=datetime.utcnow()
+    )
+
+
+class _Queue(SubmissionQueue):
+    """Queue that records dispatched jobs without running them."""
+
+    def __init__(self, store):
+        super().__init__(store)
+        self.jobs = []
+
+    async def _dispatch(self, record, job):
+        await asyncio.sleep(0)
+        self.jobs.append(job)
+
+
+async def _runs(store, interview_id):
+    """Runs counted against the interview."""
+    if isinstance(store, RedisSubmissionStore):
+        return int(await store.client.get(store._keys(interview_id)[0]) or 0)
+    return store._interviews[interview_id][1]
+
+
+@pytest.mark.parametrize("backend", STORES)
+def test_identical_submits_share_one_run(backend):
+    async def run():
+        queue = _Queue(STORES[backend]())
+        interview_id = uuid4()
+        submitted = await asyncio.gather(*(queue.submit(interview_id, "def f(): pass", "python") for _ in range(8)))
+        return queue, submitted, await _runs(queue.store, interview_id)
+
+    queue, submitted, runs = asyncio.run(run())
+    assert len({record.submission_id for record, _ in submitted}) == 1
+    assert sorted(duplicate for _, duplicate in submitted) == [False] + [True] * 7
+    assert len(queue.jobs) == 1
+    assert runs == 1
+
+
+@pytest.mark.parametrize("backend", STORES)
+def test_duplicate_sees_record_as_soon_as_claimed(backend):
+    async def run():
+        store = STORES[backend]()
+        first, second = _record(interview_id := uuid4()), _record(interview_id)
+        assert await store.reserve(first, 10) == ("new", None)
+        outcome, existing = await store.reserve(second, 10)
+        return store, first, outcome, existing, await store.get(existing)
+
+    store, first, outcome, existing, earlier = asyncio.run(run())
+    assert (outcome, existing) == ("duplicate", first.submission_id)
+    assert earlier is not None and earlier.submission_id == first.submission_id
+
+
+@pytest.mark.parametrize("backend", STORES)
+def test_concurrent_claims_respect_quota(backend):
+    async def run():
+        store = STORES[backend]()
+        interview_id = uuid4()
+        records = [_record(interview_id, f"def f(): return {n}") for n in range(6)]
+        outcomes = await asyncio.gather(*(store.reserve(record, 2) for record in records))
+        return [outcome for outcome, _ in outcomes], await _runs(store, interview_id)
+
+    outcomes, runs = asyncio.run(run())
+    assert sorted(outcomes) == ["new", "new", "quota", "quota", "quota", "quota"]
+    assert runs == 2
+
+
+@pytest.mark.parametrize("backend", STORES)
+def test_stale_release_keeps_newer_claim(backend):
+    async def run():
+        store = STORES[backend]()
+        interview_id = uuid4()
+        old, new = _record(interview_id), _record(interview_id)
+        await store.reserve(old, 10)
+        await store.release(interview_id, old.content_hash, old.submission_id)
+        assert await store.reserve(new, 10) == ("new", None)
+        # A submit that saw the old (expired) claim releases it late
+        await store.release(interview_id, old.content_hash, old.submission_id)
+        return await store.reserve(_record(interview_id), 10), new, await _runs(store, interview_id)
+
+    (outcome, existing), new, runs = asyncio.run(run())
+    assert (outcome, existing) == ("duplicate", new.submission_id)
+    assert runs == 1
+
+
+def test_expired_record_is_released_and_resubmitted():
+    async def run():
+        queue = _Queue(_redis_store())
+        interview_id = uuid4()
+        first, _ = await queue.submit(interview_id, "def f(): pass", "python")
+        await queue.store.client.delete(queue.store._record_key(first.submission_id))
+        again = await asyncio.gather(*(queue.submit(interview_id, "def f(): pass", "python") for _ in range(3)))
+        return queue, first, again, await _runs(queue.store, interview_id)
+
+    queue, first, again, runs = asyncio.run(run())
+    ids = {record.submission_id for record, _ in again}
+    assert len(ids) == 1 and first.submission_id not in ids
+    assert len(queue.jobs) == 2
+    assert runs == 1
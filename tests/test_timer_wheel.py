@@ -0,0 +1,87 @@
+"""TimerWheel: expiry across levels, cascading and parked far deadlines."""
+import math
+import random
+from app.core.timer_wheel import TimerWheel
+
+
+def _small_wheel() -> TimerWheel:
+    # Level spans: 4, 16 and 64 ticks of 1s
+    return TimerWheel(tick_seconds=1.0, slots=4, levels=3)
+
+
+def _fired_at(wheel: TimerWheel, until: int):
+    """Advance one tick at a time; return key -> tick it expired on."""
+    fired = {}
+    for now in range(1, until + 1):
+        for key, _ in wheel.advance(now):
+            assert key not in fired
+            fired[key] = now
+    return fired
+
+
+def test_cascades_down_and_fires_on_its_tick():
+    wheel = _small_wheel()
+    wheel.schedule("level0", 3)
+    wheel.schedule("level1", 13)
+    wheel.schedule("level2", 50)
+
+    assert _fired_at(wheel, 60) == {"level0": 3, "level1": 13, "level2": 50}
+    # Each upper-level timer is re-placed once, straight into level 0
+    assert wheel.stats() == {"pending": 0, "expired": 3, "cascaded": 2}
+
+
+def test_never_fires_early():
+    wheel = _small_wheel()
+    wheel.schedule("fractional", 5.2, payload="p")
+    assert wheel.get("fractional") == (6.0, "p")
+    assert wheel.advance(5.9) == []
+    assert wheel.advance(6.0) == [("fractional", "p")]
+
+
+def test_deadline_beyond_the_top_level_is_parked():
+    wheel = _small_wheel()
+    wheel.schedule("far", 200)
+    assert _fired_at(wheel, 250) == {"far": 200}
+
+
+def test_matches_reference_for_random_deadlines():
+    rng = random.Random(7)
+    wheel = _small_wheel()
+    expected = {}
+    for key in range(500):
+        when = rng.uniform(0.1, 300)
+        wheel.schedule(key, when)
+        expected[key] = math.ceil(when)
+
+    assert _fired_at(wheel, 310) == expected
+    assert len(wheel) == 0
+
+
+def test_expired_in_deadline_order_when_advancing_in_one_step():
+    wheel = _small_wheel()
+    for key, when in (("c", 40), ("a", 2), ("b", 17)):
+        wheel.schedule(key, when, payload=when)
+    assert wheel.advance(100) == [("a", 2), ("b", 17), ("c", 40)]
+
+
+def test_reschedule_and_cancel():
+    wheel = _small_wheel()
+    wheel.schedule("moved", 40)
+    wheel.advance(10)
+    wheel.schedule("moved", 12, payload="new")
+    wheel.schedule("cancelled", 30)
+    assert wheel.cancel("cancelled")
+    assert not wheel.cancel("cancelled")
+    assert "cancelled" not in wheel
+
+    assert wheel.advance(11) == []
+    assert wheel.advance(12) == [("moved", "new")]
+    assert wheel.advance(100) == []
+
+
+def test_past_deadline_fires_on_next_tick():
+    wheel = TimerWheel(tick_seconds=0.5, now=100.0)
+    wheel.schedule("late", 90.0)
+    assert wheel.get("late") == (100.5, None)
+    assert wheel.advance(100.4) == []
+    assert wheel.advance(100.5) == [("late", None)]
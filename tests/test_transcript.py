@@ -0,0 +1,75 @@
+"""MessageLog: list-like transcript and its serialization round trips."""
+from datetime import datetime
+from uuid import uuid4
+import pytest
+from app.core.state_manager import InterviewState
+from app.core.transcript import Message, MessageLog
+
+
+def _messages():
+    return [
+        Message(role="assistant", content="What is overfitting?", timestamp=datetime(2025, 1, 2, 3, 4, 5, 678901)),
+        Message(role="user", content="Fitting noise. Café ☕", timestamp=datetime(2025, 1, 2, 3, 4, 9)),
+        Message(role="system", content="", timestamp=datetime(1999, 12, 31, 23, 59, 59, 999999)),
+    ]
+
+
+def test_behaves_like_a_message_list():
+    messages = _messages()
+    log = MessageLog(messages)
+
+    assert len(log) == 3 and log
+    assert log[0] == messages[0]
+    assert log[-1] == messages[-1]
+    assert log[1:] == messages[1:]
+    assert list(log) == messages
+    assert log == messages
+    assert log.role_at(1) == "user" and log.content_at(1) == "Fitting noise. Café ☕"
+    with pytest.raises(IndexError):
+        log[3]
+    assert not MessageLog()
+
+
+def test_append_accepts_dicts_and_entries():
+    log = MessageLog()
+    log.append({"role": "user", "content": "hi", "timestamp": "2025-01-02T03:04:05"})
+    log.append_entry("assistant", "hello", timestamp_us=0)
+
+    assert log[0].timestamp == datetime(2025, 1, 2, 3, 4, 5)
+    assert log[1].timestamp == datetime(1970, 1, 1)
+    assert log.timestamp_at(1) == 0.0
+
+
+def test_raw_entries_round_trip():
+    log = MessageLog(_messages())
+    copy = MessageLog()
+    copy.extend_raw(*log.raw_entries())
+    assert copy == log
+
+    tail = MessageLog(_messages()[:1])
+    tail.extend_raw(*log.raw_entries(1))
+    assert tail == log
+
+
+def test_extend_raw_rejects_mismatched_lengths():
+    roles, contents, timestamps = MessageLog(_messages()).raw_entries()
+    with pytest.raises(ValueError):
+        MessageLog().extend_raw(roles, contents[:-1], timestamps)
+
+
+def test_pydantic_round_trip_through_state():
+    state = InterviewState(
+        interview_id=uuid4(),
+        candidate_id=uuid4(),
+        candidate_name="Candidate",
+        theory_topic="bias-variance",
+        transcript=_messages()
+    )
+    assert isinstance(state.transcript, MessageLog)
+
+    restored = InterviewState.model_validate_json(state.model_dump_json())
+    assert restored.transcript == state.transcript
+    assert InterviewState.model_validate(state.model_dump()).transcript == state.transcript
+
+    dumped = state.model_dump(mode="json")["transcript"]
+    assert dumped[0] == {"role": "assistant", "content": "What is overfitting?", "timestamp": "2025-01-02T03:04:05.678901"}